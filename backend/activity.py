@@ -0,0 +1,302 @@
+"""
+Gün bazında aktivite dizisi: çalışma serileri ve yıllık ısı haritası
+
+Her kullanıcı için user_activity tablosunda, ilk aktif günden başlayan ve
+gün başına tamamlanan çalışma oturumu sayısını tutan kompakt bir dizi
+bulunur. Dizi günlük özetle aynı yerde (rollups.apply_session /
+apply_sessions) ve aynı transaction'da güncellenir; böylece end_pomodoro,
+senkronizasyon, temizlik ve içe aktarma yolları tutarlı kalır.
+
+- Seri: en uzun seri O(gün), güncel seri O(seri uzunluğu)
+- Isı haritası: istenen gün aralığının dilimi, O(gün)
+
+Satır kayıt sırasında boş olarak açılır; yazmalar satırı kilitleyip
+günceller, okumalar hiçbir şey yazmaz. Satırı olmayan (özellikten önce
+kaydolmuş) kullanıcıların dizisi okumada ham oturumlardan hesaplanır ve
+artımlı güncellenmez; `flask rebuild-activity` bu satırları oluşturur.
+Günler UTC'dir ve oturumun bittiği güne sayılır (daily_stats ile aynı).
+"""
+import sys
+from array import array
+from datetime import datetime, timedelta
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func
+from models import db, User, PomodoroSession, DailyStat, UserActivity
+
+# Isı haritasında tek istekte döndürülebilecek en fazla gün
+HEATMAP_MAX_DAYS = 731
+
+# uint16 sayaç sınırı
+MAX_DAY_COUNT = 0xFFFF
+
+
+def init_activity(app):
+    """Aktivite dizisi CLI komutunu kaydet"""
+    app.cli.add_command(rebuild_activity_command)
+
+
+# ==================== DİZİ KODLAMA ====================
+
+def _load(blob):
+    counts = array('H')
+    counts.frombytes(blob or b'')
+    if sys.byteorder == 'big':
+        counts.byteswap()
+    return counts
+
+
+def _dump(counts):
+    if sys.byteorder == 'big':
+        counts = array('H', counts)
+        counts.byteswap()
+    return counts.tobytes()
+
+
+def counts_as_activity(session):
+    """Oturum aktif gün sayılır mı (bitmiş ve süresi olan çalışma oturumu)"""
+    return (
+        session.ended_at is not None
+        and session.session_type == 'work'
+        and (session.duration_minutes or 0) > 0
+    )
+
+
+def activity_deltas(sessions, sign=1):
+    """Oturumların gün bazında sayaç değişimleri"""
+    deltas = {}
+    for session in sessions:
+        if counts_as_activity(session):
+            day = session.ended_at.date()
+            deltas[day] = deltas.get(day, 0) + sign
+    return deltas
+
+
+def add_activity(activity, deltas):
+    """Gün bazında değişimleri diziye uygula; dizi gerekirse iki yönde büyür"""
+    days = [day for day, delta in deltas.items() if delta]
+    if not days:
+        return
+
+    counts = _load(activity.counts)
+    first_day = activity.first_day or min(days)
+
+    earliest = min(days)
+    if earliest < first_day:
+        counts[0:0] = array('H', [0]) * (first_day - earliest).days
+        first_day = earliest
+
+    last_index = (max(days) - first_day).days
+    if last_index >= len(counts):
+        counts.extend(array('H', [0]) * (last_index + 1 - len(counts)))
+
+    for day in days:
+        index = (day - first_day).days
+        counts[index] = min(max(counts[index] + deltas[day], 0), MAX_DAY_COUNT)
+
+    activity.first_day = first_day
+    activity.counts = _dump(counts)
+
+
+def create_activity(user_id):
+    """Yeni kullanıcı için boş dizi satırı ekle (commit yapmaz)"""
+    db.session.add(UserActivity(user_id=user_id, first_day=None, counts=b''))
+
+
+def record_activity(user_id, deltas):
+    """Kullanıcının dizisi varsa değişimleri uygula (commit yapmaz)
+
+    Satır, güncel hâlini döndüren (RETURNING) bir UPDATE ile kilitlenerek
+    okunur; eşzamanlı iki yazma birbirinin değişimini ezemez. Satır yoksa
+    bir şey yapılmaz (okumalar ham oturumlardan hesaplar).
+    """
+    if not deltas:
+        return
+    table = UserActivity.__table__
+    row = db.session.execute(
+        table.update()
+        .where(table.c.user_id == user_id)
+        .values(updated_at=datetime.utcnow())
+        .returning(table.c.first_day, table.c.counts)
+    ).first()
+    if row is None:
+        return
+
+    activity = UserActivity(user_id=user_id, first_day=row.first_day, counts=row.counts)
+    add_activity(activity, deltas)
+    db.session.execute(
+        table.update()
+        .where(table.c.user_id == user_id)
+        .values(first_day=activity.first_day, counts=activity.counts)
+    )
+
+
+# ==================== HAM VERİDEN OLUŞTURMA ====================
+
+def raw_activity_counts(user_id=None):
+    """Kullanıcı -> {gün: çalışma oturumu sayısı}
+
+    Arşivlenmiş günlerin ham oturumları artık veritabanında olmadığı için
+    bu günlerin sayıları günlük özetten alınır.
+    """
+    from rollups import archived_days, _as_date
+
+    watermarks = archived_days(user_id)
+    result = {}
+
+    day = func.date(PomodoroSession.ended_at)
+    query = db.session.query(PomodoroSession.user_id, day, func.count(PomodoroSession.id)).filter(
+        PomodoroSession.ended_at.isnot(None),
+        PomodoroSession.session_type == 'work',
+        PomodoroSession.duration_minutes > 0
+    )
+    if user_id is not None:
+        query = query.filter(PomodoroSession.user_id == user_id)
+    for row_user_id, row_day, count in query.group_by(PomodoroSession.user_id, day).all():
+        row_day = _as_date(row_day)
+        watermark = watermarks.get(row_user_id)
+        if watermark is None or row_day >= watermark:
+            result.setdefault(row_user_id, {})[row_day] = count
+
+    if watermarks:
+        archived = db.session.query(
+            DailyStat.user_id, DailyStat.day, func.sum(DailyStat.full_count + DailyStat.half_count)
+        ).filter(
+            DailyStat.user_id.in_(watermarks),
+            DailyStat.session_type == 'work'
+        ).group_by(DailyStat.user_id, DailyStat.day)
+        for row_user_id, row_day, count in archived.all():
+            if count and row_day < watermarks[row_user_id]:
+                result.setdefault(row_user_id, {})[row_day] = count
+
+    return result
+
+
+def build_activity(user_id, day_counts):
+    """{gün: sayı} sözlüğünden yeni bir UserActivity satırı oluştur (eklemez)"""
+    activity = UserActivity(user_id=user_id, first_day=None, counts=b'')
+    add_activity(activity, day_counts)
+    return activity
+
+
+def get_activity(user_id):
+    """Kullanıcının dizisi; satırı yoksa ham oturumlardan hesaplanır (kaydedilmez)"""
+    activity = db.session.get(UserActivity, user_id)
+    if activity is None:
+        activity = build_activity(user_id, raw_activity_counts(user_id).get(user_id, {}))
+    return activity
+
+
+def rebuild_activity(user_id=None):
+    """Dizileri ham oturumlardan yeniden oluştur (tek transaction)
+
+    Oturumu olmayanlar dahil her kullanıcıya satır açılır; satırı eksik
+    kullanıcılar (özellikten önce kaydolanlar) böylece artımlı güncellenir.
+    """
+    delete_query = UserActivity.query
+    if user_id is not None:
+        delete_query = delete_query.filter(UserActivity.user_id == user_id)
+    delete_query.delete(synchronize_session=False)
+
+    user_query = db.session.query(User.id)
+    if user_id is not None:
+        user_query = user_query.filter(User.id == user_id)
+
+    now = datetime.utcnow()
+    counts_by_user = raw_activity_counts(user_id)
+    rows = []
+    for (row_user_id,) in user_query.all():
+        activity = build_activity(row_user_id, counts_by_user.get(row_user_id, {}))
+        rows.append({
+            'user_id': row_user_id,
+            'first_day': activity.first_day,
+            'counts': activity.counts,
+            'updated_at': now
+        })
+    if rows:
+        db.session.execute(UserActivity.__table__.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+
+# ==================== SORGULAR ====================
+
+def _run_ending_at(counts, index):
+    """index'te biten ardışık aktif gün sayısı"""
+    length = 0
+    while 0 <= index < len(counts) and counts[index]:
+        length += 1
+        index -= 1
+    return length
+
+
+def streaks(activity, today):
+    """Güncel ve en uzun seri (gün)
+
+    Bugün henüz çalışılmadıysa dünkü seri hâlâ güncel sayılır.
+    """
+    counts = _load(activity.counts)
+    longest = 0
+    run = 0
+    active_days = 0
+    last_index = None
+    for index, count in enumerate(counts):
+        if count:
+            run += 1
+            active_days += 1
+            last_index = index
+            if run > longest:
+                longest = run
+        else:
+            run = 0
+
+    current = 0
+    today_active = False
+    if activity.first_day is not None:
+        today_index = (today - activity.first_day).days
+        today_active = 0 <= today_index < len(counts) and counts[today_index] > 0
+        current = _run_ending_at(counts, today_index) or _run_ending_at(counts, today_index - 1)
+
+    return {
+        'current': current,
+        'longest': longest,
+        'today_active': today_active,
+        'active_days': active_days,
+        'last_active_day': (
+            (activity.first_day + timedelta(days=last_index)).isoformat() if last_index is not None else None
+        )
+    }
+
+
+def heatmap(activity, end_day, days=365):
+    """end_day dahil son `days` günün çalışma oturumu sayıları"""
+    start_day = end_day - timedelta(days=days - 1)
+    values = [0] * days
+
+    if activity.first_day is not None:
+        counts = _load(activity.counts)
+        offset = (start_day - activity.first_day).days
+        low = max(offset, 0)
+        high = min(offset + days, len(counts))
+        if low < high:
+            values[low - offset:high - offset] = counts[low:high]
+
+    return {
+        'start': start_day.isoformat(),
+        'end': end_day.isoformat(),
+        'counts': values,
+        'max': max(values),
+        'total': sum(values),
+        'active_days': sum(1 for value in values if value)
+    }
+
+
+# ==================== CLI KOMUTLARI ====================
+
+@click.command('rebuild-activity')
+@with_appcontext
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcının dizisini yeniden oluştur')
+def rebuild_activity_command(user_id):
+    """Seri ve ısı haritası dizilerini ham oturumlardan yeniden oluştur"""
+    count = rebuild_activity(user_id)
+    click.echo(f"{count} kullanıcının aktivite dizisi oluşturuldu.")
@@ -0,0 +1,299 @@
+"""
+Odaklanma alışkanlıkları analizi (NumPy ile vektörel hesaplama)
+
+Kullanıcının analiz penceresindeki bitmiş çalışma oturumları tek sorguyla
+sütun dizilerine (görev, süre, başlangıç ve bitiş zamanı) yüklenir. Tüm
+ölçümler Python döngüsü olmadan, kullanıcı ve görev grupları için aynı
+geçişlerde hesaplanır:
+
+- Süre yüzdelikleri (25, 50, 75, 90)
+- Tamamlama oranı: tam / (tam + yarım) pomodoro
+- Saat (0-23) ve haftanın günü (0 = Pazartesi) histogramları
+- Günlük çalışma dakikalarının 7 ve 28 günlük hareketli ortalamaları
+
+Zamanlar UTC'dir; saat ve gün oturumun başlangıcına, günlük dakikalar
+(daily_stats ile aynı şekilde) bitiş gününe göre hesaplanır. Arşiv sınırından
+(archived_before) önceki günlerin ham oturumları artık veritabanında olmadığı
+için bu günlerin dakikaları (günlük seri ve hareketli ortalamalar) günlük
+özetten alınır; oturum bazlı ölçümler (yüzdelikler, oranlar, histogramlar)
+sadece arşivlenmemiş oturumları kapsar ve sınır yanıtta bildirilir.
+Sonuçlar istatistik önbelleğinde kullanıcı bazında tutulur (bkz.
+pomodoro.get_analytics).
+"""
+from datetime import datetime, date, timedelta
+from itertools import chain
+import numpy as np
+from sqlalchemy import func, select
+from models import db, Task, PomodoroSession, DailyStat, FULL_POMODORO_MINUTES
+
+
+ANALYTICS_DEFAULT_DAYS = 90
+ANALYTICS_MAX_DAYS = 365
+
+PERCENTILES = (25, 50, 75, 90)
+ROLLING_WINDOWS = (7, 28)
+
+# Hareketli ortalamanın pencerenin ilk gününde de tam olması için geriye bakılan gün
+LOOKBACK_DAYS = max(ROLLING_WINDOWS) - 1
+
+SECONDS_PER_DAY = 86400
+EPOCH = date(1970, 1, 1)
+
+# 1970-01-01 bir Perşembe (weekday 3)
+EPOCH_WEEKDAY = 3
+
+
+def _epoch_seconds(column):
+    """Tarih kolonunu Unix zamanına (saniye, float) çeviren SQL ifadesi"""
+    if db.engine.dialect.name == 'postgresql':
+        return func.extract('epoch', column)
+
+    # SQLite: julianday 1970-01-01 00:00 = 2440587.5
+    return (func.julianday(column) - 2440587.5) * float(SECONDS_PER_DAY)
+
+
+def load_columns(user_id, since_day):
+    """since_day ve sonrasında biten çalışma oturumlarını sütun dizileri olarak yükle
+
+    Döndürülen sözlük: task_id (int64, görevsiz = 0), duration (float64),
+    started (int64, Unix saniye), ended_day (int64, 1970'ten itibaren gün).
+    """
+    stmt = select(
+        func.coalesce(PomodoroSession.task_id, 0),
+        func.coalesce(PomodoroSession.duration_minutes, 0.0),
+        _epoch_seconds(PomodoroSession.started_at),
+        _epoch_seconds(PomodoroSession.ended_at)
+    ).where(
+        PomodoroSession.user_id == user_id,
+        PomodoroSession.session_type == 'work',
+        PomodoroSession.ended_at.isnot(None),
+        PomodoroSession.ended_at >= datetime.combine(since_day, datetime.min.time())
+    )
+    rows = db.session.execute(stmt).all()
+
+    # Satırlar tek geçişte düz bir float dizisine açılıp sütunlara ayrılır
+    flat = np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=len(rows) * 4)
+    table = flat.reshape(len(rows), 4)
+    # julianday milisaniye çözünürlüklü; kayan nokta hatası tam saniyeleri bir alta düşürmesin
+    seconds = np.floor(table[:, 2:] + 0.0005).astype(np.int64)
+    return {
+        'task_id': table[:, 0].astype(np.int64),
+        'duration': table[:, 1],
+        'started': seconds[:, 0],
+        'ended_day': seconds[:, 1] // SECONDS_PER_DAY
+    }
+
+
+def load_archived_minutes(user_id, since_day, before_day):
+    """[since_day, before_day) günlerinin çalışma dakikaları günlük özetten
+
+    Döndürülen sözlük: task_id (int64, görevsiz = 0), day (int64, 1970'ten
+    itibaren gün), minutes (float64) ve before_day (arşiv sınırı, gün).
+    """
+    from rollups import _as_date
+
+    rows = db.session.query(
+        func.coalesce(DailyStat.task_id, 0), DailyStat.day, func.sum(DailyStat.minutes)
+    ).filter(
+        DailyStat.user_id == user_id,
+        DailyStat.session_type == 'work',
+        DailyStat.day >= since_day,
+        DailyStat.day < before_day
+    ).group_by(DailyStat.task_id, DailyStat.day).all()
+    return {
+        'task_id': np.array([row[0] for row in rows], dtype=np.int64),
+        'day': np.array([(_as_date(row[1]) - EPOCH).days for row in rows], dtype=np.int64),
+        'minutes': np.array([row[2] or 0.0 for row in rows], dtype=np.float64),
+        'before_day': (before_day - EPOCH).days
+    }
+
+
+def _group_percentiles(groups, n_groups, values):
+    """Her grup için PERCENTILES (doğrusal enterpolasyon, np.percentile ile aynı)
+
+    (n_groups, len(PERCENTILES)) boyutunda dizi; boş gruplar NaN.
+    """
+    result = np.full((n_groups, len(PERCENTILES)), np.nan)
+    if values.size == 0:
+        return result
+
+    sorted_values = values[np.lexsort((values, groups))]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    last = starts + counts - 1
+
+    for column, q in enumerate(PERCENTILES):
+        position = starts + (q / 100.0) * (counts - 1)
+        low = np.clip(np.floor(position).astype(np.int64), 0, values.size - 1)
+        high = np.clip(np.minimum(low + 1, last), 0, values.size - 1)
+        fraction = position - np.floor(position)
+        interpolated = sorted_values[low] * (1 - fraction) + sorted_values[high] * fraction
+        result[:, column] = np.where(present, interpolated, np.nan)
+    return result
+
+
+def group_metrics(groups, n_groups, columns, window_start, days, archived=None, archived_groups=None):
+    """Gruplar (0..n_groups-1) için tüm ölçümleri vektörel olarak hesapla
+
+    window_start: analiz penceresinin ilk günü (1970'ten itibaren gün).
+    Yüzdelikler, oranlar ve histogramlar sadece penceredeki oturumlardan;
+    hareketli ortalamalar geriye bakma günleri de kullanılarak hesaplanır.
+    archived: load_archived_minutes sonucu; archived_groups her satırın
+    grubu (grupta olmayanlar -1). Arşiv sınırından önceki günlerin dakikaları
+    oturumlardan değil bu satırlardan alınır.
+    """
+    duration = columns['duration']
+    ended_day = columns['ended_day']
+
+    # Hareketli ortalamalar: (grup, gün) bazında dakika matrisi ve kümülatif toplam
+    length = days + LOOKBACK_DAYS
+    day_index = ended_day - (window_start - LOOKBACK_DAYS)
+    valid = (day_index >= 0) & (day_index < length)
+    if archived is not None:
+        # Sınırdan önce biten ham oturumlar günlük özette de var; iki kez sayılmasın
+        valid &= ended_day >= archived['before_day']
+    daily = np.bincount(
+        groups[valid] * length + day_index[valid],
+        weights=duration[valid],
+        minlength=n_groups * length
+    ).reshape(n_groups, length)
+    if archived is not None:
+        archived_index = archived['day'] - (window_start - LOOKBACK_DAYS)
+        keep = (archived_index >= 0) & (archived_index < length) & (archived_groups >= 0)
+        daily += np.bincount(
+            archived_groups[keep] * length + archived_index[keep],
+            weights=archived['minutes'][keep],
+            minlength=n_groups * length
+        ).reshape(n_groups, length)
+    cumulative = np.concatenate((np.zeros((n_groups, 1)), np.cumsum(daily, axis=1)), axis=1)
+    rolling = {
+        window: (cumulative[:, LOOKBACK_DAYS + 1:] - cumulative[:, LOOKBACK_DAYS + 1 - window:length + 1 - window]) / window
+        for window in ROLLING_WINDOWS
+    }
+
+    # Diğer ölçümler sadece pencere içindeki oturumlar
+    in_window = (ended_day >= window_start) & (ended_day < window_start + days)
+    groups = groups[in_window]
+    duration = duration[in_window]
+    started = columns['started'][in_window]
+
+    is_full = duration >= FULL_POMODORO_MINUTES
+    is_half = (duration > 0) & ~is_full
+    full = np.bincount(groups, weights=is_full, minlength=n_groups)
+    half = np.bincount(groups, weights=is_half, minlength=n_groups)
+    rated = full + half
+
+    hours = (started % SECONDS_PER_DAY) // 3600
+    weekdays = (started // SECONDS_PER_DAY + EPOCH_WEEKDAY) % 7
+
+    return {
+        'count': np.bincount(groups, minlength=n_groups),
+        'minutes': np.bincount(groups, weights=duration, minlength=n_groups),
+        'full': full,
+        'half': half,
+        'completion_ratio': np.divide(full, rated, out=np.full(n_groups, np.nan), where=rated > 0),
+        'percentiles': _group_percentiles(groups, n_groups, duration),
+        'hours': np.bincount(groups * 24 + hours, minlength=n_groups * 24).reshape(n_groups, 24),
+        'weekdays': np.bincount(groups * 7 + weekdays, minlength=n_groups * 7).reshape(n_groups, 7),
+        'daily_minutes': daily[:, LOOKBACK_DAYS:],
+        'rolling': rolling
+    }
+
+
+def _number(value, digits=2):
+    """NumPy değerini JSON'a uygun sayıya çevir (NaN -> None)"""
+    value = float(value)
+    if np.isnan(value):
+        return None
+    return round(value, digits)
+
+
+def _summary(metrics, index):
+    """Tek bir grubun ölçümlerini sözlüğe çevir"""
+    return {
+        'sessions': int(metrics['count'][index]),
+        'total_minutes': _number(metrics['minutes'][index]),
+        'full_pomodoros': int(metrics['full'][index]),
+        'half_pomodoros': int(metrics['half'][index]),
+        'completion_ratio': _number(metrics['completion_ratio'][index], 4),
+        'duration_percentiles': {
+            f'p{q}': _number(metrics['percentiles'][index, column])
+            for column, q in enumerate(PERCENTILES)
+        },
+        'hour_histogram': metrics['hours'][index].tolist(),
+        'weekday_histogram': metrics['weekdays'][index].tolist(),
+        'rolling_average_minutes': {
+            f'{window}d': _number(metrics['rolling'][window][index, -1])
+            for window in ROLLING_WINDOWS
+        }
+    }
+
+
+def compute_analytics(columns, today, days=ANALYTICS_DEFAULT_DAYS, archived=None):
+    """Yüklenmiş sütunlardan kullanıcı ve görev analizlerini hesapla
+
+    today dahil son `days` gün analiz edilir. Görev metinleri eklenmez.
+    archived: arşivlenmiş günlerin dakikaları (bkz. load_archived_minutes).
+    """
+    window_start = (today - EPOCH).days - days + 1
+
+    # Kullanıcı geneli tek grup
+    overall = group_metrics(
+        np.zeros(columns['duration'].size, dtype=np.int64), 1, columns, window_start, days,
+        archived, None if archived is None else np.zeros(archived['day'].size, dtype=np.int64)
+    )
+
+    # Görevler: penceredeki görev id'leri 0..n-1 gruplarına eşlenir (görevsizler hariç)
+    in_window = (columns['ended_day'] >= window_start) & (columns['ended_day'] < window_start + days)
+    task_ids = np.unique(columns['task_id'][in_window & (columns['task_id'] != 0)])
+    tasks = []
+    if task_ids.size:
+        has_task = np.isin(columns['task_id'], task_ids)
+        task_columns = {name: values[has_task] for name, values in columns.items()}
+        archived_groups = None
+        if archived is not None:
+            position = np.minimum(np.searchsorted(task_ids, archived['task_id']), task_ids.size - 1)
+            archived_groups = np.where(task_ids[position] == archived['task_id'], position, -1)
+        per_task = group_metrics(
+            np.searchsorted(task_ids, task_columns['task_id']), task_ids.size, task_columns, window_start, days,
+            archived, archived_groups
+        )
+        tasks = [
+            dict(_summary(per_task, index), task_id=int(task_id))
+            for index, task_id in enumerate(task_ids)
+            if per_task['count'][index]
+        ]
+
+    user = _summary(overall, 0)
+    user['daily'] = {
+        'start': (today - timedelta(days=days - 1)).isoformat(),
+        'minutes': np.round(overall['daily_minutes'][0], 2).tolist(),
+        **{
+            f'rolling_{window}d': np.round(overall['rolling'][window][0], 2).tolist()
+            for window in ROLLING_WINDOWS
+        }
+    }
+    return {'days': days, 'end': today.isoformat(), 'user': user, 'tasks': tasks}
+
+
+def build_analytics(user_id, today, days=ANALYTICS_DEFAULT_DAYS):
+    """Kullanıcının analizini hesapla (oturum sorgusu + gerekirse günlük özet + görev metinleri)"""
+    from rollups import archived_days
+
+    since_day = today - timedelta(days=days - 1 + LOOKBACK_DAYS)
+    archived_before = archived_days(user_id).get(user_id)
+    archived = None
+    if archived_before is not None and archived_before > since_day:
+        archived = load_archived_minutes(user_id, since_day, archived_before)
+    result = compute_analytics(load_columns(user_id, since_day), today, days, archived)
+    result['archived_before'] = archived_before.isoformat() if archived_before else None
+
+    if result['tasks']:
+        texts = dict(db.session.query(Task.id, Task.text).filter(
+            Task.user_id == user_id,
+            Task.id.in_([task['task_id'] for task in result['tasks']])
+        ).all())
+        for task in result['tasks']:
+            task['task_text'] = texts.get(task['task_id'], 'Bilinmeyen')
+    return result
@@ -2,14 +2,14 @@ from flask import Flask, jsonify
 from flask_login import LoginManager
 from flask_bcrypt import Bcrypt
 from flask_cors import CORS
-from config import Config
+from config import Config, get_config
 from models import db, User
 
 def create_app():
     """Flask uygulamasını oluştur ve yapılandır"""
     
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(get_config())
     
     # Session ayarları
     app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
@@ -23,8 +23,18 @@ def create_app():
          allow_headers=['Content-Type', 'Authorization'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'])
     
-    # Veritabanı başlatma
-    db.init_app(app)
+    # Veritabanı başlatma (profil: APP_CONFIG = development | production)
+    from database import init_database
+    init_database(app)
+    
+    # İstek ölçümleri ve Prometheus /metrics endpoint'i. Hook'ları ilk kaydedilir:
+    # sonradan eklenen bir before_request erken yanıt dönerse (ör. 429) istek yine ölçülür
+    from metrics import init_metrics
+    init_metrics(app)
+    
+    # İstek sınırlama (auth ve yazma endpoint'leri)
+    from rate_limit import init_rate_limit
+    init_rate_limit(app)
     
     # Flask-Login yapılandırması
     login_manager = LoginManager()
@@ -36,10 +46,14 @@ def create_app():
     # Bcrypt başlatma
     bcrypt = Bcrypt(app)
     
+    # Kullanıcı önbelleği (her istekte tekrar sorgulanmasın)
+    from user_cache import init_user_cache, load_cached_user
+    init_user_cache(app)
+    
     @login_manager.user_loader
     def load_user(user_id):
         """Kullanıcı yükleme fonksiyonu"""
-        return User.query.get(int(user_id))
+        return load_cached_user(int(user_id))
     
     # Ana sayfa route'u
     @app.route('/')
@@ -98,14 +112,66 @@ def create_app():
     from pomodoro import pomodoro_bp
     app.register_blueprint(pomodoro_bp, url_prefix='/')
     
+    # Delta senkronizasyon blueprint'ini ve değişiklik numarası damgalamasını kaydet
+    from sync import sync_bp, init_sync
+    app.register_blueprint(sync_bp, url_prefix='/')
+    init_sync(app)
+    
+    # Dışa aktarma blueprint'ini kaydet
+    from export import export_bp
+    app.register_blueprint(export_bp, url_prefix='/')
+    
+    # İçe aktarma blueprint'ini kaydet
+    from importer import importer_bp, init_importer
+    app.register_blueprint(importer_bp, url_prefix='/')
+    init_importer(app)
+    
     # OAuth durumunu kontrol et
     Config.print_oauth_status()
     init_auth(app)
     
+    # Günlük özet (rollup) CLI komutları
+    from rollups import init_rollups
+    init_rollups(app)
+    
+    # Seri / ısı haritası aktivite dizileri
+    from activity import init_activity
+    init_activity(app)
+    
+    # İstatistik yanıt önbelleği
+    from stats_cache import init_stats_cache
+    init_stats_cache(app)
+    
+    # İsteğe bağlı istek profilleme (cProfile)
+    from profiling import init_profiling
+    init_profiling(app)
+    
     # Veritabanı tablolarını oluştur
     with app.app_context():
         db.create_all()
         print("Veritabanı tabloları oluşturuldu.")
+        
+        # Mevcut tablolara sonradan eklenen kolon/index'leri ekle
+        from migrations import upgrade_schema
+        changes = upgrade_schema()
+        if changes:
+            print(f"Şema güncellendi: {', '.join(changes)}")
+    
+    # Görev arama indeksi (FTS5)
+    from search import init_search
+    init_search(app)
+    
+    # Terk edilmiş açık oturum temizliği
+    from sweeper import init_sweeper
+    init_sweeper(app)
+    
+    # Eski oturumların arşivlenmesi (saklama işi)
+    from archive import init_archive
+    init_archive(app)
+    
+    # İsteğe bağlı write-behind (tablolar hazır olduktan sonra günlük oynatılır)
+    from write_behind import init_write_behind
+    init_write_behind(app)
     
     return app
 
@@ -0,0 +1,354 @@
+"""
+Eski oturumların saklama (retention) işi ve sıkıştırılmış sütunlu arşiv
+
+SESSION_RETENTION_DAYS günden eski bitmiş oturumlar veritabanından çıkarılıp
+kullanıcı başına tek bir, sadece sona eklenen (append-only) arşiv dosyasına
+yazılır: SESSION_ARCHIVE_DIR/user_<id>.pca
+
+Dosya çerçevelerden (frame) oluşur. Her çerçeve bir başlık satırı ve
+sıkıştırılmış bir gövdeden oluşur:
+
+    PCA1 {"rows": n, "from": "...", "to": "...", "bytes": m, "crc": c}\\n
+    <zlib ile sıkıştırılmış, sütun bazlı JSON gövde (m bayt)>
+
+Gövde satır değil sütun tutar (id farkları, tip sözlüğü, zaman farkları
+mikrosaniye olarak); benzer değerler yan yana geldiği için iyi sıkışır.
+Başlıktaki from/to (ended_at aralığı) sayesinde okuyucu ilgisiz çerçeveleri
+açmadan atlar.
+
+Dosyanın hangi kısmının commit edildiği session_archives.archive_bytes'ta
+tutulur: veritabanı silme işlemi commit edilmeden çöken bir iş, bir sonraki
+çalıştırmada bu uzunluğa kırpılır; okuyucu da bu uzunluktan sonrasını okumaz.
+
+Günlük özetler (daily_stats) arşivlenen günler için kalıcı kaynaktır:
+iş önce [eski sınır, yeni sınır) aralığındaki günlerin özetlerini ham
+oturumlardan yeniden hesaplar ve sınırı (archived_before) kaydeder;
+rebuild-daily-stats ve check-daily-stats bu sınırdan önceki günlere dokunmaz.
+"""
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from models import db, PomodoroSession, SessionArchive
+from rollups import rebuild_daily_stats_range
+from stats_cache import statistics_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows: dosya kilidi yok
+    fcntl = None
+
+
+FRAME_MAGIC = b'PCA1 '
+SESSION_TYPES = ['work', 'shortBreak', 'longBreak']
+EPOCH = datetime(1970, 1, 1)
+
+
+# ==================== SÜTUNLU KODLAMA ====================
+
+def _micros(moment):
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def _moment(micros):
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def encode_frame(rows):
+    """ended_at sırasındaki oturum satırlarından bir arşiv çerçevesi üret"""
+    ended = [_micros(row.ended_at) for row in rows]
+    base = ended[0]
+    ids = [row.id for row in rows]
+
+    columns = {
+        'id': [ids[0]] + [b - a for a, b in zip(ids, ids[1:])],
+        'task_id': [row.task_id for row in rows],
+        'session_type': [SESSION_TYPES.index(row.session_type) for row in rows],
+        'duration_minutes': [row.duration_minutes for row in rows],
+        # ended_at: ilk değere göre artan farklar; diğer zamanlar ended_at'e göre fark
+        'ended_at': [0] + [b - a for a, b in zip(ended, ended[1:])],
+        'started_at': [e - _micros(row.started_at) for e, row in zip(ended, rows)],
+        'created_at': [e - _micros(row.created_at) for e, row in zip(ended, rows)],
+        'updated_at': [e - _micros(row.updated_at or row.created_at) for e, row in zip(ended, rows)],
+        'idempotency_key': [row.idempotency_key for row in rows]
+    }
+    payload = zlib.compress(json.dumps({'base': base, 'columns': columns}, separators=(',', ':')).encode('utf-8'), 9)
+    header = {
+        'rows': len(rows),
+        'from': min(row.ended_at for row in rows).isoformat(),
+        'to': max(row.ended_at for row in rows).isoformat(),
+        'bytes': len(payload),
+        'crc': zlib.crc32(payload)
+    }
+    return FRAME_MAGIC + json.dumps(header, separators=(',', ':')).encode('utf-8') + b'\n' + payload
+
+
+def decode_frame(payload, user_id):
+    """Çerçeve gövdesini to_dict biçimindeki oturum sözlüklerine çevir"""
+    data = json.loads(zlib.decompress(payload).decode('utf-8'))
+    columns = data['columns']
+
+    sessions = []
+    row_id = 0
+    ended = data['base']
+    for i in range(len(columns['id'])):
+        row_id += columns['id'][i]
+        ended += columns['ended_at'][i]
+        sessions.append({
+            'id': row_id,
+            'user_id': user_id,
+            'task_id': columns['task_id'][i],
+            'session_type': SESSION_TYPES[columns['session_type'][i]],
+            'duration_minutes': columns['duration_minutes'][i],
+            'started_at': _moment(ended - columns['started_at'][i]).isoformat(),
+            'ended_at': _moment(ended).isoformat(),
+            'created_at': _moment(ended - columns['created_at'][i]).isoformat(),
+            'updated_at': _moment(ended - columns['updated_at'][i]).isoformat(),
+            'idempotency_key': columns['idempotency_key'][i]
+        })
+    return sessions
+
+
+def read_frame_headers(path, limit_bytes):
+    """Dosyadaki (başlık, gövde konumu) çiftleri; gövdeler okunmadan atlanır"""
+    headers = []
+    if not os.path.exists(path):
+        return headers
+
+    with open(path, 'rb') as f:
+        while f.tell() < limit_bytes:
+            line = f.readline()
+            if not line.startswith(FRAME_MAGIC) or not line.endswith(b'\n'):
+                break  # Yarım kalmış (commit edilmemiş) çerçeve
+            header = json.loads(line[len(FRAME_MAGIC):])
+            offset = f.tell()
+            if offset + header['bytes'] > limit_bytes:
+                break
+            headers.append((header, offset))
+            f.seek(header['bytes'], os.SEEK_CUR)
+    return headers
+
+
+def read_payload(path, header, offset):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        payload = f.read(header['bytes'])
+    if zlib.crc32(payload) != header['crc']:
+        raise ValueError(f'Bozuk arşiv çerçevesi: {path}@{offset}')
+    return payload
+
+
+# ==================== DOSYALAR ====================
+
+def archive_dir():
+    return current_app.config.get('SESSION_ARCHIVE_DIR') or os.path.join(current_app.instance_path, 'archive')
+
+
+def archive_path(user_id):
+    return os.path.join(archive_dir(), f'user_{user_id}.pca')
+
+
+def _append_frame(path, committed_bytes, frame):
+    """Çerçeveyi dosya sonuna ekle; commit edilmemiş kuyruk önce kırpılır
+
+    Yeni dosya uzunluğunu döndürür.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'ab') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        f.truncate(committed_bytes)
+        f.seek(committed_bytes)
+        f.write(frame)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+# ==================== SAKLAMA İŞİ ====================
+
+def archive_user_sessions(user_id, cutoff_day, batch_size=5000):
+    """Kullanıcının cutoff_day'den önce biten oturumlarını özetle ve arşive taşı
+
+    1. [eski sınır, cutoff_day) günlerinin özetleri ham veriden yeniden
+       hesaplanır ve yeni sınır aynı transaction'da kaydedilir.
+    2. Oturumlar batch_size'lık çerçeveler halinde dosyaya eklenir; her
+       çerçeveden sonra satırlar silinir ve dosya uzunluğu commit edilir.
+
+    Arşivlenen oturum sayısını döndürür.
+    """
+    state = db.session.get(SessionArchive, user_id)
+    if state is None:
+        state = SessionArchive(user_id=user_id, archived_before=None, archive_bytes=0, session_count=0)
+        db.session.add(state)
+
+    try:
+        if state.archived_before is None or state.archived_before < cutoff_day:
+            rebuild_daily_stats_range(user_id, state.archived_before, cutoff_day)
+            state.archived_before = cutoff_day
+        state.updated_at = datetime.utcnow()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    cutoff = datetime.combine(state.archived_before, datetime.min.time())
+    path = archive_path(user_id)
+    total = 0
+    while True:
+        rows = PomodoroSession.query.filter(
+            PomodoroSession.user_id == user_id,
+            PomodoroSession.ended_at.isnot(None),
+            PomodoroSession.ended_at < cutoff
+        ).order_by(PomodoroSession.ended_at, PomodoroSession.id).limit(batch_size).all()
+        if not rows:
+            break
+
+        try:
+            state.archive_bytes = _append_frame(path, state.archive_bytes, encode_frame(rows))
+            state.session_count += len(rows)
+            state.updated_at = datetime.utcnow()
+            PomodoroSession.query.filter(
+                PomodoroSession.id.in_([row.id for row in rows])
+            ).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        total += len(rows)
+        if len(rows) < batch_size:
+            break
+
+    statistics_cache.invalidate_user(user_id)
+    return total
+
+
+def run_retention(retention_days, batch_size=5000, user_id=None, today=None):
+    """Tüm kullanıcılar (veya biri) için saklama işini çalıştır
+
+    Sınır gün başına hizalanır; böylece bir gün ya tamamen arşivde ya tamamen
+    veritabanındadır. {user_id: arşivlenen oturum} döndürür.
+    """
+    today = today or datetime.utcnow().date()
+    cutoff_day = today - timedelta(days=retention_days)
+    cutoff = datetime.combine(cutoff_day, datetime.min.time())
+
+    query = db.session.query(PomodoroSession.user_id).filter(
+        PomodoroSession.ended_at.isnot(None),
+        PomodoroSession.ended_at < cutoff
+    ).distinct()
+    if user_id is not None:
+        query = query.filter(PomodoroSession.user_id == user_id)
+    user_ids = [row[0] for row in query.all()]
+
+    return {uid: archive_user_sessions(uid, cutoff_day, batch_size) for uid in user_ids}
+
+
+# ==================== OKUYUCU ====================
+
+def archived_sessions(user_id, start=None, end=None, before=None, session_type=None, task_id=None, limit=None):
+    """Arşivdeki oturumları (ended_at, id) azalan sırada döndür
+
+    start/end: ended_at aralığı [start, end); before: (ended_at, id) keyset
+    imleci (bundan öncekiler); limit: en fazla satır. Sözlükler to_dict
+    biçimindedir ve 'archived': True içerir.
+    """
+    state = db.session.get(SessionArchive, user_id)
+    if state is None or not state.archive_bytes:
+        return []
+
+    path = archive_path(user_id)
+    upper = end
+    if before is not None and (upper is None or before[0] < upper):
+        upper = before[0] + timedelta(microseconds=1)
+
+    # Aralıkla kesişen çerçeveler, en yeni bitişten eskiye
+    frames = [
+        (header, offset) for header, offset in read_frame_headers(path, state.archive_bytes)
+        if (start is None or datetime.fromisoformat(header['to']) >= start)
+        and (upper is None or datetime.fromisoformat(header['from']) < upper)
+    ]
+    frames.sort(key=lambda item: item[0]['to'], reverse=True)
+
+    result = []
+    for header, offset in frames:
+        # Yeterli satır toplandıysa ve kalan çerçeveler daha eskiyse dur
+        if limit is not None and len(result) >= limit:
+            result.sort(key=lambda s: (s['ended_at'], s['id']), reverse=True)
+            if header['to'] < result[limit - 1]['ended_at']:
+                break
+
+        for session in decode_frame(read_payload(path, header, offset), user_id):
+            ended_at = datetime.fromisoformat(session['ended_at'])
+            if start is not None and ended_at < start:
+                continue
+            if end is not None and ended_at >= end:
+                continue
+            if before is not None and (ended_at, session['id']) >= before:
+                continue
+            if session_type is not None and session['session_type'] != session_type:
+                continue
+            if task_id is not None and session['task_id'] != task_id:
+                continue
+            session['archived'] = True
+            result.append(session)
+
+    result.sort(key=lambda s: (s['ended_at'], s['id']), reverse=True)
+    return result[:limit] if limit is not None else result
+
+
+def iter_archived_sessions(user_id):
+    """Arşivdeki tüm oturumları çerçeve çerçeve üret (bellekte tek çerçeve tutulur)"""
+    state = db.session.get(SessionArchive, user_id)
+    if state is None or not state.archive_bytes:
+        return
+
+    path = archive_path(user_id)
+    for header, offset in read_frame_headers(path, state.archive_bytes):
+        for session in decode_frame(read_payload(path, header, offset), user_id):
+            yield session
+
+
+# ==================== CLI ====================
+
+def init_archive(app):
+    """Saklama/arşiv komutlarını Flask CLI'a kaydet"""
+    app.cli.add_command(archive_sessions_command)
+    app.cli.add_command(archive_info_command)
+
+
+@click.command('archive-sessions')
+@with_appcontext
+@click.option('--older-than-days', type=int, default=None, help='Bu kadar günden eski oturumlar (varsayılan: SESSION_RETENTION_DAYS)')
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcı')
+@click.option('--batch-size', type=int, default=None, help='Çerçeve (ve transaction) başına oturum')
+def archive_sessions_command(older_than_days, user_id, batch_size):
+    """Eski oturumları günlük özetlere sıkıştır ve arşiv dosyalarına taşı"""
+    if older_than_days is None:
+        older_than_days = current_app.config.get('SESSION_RETENTION_DAYS', 365)
+    if batch_size is None:
+        batch_size = current_app.config.get('SESSION_ARCHIVE_BATCH', 5000)
+
+    archived = run_retention(older_than_days, batch_size, user_id)
+    click.echo(f"{sum(archived.values())} oturum {len(archived)} kullanıcı için arşivlendi.")
+
+
+@click.command('archive-info')
+@with_appcontext
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcı')
+def archive_info_command(user_id):
+    """Kullanıcı başına arşiv sınırı, oturum sayısı ve dosya boyutu"""
+    query = SessionArchive.query.order_by(SessionArchive.user_id)
+    if user_id is not None:
+        query = query.filter(SessionArchive.user_id == user_id)
+
+    for state in query.all():
+        frames = read_frame_headers(archive_path(state.user_id), state.archive_bytes)
+        click.echo(
+            f"user {state.user_id}: < {state.archived_before} "
+            f"{state.session_count} oturum, {len(frames)} çerçeve, {state.archive_bytes} bayt"
+        )
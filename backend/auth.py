@@ -4,6 +4,8 @@ from flask_bcrypt import Bcrypt
 from authlib.integrations.flask_client import OAuth
 from models import db, User
 from config import Config
+from hashing import password_hasher, HashingBusy
+from activity import create_activity
 import secrets
 
 # Blueprint oluştur
@@ -16,6 +18,7 @@ oauth = OAuth()
 def init_auth(app):
     """Auth modülünü Flask uygulaması ile başlat"""
     bcrypt.init_app(app)
+    password_hasher.init_app(app, bcrypt)
     oauth.init_app(app)
     
     # Google OAuth yapılandırması
@@ -53,6 +56,16 @@ def init_auth(app):
     else:
         print("Google OAuth credentials bulunamadı!")
 
+def _hashing_busy_response(error):
+    """Hash havuzu doluyken 503 + Retry-After yanıtı"""
+    response = jsonify({
+        'success': False,
+        'message': 'Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin'
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """Email ve şifre ile kullanıcı kaydı"""
@@ -91,13 +104,15 @@ def register():
             }), 409
         
         # Yeni kullanıcı oluştur
-        password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        password_hash = password_hasher.generate(password)
         new_user = User(
             email=email,
             password_hash=password_hash
         )
         
         db.session.add(new_user)
+        db.session.flush()
+        create_activity(new_user.id)
         db.session.commit()
         
         # Kullanıcıyı otomatik giriş yap
@@ -109,6 +124,8 @@ def register():
             'user': new_user.to_dict()
         }), 201
         
+    except HashingBusy as e:
+        return _hashing_busy_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -141,12 +158,21 @@ def login():
             }), 401
         
         # Şifre kontrolü
-        if not bcrypt.check_password_hash(user.password_hash, password):
+        if not password_hasher.check(user.password_hash, password):
             return jsonify({
                 'success': False,
                 'message': 'Geçersiz email veya şifre'
             }), 401
         
+        # Maliyet (BCRYPT_LOG_ROUNDS) değiştiyse hash'i yeni maliyetle güncelle
+        if password_hasher.needs_rehash(user.password_hash):
+            try:
+                user.password_hash = password_hasher.generate(password)
+                db.session.commit()
+            except HashingBusy:
+                # Yoğunlukta girişi engelleme; bir sonraki girişte tekrar denenir
+                db.session.rollback()
+        
         # Kullanıcıyı giriş yap
         login_user(user, remember=data.get('remember', False))
         
@@ -156,7 +182,10 @@ def login():
             'user': user.to_dict()
         })
         
+    except HashingBusy as e:
+        return _hashing_busy_response(e)
     except Exception as e:
+        db.session.rollback()
         return jsonify({
             'success': False,
             'message': 'Giriş sırasında hata oluştu'
@@ -243,6 +272,8 @@ def google_callback():
                 google_id=google_id
             )
             db.session.add(user)
+            db.session.flush()
+            create_activity(user.id)
             db.session.commit()
         elif not user.google_id:
             # Mevcut kullanıcıya Google ID ekle
@@ -0,0 +1 @@
+"""Pomodoro backend performans ölçümleri"""
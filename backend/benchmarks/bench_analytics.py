@@ -0,0 +1,237 @@
+"""
+Odaklanma analizi benchmark'ı: NumPy ve saf Python
+
+Tek bir kullanıcı için son 120 güne yayılmış rastgele çalışma oturumları
+oluşturur; analytics.compute_analytics (vektörel) ile aynı ölçümleri satır
+satır hesaplayan saf Python uygulamasını karşılaştırır. Önce iki sonucun
+aynı olduğu doğrulanır, sonra yükleme (sorgu) ve hesaplama süreleri
+ayrı ayrı raporlanır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_analytics.py
+    python benchmarks/bench_analytics.py --sizes 10000 100000 1000000 --days 90
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+INSERT_CHUNK = 50000
+SPAN_DAYS = 120
+
+
+def seed_sessions(app, session_count, task_count=40):
+    """Yeni bir kullanıcı için son SPAN_DAYS güne yayılmış çalışma oturumları ekle"""
+    from models import db, User, Task, PomodoroSession
+
+    with app.app_context():
+        user = User(email=f'analytics{session_count}@example.com')
+        db.session.add(user)
+        db.session.flush()
+        tasks = [Task(user_id=user.id, text=f'Görev {i}') for i in range(task_count)]
+        db.session.add_all(tasks)
+        db.session.flush()
+        task_ids = [task.id for task in tasks] + [None]
+        user_id = user.id
+
+        now = datetime.utcnow()
+        rng = random.Random(session_count)
+        remaining = session_count
+        while remaining:
+            rows = []
+            for _ in range(min(remaining, INSERT_CHUNK)):
+                started_at = now - timedelta(seconds=rng.uniform(0, SPAN_DAYS * 86400))
+                duration = rng.choice([25.0, 25.0, 25.0, 12.5, 20.0, 7.0, 0.0])
+                rows.append({
+                    'user_id': user_id,
+                    'task_id': rng.choice(task_ids),
+                    'session_type': 'work',
+                    'duration_minutes': duration,
+                    'started_at': started_at,
+                    'ended_at': started_at + timedelta(minutes=duration),
+                    'created_at': started_at
+                })
+            db.session.execute(PomodoroSession.__table__.insert(), rows)
+            db.session.commit()
+            remaining -= len(rows)
+    return user_id
+
+
+def load_rows(user_id, since_day):
+    """Saf Python için aynı oturumları datetime nesneleriyle yükle"""
+    from models import db, PomodoroSession
+
+    return db.session.query(
+        PomodoroSession.task_id, PomodoroSession.duration_minutes,
+        PomodoroSession.started_at, PomodoroSession.ended_at
+    ).filter(
+        PomodoroSession.user_id == user_id,
+        PomodoroSession.session_type == 'work',
+        PomodoroSession.ended_at.isnot(None),
+        PomodoroSession.ended_at >= datetime.combine(since_day, datetime.min.time())
+    ).all()
+
+
+def _percentile(sorted_values, q):
+    """Doğrusal enterpolasyonlu yüzdelik (np.percentile varsayılanı)"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100.0
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    fraction = position - low
+    return sorted_values[low] * (1 - fraction) + sorted_values[high] * fraction
+
+
+def python_analytics(rows, today, days):
+    """compute_analytics ile aynı ölçümler, satır başına Python döngüsüyle"""
+    from analytics import PERCENTILES, ROLLING_WINDOWS, LOOKBACK_DAYS
+    from models import FULL_POMODORO_MINUTES
+
+    window_start = today - timedelta(days=days - 1)
+    lookback_start = window_start - timedelta(days=LOOKBACK_DAYS)
+    groups = {}
+
+    def group(key):
+        if key not in groups:
+            groups[key] = {
+                'durations': [], 'full': 0, 'half': 0, 'minutes': 0.0,
+                'hours': [0] * 24, 'weekdays': [0] * 7,
+                'daily': [0.0] * (days + LOOKBACK_DAYS)
+            }
+        return groups[key]
+
+    for task_id, duration, started_at, ended_at in rows:
+        duration = duration or 0.0
+        ended_day = ended_at.date()
+        keys = ['user'] + ([task_id] if task_id else [])
+        for key in keys:
+            entry = group(key)
+            if lookback_start <= ended_day <= today:
+                entry['daily'][(ended_day - lookback_start).days] += duration
+            if not window_start <= ended_day <= today:
+                continue
+            entry['durations'].append(duration)
+            entry['minutes'] += duration
+            if duration >= FULL_POMODORO_MINUTES:
+                entry['full'] += 1
+            elif duration > 0:
+                entry['half'] += 1
+            entry['hours'][started_at.hour] += 1
+            entry['weekdays'][started_at.weekday()] += 1
+
+    result = {}
+    for key, entry in groups.items():
+        durations = sorted(entry['durations'])
+        rated = entry['full'] + entry['half']
+        rolling = {}
+        for window in ROLLING_WINDOWS:
+            rolling[window] = [
+                sum(entry['daily'][index - window + 1:index + 1]) / window
+                for index in range(LOOKBACK_DAYS, days + LOOKBACK_DAYS)
+            ]
+        result[key] = {
+            'sessions': len(durations),
+            'total_minutes': entry['minutes'],
+            'full_pomodoros': entry['full'],
+            'half_pomodoros': entry['half'],
+            'completion_ratio': entry['full'] / rated if rated else None,
+            'percentiles': [_percentile(durations, q) for q in PERCENTILES],
+            'hour_histogram': entry['hours'],
+            'weekday_histogram': entry['weekdays'],
+            'rolling': rolling
+        }
+    return result
+
+
+def _close(a, b, tolerance=0.01):
+    if a is None or b is None:
+        return a is None and b is None
+    return abs(a - b) <= tolerance
+
+
+def verify(vectorized, baseline):
+    """İki uygulamanın kullanıcı ve görev sonuçlarını karşılaştır"""
+    from analytics import PERCENTILES, ROLLING_WINDOWS
+
+    pairs = [(vectorized['user'], baseline['user'])]
+    pairs += [(task, baseline[task['task_id']]) for task in vectorized['tasks']]
+    if len(vectorized['tasks']) != sum(1 for key, entry in baseline.items() if key != 'user' and entry['sessions']):
+        raise AssertionError('Görev sayısı farklı')
+
+    for actual, expected in pairs:
+        for field in ('sessions', 'full_pomodoros', 'half_pomodoros', 'hour_histogram', 'weekday_histogram'):
+            if actual[field] != expected[field]:
+                raise AssertionError(f'{field} farklı')
+        checks = [
+            (actual['total_minutes'], expected['total_minutes']),
+            (actual['completion_ratio'], expected['completion_ratio'] and round(expected['completion_ratio'], 4))
+        ]
+        checks += [
+            (actual['duration_percentiles'][f'p{q}'], expected['percentiles'][column])
+            for column, q in enumerate(PERCENTILES)
+        ]
+        checks += [
+            (actual['rolling_average_minutes'][f'{window}d'], expected['rolling'][window][-1])
+            for window in ROLLING_WINDOWS
+        ]
+        for a, b in checks:
+            if not _close(a, b):
+                raise AssertionError(f'Sonuçlar farklı: {a} != {b}')
+
+
+def measure(func, repeat):
+    """En iyi çalışma süresini (ms) ve son sonucu döndür"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NumPy analiz benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='pomodoro-analytics-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmpdir, 'analytics.db')
+
+    from app import create_app
+    from analytics import load_columns, compute_analytics, LOOKBACK_DAYS
+
+    app = create_app()
+    print(f"{'oturum':>10} {'yükleme py/np (ms)':>20} {'hesap py/np (ms)':>18} {'hesap hızlanma':>15} {'toplam hızlanma':>16}")
+    for size in args.sizes:
+        user_id = seed_sessions(app, size)
+        with app.app_context():
+            today = datetime.utcnow().date()
+            since_day = today - timedelta(days=args.days - 1 + LOOKBACK_DAYS)
+
+            load_py_ms, rows = measure(lambda: load_rows(user_id, since_day), args.repeat)
+            load_np_ms, columns = measure(lambda: load_columns(user_id, since_day), args.repeat)
+            compute_py_ms, baseline = measure(lambda: python_analytics(rows, today, args.days), args.repeat)
+            compute_np_ms, vectorized = measure(lambda: compute_analytics(columns, today, args.days), args.repeat)
+            verify(vectorized, baseline)
+
+        total_py = load_py_ms + compute_py_ms
+        total_np = load_np_ms + compute_np_ms
+        print(
+            f"{size:>10} {f'{load_py_ms:.0f} / {load_np_ms:.0f}':>20} "
+            f"{f'{compute_py_ms:.0f} / {compute_np_ms:.1f}':>18} "
+            f"{compute_py_ms / compute_np_ms:>14.1f}x {total_py / total_np:>15.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Eşzamanlı yazma stres testi
+
+Aynı SQLite dosyasına birden fazla worker sürecinden pomodoro başlat/bitir
+(yazma) ve istatistik (okuma) istekleri gönderir; development ve production
+(WAL, synchronous=NORMAL, busy_timeout ...) profillerinde saniyedeki başarılı
+yazma sayısını ve "database is locked" kaynaklı hataları karşılaştırır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_concurrency.py
+    python benchmarks/bench_concurrency.py --workers 8 --seconds 10 --profiles production
+    python benchmarks/bench_concurrency.py --write-behind
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PASSWORD = 'benchmark123'
+
+
+def _email(index):
+    return f'stress{index}@example.com'
+
+
+def _worker(index, seconds, read_ratio, results):
+    """Tek worker süreci: kendi uygulamasını oluşturur ve süre bitene kadar istek atar"""
+    import random
+    from app import create_app
+
+    app = create_app()
+    client = app.test_client()
+    client.post('/login', json={'email': _email(index), 'password': PASSWORD})
+    rng = random.Random(index)
+
+    writes = reads = errors = 0
+    first_error = None
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if rng.random() < read_ratio:
+            response = client.get('/api/pomodoro/statistics?period=weekly')
+            if response.status_code == 200:
+                reads += 1
+            else:
+                errors += 1
+                first_error = first_error or f'statistics {response.status_code}: {response.get_data(as_text=True)[:200]}'
+            continue
+
+        response = client.post('/api/pomodoro/start', json={'session_type': 'shortBreak'})
+        if response.status_code != 201:
+            errors += 1
+            first_error = first_error or f'start {response.status_code}: {response.get_data(as_text=True)[:200]}'
+            continue
+        response = client.post('/api/pomodoro/end', json={
+            'session_id': response.get_json()['session']['id'],
+            'duration_minutes': 5.0
+        })
+        if response.status_code == 200:
+            writes += 2
+        else:
+            errors += 1
+            first_error = first_error or f'end {response.status_code}: {response.get_data(as_text=True)[:200]}'
+
+    results.put((writes, reads, errors, first_error))
+
+
+def _setup(workers):
+    """Tabloları ve kullanıcıları worker'lardan önce oluştur"""
+    from app import create_app
+
+    app = create_app()
+    client = app.test_client()
+    for i in range(workers):
+        client.post('/register', json={'email': _email(i), 'password': PASSWORD})
+        client.post('/logout')
+
+
+def run_profile(profile, workers, seconds, read_ratio):
+    """Bir yapılandırma profili için stres testini çalıştır
+
+    Config ortam değişkenlerini import sırasında okuduğu için kurulum ve
+    worker'lar profil başına yeni süreçlerde çalışır.
+    """
+    tmpdir = tempfile.mkdtemp(prefix='pomodoro-stress-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmpdir, 'stress.db')
+    os.environ['APP_CONFIG'] = profile
+    os.environ['WRITE_BEHIND_JOURNAL_DIR'] = os.path.join(tmpdir, 'journal')
+
+    context = multiprocessing.get_context('spawn')
+    setup = context.Process(target=_setup, args=(workers,))
+    setup.start()
+    setup.join()
+    if setup.exitcode != 0:
+        raise RuntimeError('Stres testi kurulumu başarısız')
+
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(i, seconds, read_ratio, results))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    totals = [results.get(timeout=seconds + 120) for _ in processes]
+    for process in processes:
+        process.join()
+
+    writes = sum(t[0] for t in totals)
+    reads = sum(t[1] for t in totals)
+    errors = sum(t[2] for t in totals)
+    first_error = next((t[3] for t in totals if t[3]), None)
+    return writes / seconds, reads / seconds, errors, first_error
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Eşzamanlı yazma stres testi')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--read-ratio', type=float, default=0.3, help='Okuma isteklerinin oranı')
+    parser.add_argument('--profiles', nargs='+', default=['development', 'production'])
+    parser.add_argument('--write-behind', action='store_true', help='start/end olaylarını toplu commit et')
+    args = parser.parse_args()
+
+    os.environ['WRITE_BEHIND_ENABLED'] = 'true' if args.write_behind else 'false'
+
+    # Worker'lar aynı IP'den gelir; bcrypt maliyeti ölçümü etkilemesin
+    os.environ['RATE_LIMIT_ENABLED'] = 'false'
+    os.environ.setdefault('BCRYPT_LOG_ROUNDS', '4')
+
+    print(f"{'profil':<12} {'yazma/s':>10} {'okuma/s':>10} {'hata':>8}")
+    for profile in args.profiles:
+        writes, reads, errors, first_error = run_profile(profile, args.workers, args.seconds, args.read_ratio)
+        print(f"{profile:<12} {writes:>10.1f} {reads:>10.1f} {errors:>8}")
+        if first_error:
+            print(f"  ilk hata: {first_error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Akış (streaming) dışa aktarma bellek testi
+
+Biri küçük (N/10), biri büyük (N) oturum geçmişine sahip iki kullanıcı
+oluşturur ve /api/export/sessions çıktısını parça parça tüketirken
+tracemalloc ile en yüksek bellek kullanımını ölçer. Dışa aktarma sabit
+bellekle çalışıyorsa iki değer birbirine yakın olmalıdır; büyük kullanıcının
+tepe değeri küçüğün --max-ratio katını aşarsa betik hata koduyla çıkar.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_export.py
+    python benchmarks/bench_export.py --sessions 1000000 --format ndjson --gzip
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PASSWORD = 'benchmark123'
+INSERT_CHUNK = 50000
+
+
+def _session_rows(user_id, count):
+    """Ardışık, bitmiş oturum satırları (bellekte tutulmadan üretilir)"""
+    start = datetime(2020, 1, 1)
+    for i in range(count):
+        started_at = start + timedelta(minutes=30 * i)
+        yield {
+            'user_id': user_id,
+            'task_id': None,
+            'session_type': 'work' if i % 2 == 0 else 'shortBreak',
+            'duration_minutes': 25.0 if i % 2 == 0 else 5.0,
+            'started_at': started_at,
+            'ended_at': started_at + timedelta(minutes=25),
+            'created_at': started_at,
+            'updated_at': started_at + timedelta(minutes=25),
+            'idempotency_key': None
+        }
+
+
+def populate(app, user_id, count):
+    """Oturumları INSERT_CHUNK'lık executemany partileriyle ekle"""
+    from models import db, PomodoroSession
+
+    with app.app_context():
+        rows = _session_rows(user_id, count)
+        while True:
+            chunk = [row for _, row in zip(range(INSERT_CHUNK), rows)]
+            if not chunk:
+                break
+            db.session.execute(PomodoroSession.__table__.insert(), chunk)
+            db.session.commit()
+
+
+def measure(client, query, compressed):
+    """Yanıtı parça parça tüket; (bayt, satır, süre, tepe bellek) döndür"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    response = client.get(f'/api/export/sessions?{query}', buffered=False)
+    decompressor = zlib.decompressobj(31) if compressed else None
+    total_bytes = 0
+    newlines = 0
+    for chunk in response.response:
+        total_bytes += len(chunk)
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        newlines += chunk.count(b'\n')
+    response.close()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return total_bytes, newlines, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming export bellek testi')
+    parser.add_argument('--sessions', type=int, default=1000000, help='Büyük kullanıcının oturum sayısı')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv')
+    parser.add_argument('--gzip', action='store_true')
+    parser.add_argument('--max-ratio', type=float, default=1.5, help='İzin verilen tepe bellek oranı (büyük / küçük)')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='pomodoro-export-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmpdir, 'export.db')
+    os.environ['RATE_LIMIT_ENABLED'] = 'false'
+    os.environ.setdefault('BCRYPT_LOG_ROUNDS', '4')
+
+    from app import create_app
+
+    app = create_app()
+    query = f"format={args.format}&gzip={'true' if args.gzip else 'false'}"
+
+    results = []
+    for index, count in enumerate([args.sessions // 10, args.sessions]):
+        client = app.test_client()
+        email = f'export{index}@example.com'
+        client.post('/register', json={'email': email, 'password': PASSWORD})
+        user_id = client.get('/api/user').get_json()['user']['id']
+
+        started = time.perf_counter()
+        populate(app, user_id, count)
+        print(f"{count} oturum eklendi ({time.perf_counter() - started:.1f} sn)")
+        results.append((count, *measure(client, query, args.gzip)))
+
+    print(f"{'oturum':>10} {'bayt':>12} {'satır':>10} {'süre (sn)':>10} {'tepe bellek (KB)':>17}")
+    for count, total_bytes, newlines, elapsed, peak in results:
+        print(f"{count:>10} {total_bytes:>12} {newlines:>10} {elapsed:>10.1f} {peak / 1024:>17.0f}")
+
+    ratio = results[1][4] / results[0][4]
+    print(f"Tepe bellek oranı (büyük / küçük): {ratio:.2f}")
+    if ratio > args.max_ratio:
+        print("HATA: dışa aktarma bellek kullanımı veri boyutuyla büyüyor")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
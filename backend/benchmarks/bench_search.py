@@ -0,0 +1,92 @@
+"""
+Görev arama benchmark'ı
+
+FTS5 indeksli arama ile LIKE '%x%' tam taramasını karşılaştırır.
+Varsayılan olarak 1.000 kullanıcıya dağılmış 1 milyon görev oluşturur.
+--users 1 ile tüm görevler tek bir yoğun kullanıcıya ait olur; FTS5'in
+asıl fark yarattığı durum budur. Az görevi olan kullanıcılarda user_id
+index'i üzerinden LIKE taraması da hızlıdır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --tasks 100000 --users 100
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = [
+    'rapor', 'toplantı', 'sunum', 'proje', 'kod', 'inceleme', 'müşteri', 'fatura',
+    'alışveriş', 'okuma', 'makale', 'tasarım', 'test', 'hata', 'düzeltme', 'plan',
+    'bütçe', 'eğitim', 'spor', 'ödev', 'sınav', 'tez', 'analiz', 'veri', 'taslak'
+]
+
+
+def seed_tasks(db, User, Task, task_count, user_count, batch_size=50000):
+    """Kullanıcılar arasında rastgele metinli görevler oluştur"""
+    users = [User(email=f'search{i}@example.com') for i in range(user_count)]
+    db.session.add_all(users)
+    db.session.commit()
+    user_ids = [u.id for u in users]
+
+    rng = random.Random(42)
+    for offset in range(0, task_count, batch_size):
+        rows = [
+            {
+                'user_id': rng.choice(user_ids),
+                'text': ' '.join(rng.choices(WORDS, k=rng.randint(2, 6))) + f' #{offset + i}',
+                'completed': rng.random() < 0.7
+            }
+            for i in range(min(batch_size, task_count - offset))
+        ]
+        db.session.execute(Task.__table__.insert(), rows)
+        db.session.commit()
+    return user_ids
+
+
+def measure(func, repeat):
+    """Ortalama çalışma süresini milisaniye cinsinden döndür"""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Görev arama benchmark')
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='pomodoro-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmpdir, 'bench.db')
+
+    from app import create_app
+    from models import db, User, Task
+    import search
+
+    app = create_app()
+    with app.app_context():
+        t0 = time.perf_counter()
+        user_ids = seed_tasks(db, User, Task, args.tasks, args.users)
+        print(f"{args.tasks} görev {time.perf_counter() - t0:.1f} sn'de oluşturuldu (FTS5: {search.fts_enabled})")
+
+        user_id = user_ids[len(user_ids) // 2]
+        print(f"{'sorgu':>18} {'fts5 (ms)':>10} {'like (ms)':>10}")
+        # Seçici (nadir) sorgu ve verideki sık kelimelerle geniş eşleşen sorgular
+        for query in ['12345', 'rap', 'proje kod', 'müşteri fatura analiz']:
+            search.fts_enabled = True
+            fts_ms = measure(lambda: search.search_tasks(user_id, query), args.repeat)
+            search.fts_enabled = False
+            like_ms = measure(lambda: search.search_tasks(user_id, query), args.repeat)
+            print(f"{query:>18} {fts_ms:>10.2f} {like_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
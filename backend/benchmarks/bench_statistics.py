@@ -0,0 +1,130 @@
+"""
+İstatistik hesaplama benchmark'ı
+
+Eski Python döngüsü tabanlı hesaplama ile günlük özet (daily_stats) tablosu
+üzerinden SQL GROUP BY tabanlı hesaplamayı, kullanıcı başına 10k ve 100k
+oturum ile karşılaştırır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_statistics.py
+    python benchmarks/bench_statistics.py --sizes 10000 100000 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed_sessions(db, User, Task, PomodoroSession, session_count, task_count=40):
+    """Tek bir kullanıcı için bu ay içinde bitmiş rastgele oturumlar oluştur"""
+    user = User(email=f'bench{session_count}@example.com')
+    db.session.add(user)
+    db.session.flush()
+    
+    tasks = [Task(user_id=user.id, text=f'Görev {i}') for i in range(task_count)]
+    db.session.add_all(tasks)
+    db.session.flush()
+    task_ids = [t.id for t in tasks]
+    
+    now = datetime.utcnow()
+    month_start = datetime(now.year, now.month, 1)
+    span = max((now - month_start).total_seconds(), 1)
+    rng = random.Random(session_count)
+    
+    rows = []
+    for _ in range(session_count):
+        session_type = rng.choices(['work', 'shortBreak', 'longBreak'], [6, 3, 1])[0]
+        ended_at = month_start + timedelta(seconds=rng.uniform(0, span))
+        duration = rng.choice([25.0, 25.0, 25.0, 12.5, 5.0, 15.0]) if session_type == 'work' else rng.choice([5.0, 15.0])
+        rows.append({
+            'user_id': user.id,
+            'task_id': rng.choice(task_ids) if session_type == 'work' else None,
+            'session_type': session_type,
+            'duration_minutes': duration,
+            'started_at': ended_at - timedelta(minutes=duration),
+            'ended_at': ended_at,
+            'created_at': ended_at - timedelta(minutes=duration)
+        })
+    db.session.execute(PomodoroSession.__table__.insert(), rows)
+    db.session.commit()
+    return user.id, month_start
+
+
+def legacy_statistics(PomodoroSession, user_id, start_date):
+    """Önceki uygulama: tüm satırları ORM nesnesi olarak yükleyip Python'da topla"""
+    sessions = PomodoroSession.query.filter(
+        PomodoroSession.user_id == user_id,
+        PomodoroSession.ended_at.isnot(None),
+        PomodoroSession.ended_at >= start_date
+    ).all()
+    
+    work_sessions = [s for s in sessions if s.session_type == 'work']
+    result = {
+        'total_work_minutes': sum(s.duration_minutes for s in work_sessions),
+        'total_short_break_minutes': sum(s.duration_minutes for s in sessions if s.session_type == 'shortBreak'),
+        'total_long_break_minutes': sum(s.duration_minutes for s in sessions if s.session_type == 'longBreak'),
+        'total_pomodoros': len(work_sessions),
+        'full_pomodoros': len([s for s in work_sessions if s.duration_minutes >= 25.0]),
+        'half_pomodoros': len([s for s in work_sessions if 0 < s.duration_minutes < 25.0])
+    }
+    task_stats = {}
+    for s in work_sessions:
+        if s.task_id:
+            entry = task_stats.setdefault(s.task_id, {'task_text': s.task.text, 'total_minutes': 0})
+            entry['total_minutes'] += s.duration_minutes
+    result['task_statistics'] = task_stats
+    return result
+
+
+def sql_statistics(user_id, start_date):
+    """Yeni uygulama: toplamlar ve görev dağılımı günlük özetlerden SQL ile"""
+    from pomodoro import _aggregate_totals, _aggregate_task_statistics
+    return _aggregate_totals(user_id, start_date), _aggregate_task_statistics(user_id, start_date)
+
+
+def measure(func, repeat):
+    """En iyi çalışma süresini milisaniye cinsinden döndür"""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='İstatistik hesaplama benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    tmpdir = tempfile.mkdtemp(prefix='pomodoro-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmpdir, 'bench.db')
+    
+    from app import create_app
+    from models import db, User, Task, PomodoroSession
+    from rollups import rebuild_daily_stats
+    
+    app = create_app()
+    with app.app_context():
+        print(f"{'oturum':>10} {'python (ms)':>14} {'sql (ms)':>12} {'hızlanma':>10}")
+        for size in args.sizes:
+            user_id, start_date = seed_sessions(db, User, Task, PomodoroSession, size)
+            rebuild_daily_stats(user_id)
+            
+            def run_legacy():
+                legacy_statistics(PomodoroSession, user_id, start_date)
+                db.session.expunge_all()
+            
+            legacy_ms = measure(run_legacy, args.repeat)
+            sql_ms = measure(lambda: sql_statistics(user_id, start_date), args.repeat)
+            print(f"{size:>10} {legacy_ms:>14.1f} {sql_ms:>12.1f} {legacy_ms / sql_ms:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
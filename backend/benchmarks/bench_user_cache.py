@@ -0,0 +1,84 @@
+"""
+Kullanıcı önbelleği (user_loader) benchmark'ı
+
+Kimliği doğrulanmış isteklerde istek başına SQL ifadesi sayısını ve süresini
+önbellek kapalı (USER_CACHE_SIZE=0) ve açık iken karşılaştırır.
+
+Kullanım (backend dizininden):
+    python benchmarks/bench_user_cache.py
+    python benchmarks/bench_user_cache.py --requests 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENDPOINTS = [
+    ('GET', '/api/tasks'),
+    ('PUT', '/api/tasks/1'),
+    ('GET', '/api/pomodoro/statistics?period=weekly'),
+    ('GET', '/api/user')
+]
+
+
+def run(app, client, requests_per_endpoint):
+    """Endpoint başına (ortalama SQL sayısı, ortalama ms) döndür"""
+    from query_budget import count_queries
+    from models import db
+
+    with app.app_context():
+        engine = db.engine
+
+    results = {}
+    for method, path in ENDPOINTS:
+        body = {'completed': True} if method == 'PUT' else None
+        total_queries = 0
+        started = time.perf_counter()
+        for _ in range(requests_per_endpoint):
+            with count_queries(engine) as statements:
+                client.open(path, method=method, json=body)
+            total_queries += len(statements)
+        elapsed = time.perf_counter() - started
+        results[f'{method} {path}'] = (
+            total_queries / requests_per_endpoint,
+            elapsed / requests_per_endpoint * 1000
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kullanıcı önbelleği benchmark')
+    parser.add_argument('--requests', type=int, default=200, help='Endpoint başına istek')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='pomodoro-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmpdir, 'bench.db')
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+
+    from app import create_app
+    from user_cache import user_cache
+
+    app = create_app()
+    client = app.test_client()
+    client.post('/register', json={'email': 'cache@example.com', 'password': 'benchmark123'})
+    client.post('/api/tasks', json={'text': 'Önbellek testi'})
+
+    default_size = user_cache.max_size
+    user_cache.max_size = 0
+    without_cache = run(app, client, args.requests)
+    user_cache.max_size = default_size
+    user_cache.clear()
+    with_cache = run(app, client, args.requests)
+
+    print(f"{'endpoint':<44} {'SQL (kapalı)':>13} {'SQL (açık)':>11} {'ms (kapalı)':>12} {'ms (açık)':>10}")
+    for name in without_cache:
+        q0, ms0 = without_cache[name]
+        q1, ms1 = with_cache[name]
+        print(f"{name:<44} {q0:>13.2f} {q1:>11.2f} {ms0:>12.2f} {ms1:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Yük testi için sentetik veri üreteci
+
+N kullanıcı, görev ve oturum oluşturur. Dağılımlar gerçek kullanıma benzer:
+- kullanıcı başına görev sayısı ve aktiflik çarpık (birkaç yoğun, çok sayıda hafif kullanıcı)
+- oturumlar son günlere yayılır, hafta içi ve çalışma saatlerinde yoğunlaşır
+- 4 çalışma oturumundan sonra uzun mola, diğerlerinde kısa mola
+- çalışma oturumlarının çoğu tam (25 dk), bir kısmı yarıda kesilmiş
+- oturumların küçük bir kısmı hiç bitirilmemiş (ended_at boş)
+
+Tüm kullanıcıların şifresi BENCH_PASSWORD'dür; bcrypt maliyetini tekrarlamamak
+için hash bir kez hesaplanıp paylaşılır.
+
+Kullanım (backend dizininden):
+    python benchmarks/datagen.py --db /tmp/bench.db --users 200 --sessions 300
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_PASSWORD = 'benchmark123'
+
+TASK_WORDS = [
+    'rapor', 'toplantı', 'sunum', 'proje', 'kod', 'inceleme', 'müşteri', 'fatura',
+    'okuma', 'makale', 'tasarım', 'test', 'hata', 'plan', 'bütçe', 'ödev', 'sınav', 'analiz'
+]
+
+# Saat başına oturum ağırlıkları (UTC, 0-23): gece sakin, mesai saatlerinde yoğun
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 3, 5, 8, 10, 10, 9, 6, 8, 10, 10, 9, 7, 5, 4, 4, 3, 2, 1]
+
+
+def bench_email(index):
+    """Üretilen kullanıcının email adresi"""
+    return f'bench{index}@example.com'
+
+
+def _session_rows(rng, user_id, task_ids, session_count, days, now):
+    """Bir kullanıcının oturum satırlarını ardışık çalışma blokları halinde üret"""
+    rows = []
+    work_streak = 0
+    while len(rows) < session_count:
+        day = now - timedelta(days=rng.uniform(1, days))
+        # Hafta sonu daha az çalışılır
+        if day.weekday() >= 5 and rng.random() < 0.6:
+            continue
+        hour = rng.choices(range(24), HOUR_WEIGHTS)[0]
+        moment = datetime(day.year, day.month, day.day, hour, rng.randint(0, 59))
+
+        # Bir çalışma bloğu: çalışma / mola dönüşümlü 1-8 oturum
+        for _ in range(min(rng.randint(1, 8), session_count - len(rows))):
+            if not rows or rows[-1]['session_type'] != 'work':
+                session_type = 'work'
+                work_streak += 1
+                duration = 25.0 if rng.random() < 0.75 else round(rng.uniform(3, 24), 1)
+            elif work_streak >= 4:
+                session_type = 'longBreak'
+                work_streak = 0
+                duration = 15.0
+            else:
+                session_type = 'shortBreak'
+                duration = 5.0
+
+            started_at = moment
+            ended_at = started_at + timedelta(minutes=duration)
+            abandoned = rng.random() < 0.02
+            rows.append({
+                'user_id': user_id,
+                'task_id': rng.choice(task_ids) if session_type == 'work' and task_ids and rng.random() < 0.8 else None,
+                'session_type': session_type,
+                'duration_minutes': 0.0 if abandoned else duration,
+                'started_at': started_at,
+                'ended_at': None if abandoned else ended_at,
+                'created_at': started_at,
+                'updated_at': started_at if abandoned else ended_at
+            })
+            moment = ended_at + timedelta(minutes=rng.randint(0, 3))
+    return rows
+
+
+def generate(users=100, tasks_per_user=30, sessions_per_user=200, days=90, seed=42):
+    """Aktif uygulama bağlamında veritabanını sentetik veriyle doldur
+
+    Oluşturulan kullanıcı id'lerinin listesini döndürür.
+    """
+    from auth import password_hasher
+    from models import db, User, Task, PomodoroSession
+    from rollups import rebuild_daily_stats
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = password_hasher.generate(BENCH_PASSWORD)
+
+    user_objects = [User(email=bench_email(i), password_hash=password_hash) for i in range(users)]
+    db.session.add_all(user_objects)
+    db.session.commit()
+    user_ids = [user.id for user in user_objects]
+
+    for user_id in user_ids:
+        # Pareto dağılımı: kullanıcıların çoğu az, birkaçı çok aktif
+        activity = min(rng.paretovariate(1.5), 10.0)
+        task_count = max(1, int(tasks_per_user * activity / 2))
+        session_count = max(1, int(sessions_per_user * activity / 2))
+
+        task_rows = []
+        for _ in range(task_count):
+            created_at = now - timedelta(days=rng.uniform(0, days))
+            task_rows.append({
+                'user_id': user_id,
+                'text': ' '.join(rng.choices(TASK_WORDS, k=rng.randint(1, 4))),
+                'completed': rng.random() < 0.6,
+                'created_at': created_at,
+                'updated_at': created_at + (now - created_at) * rng.random()
+            })
+        db.session.execute(Task.__table__.insert(), task_rows)
+        task_ids = [row[0] for row in db.session.query(Task.id).filter(Task.user_id == user_id).all()]
+
+        db.session.execute(
+            PomodoroSession.__table__.insert(),
+            _session_rows(rng, user_id, task_ids, session_count, days, now)
+        )
+        db.session.commit()
+
+    rebuild_daily_stats()
+    return user_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sentetik benchmark verisi üret')
+    parser.add_argument('--db', required=True, help='Oluşturulacak SQLite dosyası')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--tasks', type=int, default=30, help='Kullanıcı başına ortalama görev')
+    parser.add_argument('--sessions', type=int, default=200, help='Kullanıcı başına ortalama oturum')
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.abspath(args.db)
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        user_ids = generate(args.users, args.tasks, args.sessions, args.days, args.seed)
+    print(f"{len(user_ids)} kullanıcı oluşturuldu: {args.db} (şifre: {BENCH_PASSWORD})")
+
+
+if __name__ == '__main__':
+    main()
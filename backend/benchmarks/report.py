@@ -0,0 +1,121 @@
+"""
+Yük testi sonuç raporu
+
+Endpoint başına p50/p95/p99 gecikme ve saniyedeki istek sayısını hesaplar,
+JSON olarak kaydeder ve iki raporu karşılaştırır.
+
+Kullanım (backend dizininden):
+    python benchmarks/report.py benchmarks/results/eski.json benchmarks/results/yeni.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+
+
+def percentile(sorted_values, p):
+    """Sıralı listede doğrusal enterpolasyonlu yüzdelik (p: 0-100)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * p / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(durations, errors, wall_seconds):
+    """Süre listesinden (saniye) özet istatistikler"""
+    values = sorted(durations)
+    count = len(values)
+    return {
+        'count': count,
+        'errors': errors,
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p95_ms': round(percentile(values, 95) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'mean_ms': round(sum(values) / count * 1000, 3) if count else 0.0,
+        'max_ms': round(values[-1] * 1000, 3) if count else 0.0,
+        'throughput_rps': round(count / wall_seconds, 2) if wall_seconds > 0 else 0.0
+    }
+
+
+def build_report(samples, wall_seconds, parameters):
+    """samples: {endpoint: [(süre_saniye, durum_kodu), ...]}"""
+    endpoints = {}
+    all_durations = []
+    all_errors = 0
+    for endpoint, items in sorted(samples.items()):
+        durations = [duration for duration, _ in items]
+        errors = sum(1 for _, status in items if status >= 400)
+        endpoints[endpoint] = summarize(durations, errors, wall_seconds)
+        all_durations.extend(durations)
+        all_errors += errors
+
+    return {
+        'created_at': datetime.utcnow().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform()
+        },
+        'parameters': parameters,
+        'wall_seconds': round(wall_seconds, 3),
+        'total': summarize(all_durations, all_errors, wall_seconds),
+        'endpoints': endpoints
+    }
+
+
+def save_report(report, path):
+    """Raporu JSON olarak kaydet"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def print_report(report, out=sys.stdout):
+    """Raporu tablo olarak yazdır"""
+    out.write(f"{'endpoint':<44} {'adet':>7} {'hata':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'istek/s':>9}\n")
+    rows = list(report['endpoints'].items()) + [('TOPLAM', report['total'])]
+    for name, s in rows:
+        out.write(
+            f"{name:<44} {s['count']:>7} {s['errors']:>5} {s['p50_ms']:>9.2f} "
+            f"{s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f} {s['throughput_rps']:>9.1f}\n"
+        )
+
+
+def compare(old, new, out=sys.stdout):
+    """İki raporun endpoint başına p50/p95 değişimini yazdır"""
+    out.write(f"{'endpoint':<44} {'p50 eski':>9} {'p50 yeni':>9} {'p95 eski':>9} {'p95 yeni':>9} {'değişim':>9}\n")
+    names = sorted(set(old['endpoints']) | set(new['endpoints']))
+    for name in names:
+        a = old['endpoints'].get(name)
+        b = new['endpoints'].get(name)
+        if not a or not b:
+            out.write(f"{name:<44} {'(sadece bir raporda)':>30}\n")
+            continue
+        change = (b['p95_ms'] - a['p95_ms']) / a['p95_ms'] * 100 if a['p95_ms'] else 0.0
+        out.write(
+            f"{name:<44} {a['p50_ms']:>9.2f} {b['p50_ms']:>9.2f} "
+            f"{a['p95_ms']:>9.2f} {b['p95_ms']:>9.2f} {change:>+8.1f}%\n"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Yük testi raporlarını karşılaştır')
+    parser.add_argument('old')
+    parser.add_argument('new', nargs='?')
+    args = parser.parse_args()
+
+    with open(args.old, encoding='utf-8') as f:
+        old = json.load(f)
+    if not args.new:
+        print_report(old)
+        return
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+    compare(old, new)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Karma iş yükü yük testi
+
+create_app() üzerinde sanal kullanıcılarla gerçekçi bir istek karışımı
+çalıştırır: giriş, görev listeleme/ekleme/güncelleme/silme, pomodoro
+başlatma/bitirme ve her periyot için istatistik. Her endpoint için p50/p95/p99
+gecikme ve saniyedeki istek sayısı JSON rapor olarak kaydedilir.
+
+İki taşıma modu vardır:
+- testclient: Flask test istemcisi (süreç içi, ağ maliyeti yok)
+- wsgi: yerel bir werkzeug sunucusu ve HTTP istemcisi (--concurrency ile paralel)
+
+Kullanım (backend dizininden):
+    python benchmarks/workload.py
+    python benchmarks/workload.py --users 50 --clients 20 --requests 200 --mode wsgi --concurrency 8
+    python benchmarks/workload.py --db /tmp/bench.db --output benchmarks/results/ana.json
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datagen import BENCH_PASSWORD, bench_email, generate
+from report import build_report, save_report, print_report
+
+
+# İşlem adı -> ağırlık (isteklerin ne kadarının bu işlem olacağı)
+WORKLOAD_MIX = {
+    'list_tasks': 20,
+    'create_task': 8,
+    'update_task': 8,
+    'delete_task': 3,
+    'pomodoro': 15,
+    'statistics_daily': 8,
+    'statistics_weekly': 8,
+    'statistics_monthly': 8,
+    'login': 2
+}
+
+
+class TestClientTransport:
+    """Flask test istemcisi üzerinden istek"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpTransport:
+    """Gerçek HTTP üzerinden istek (çerezler istemci başına saklanır)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+        try:
+            with self.opener.open(req) as response:
+                return response.status, json.loads(response.read() or b'null')
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+
+class VirtualUser:
+    """Tek bir kullanıcının istek dizisini çalıştırır ve süreleri kaydeder"""
+
+    def __init__(self, transport, email, rng, record):
+        self.transport = transport
+        self.email = email
+        self.rng = rng
+        self.record = record
+        self.task_ids = []
+
+    def call(self, name, method, path, body=None):
+        started = time.perf_counter()
+        status, payload = self.transport.request(method, path, body)
+        self.record(name, time.perf_counter() - started, status)
+        return status, payload
+
+    def login(self):
+        self.call('POST /login', 'POST', '/login', {'email': self.email, 'password': BENCH_PASSWORD})
+
+    def list_tasks(self):
+        status, payload = self.call('GET /api/tasks', 'GET', '/api/tasks?completed=false&limit=100')
+        if status == 200 and payload:
+            self.task_ids = [task['id'] for task in payload.get('tasks', [])]
+
+    def create_task(self):
+        status, payload = self.call(
+            'POST /api/tasks', 'POST', '/api/tasks', {'text': f'yük testi görevi {self.rng.randint(0, 10 ** 6)}'}
+        )
+        if status == 201 and payload:
+            self.task_ids.append(payload['task']['id'])
+
+    def update_task(self):
+        if not self.task_ids:
+            return self.create_task()
+        task_id = self.rng.choice(self.task_ids)
+        self.call('PUT /api/tasks/<id>', 'PUT', f'/api/tasks/{task_id}', {'completed': self.rng.random() < 0.5})
+
+    def delete_task(self):
+        if not self.task_ids:
+            return self.create_task()
+        task_id = self.task_ids.pop(self.rng.randrange(len(self.task_ids)))
+        self.call('DELETE /api/tasks/<id>', 'DELETE', f'/api/tasks/{task_id}')
+
+    def pomodoro(self):
+        session_type = self.rng.choices(['work', 'shortBreak', 'longBreak'], [6, 3, 1])[0]
+        body = {'session_type': session_type}
+        if session_type == 'work' and self.task_ids:
+            body['task_id'] = self.rng.choice(self.task_ids)
+        status, payload = self.call('POST /api/pomodoro/start', 'POST', '/api/pomodoro/start', body)
+        if status == 201 and payload:
+            self.call('POST /api/pomodoro/end', 'POST', '/api/pomodoro/end', {
+                'session_id': payload['session']['id'],
+                'duration_minutes': 25.0 if session_type == 'work' else 5.0
+            })
+
+    def statistics(self, period):
+        self.call(f'GET /api/pomodoro/statistics?period={period}', 'GET', f'/api/pomodoro/statistics?period={period}')
+
+    def run(self, request_count):
+        self.login()
+        self.list_tasks()
+        operations = list(WORKLOAD_MIX)
+        weights = [WORKLOAD_MIX[name] for name in operations]
+        for _ in range(request_count):
+            name = self.rng.choices(operations, weights)[0]
+            if name.startswith('statistics_'):
+                self.statistics(name.split('_', 1)[1])
+            else:
+                getattr(self, name)()
+
+
+def run_workload(app, emails, request_count, mode='testclient', concurrency=1, seed=1):
+    """Her e-posta için bir sanal kullanıcı çalıştır; (örnekler, duvar süresi) döndür"""
+    samples = {}
+    lock = threading.Lock()
+
+    def record(name, duration, status):
+        with lock:
+            samples.setdefault(name, []).append((duration, status))
+
+    server = None
+    if mode == 'wsgi':
+        from werkzeug.serving import make_server
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_port}'
+
+    def run_user(index):
+        transport = HttpTransport(base_url) if mode == 'wsgi' else TestClientTransport(app)
+        VirtualUser(transport, emails[index], random.Random(seed + index), record).run(request_count)
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(run_user, range(len(emails))))
+    finally:
+        if server is not None:
+            server.shutdown()
+    return samples, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Karma iş yükü yük testi')
+    parser.add_argument('--db', help='Mevcut benchmark veritabanı (yoksa geçici veritabanı üretilir)')
+    parser.add_argument('--users', type=int, default=50, help='Üretilecek kullanıcı sayısı')
+    parser.add_argument('--tasks', type=int, default=30)
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=10, help='Sanal kullanıcı sayısı')
+    parser.add_argument('--requests', type=int, default=100, help='Sanal kullanıcı başına istek')
+    parser.add_argument('--mode', choices=['testclient', 'wsgi'], default='testclient')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='JSON rapor yolu (varsayılan: benchmarks/results/<zaman>.json)')
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='pomodoro-load-'), 'bench.db')
+    existing = os.path.exists(db_path)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.abspath(db_path)
+    # Tüm sanal kullanıcılar aynı IP'den gelir; istek sınırlama ölçümü bozmasın
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+
+    from app import create_app
+    app = create_app()
+
+    with app.app_context():
+        if not existing:
+            print(f"Veri üretiliyor: {args.users} kullanıcı...")
+            generate(args.users, args.tasks, args.sessions, seed=args.seed)
+        from models import User
+        user_count = User.query.filter(User.email.like('bench%@example.com')).count()
+
+    if user_count == 0:
+        sys.exit("Veritabanında benchmark kullanıcısı yok (datagen.py ile üretin)")
+
+    emails = [bench_email(i % user_count) for i in range(args.clients)]
+    samples, wall_seconds = run_workload(
+        app, emails, args.requests, args.mode, args.concurrency, args.seed
+    )
+
+    report = build_report(samples, wall_seconds, {
+        'mode': args.mode,
+        'clients': args.clients,
+        'requests_per_client': args.requests,
+        'concurrency': args.concurrency,
+        'users': user_count,
+        'seed': args.seed,
+        'mix': WORKLOAD_MIX
+    })
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'results',
+        datetime.utcnow().strftime('%Y%m%dT%H%M%S') + '.json'
+    )
+    save_report(report, output)
+    print_report(report)
+    print(f"\nRapor kaydedildi: {output}")
+
+
+if __name__ == '__main__':
+    main()
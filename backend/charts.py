@@ -0,0 +1,197 @@
+"""
+İstatistik grafikleri için sunucu tarafında zaman aralığı (bucket) hesaplama
+
+Saatlik aralıklar ham oturumlardan, günlük/haftalık/aylık aralıklar ise
+günlük özet (daily_stats) tablosundan SQL tarih fonksiyonlarıyla gruplanır.
+Günlük özet saat çözünürlüğü taşımadığı için arşive taşınmış oturumların
+saatlik aralıkları arşiv dosyasından okunup Python'da gruplanır.
+Tüm zamanlar UTC'dir.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import func, case
+from models import db, Task, PomodoroSession, DailyStat, FULL_POMODORO_MINUTES
+
+
+BUCKET_SIZES = ('hour', 'day', 'week', 'month')
+
+# Tek istekte döndürülebilecek en fazla aralık sayısı (31 günlük saatlik görünüm)
+MAX_CHART_BUCKETS = 744
+
+
+def truncate(moment, bucket):
+    """Zamanı ait olduğu aralığın başlangıcına yuvarla"""
+    if bucket == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = datetime(moment.year, moment.month, moment.day)
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start, bucket):
+    """Bir sonraki aralığın başlangıcını döndür"""
+    if bucket == 'hour':
+        return start + timedelta(hours=1)
+    if bucket == 'week':
+        return start + timedelta(days=7)
+    if bucket == 'month':
+        return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    return start + timedelta(days=1)
+
+
+def bucket_starts(range_start, range_end, bucket):
+    """[range_start, range_end) aralığını kapsayan aralık başlangıçlarını üret"""
+    starts = []
+    current = truncate(range_start, bucket)
+    while current < range_end:
+        starts.append(current)
+        if len(starts) > MAX_CHART_BUCKETS:
+            raise ValueError('Çok fazla aralık')
+        current = next_bucket(current, bucket)
+    return starts
+
+
+def _bucket_expression(column, bucket):
+    """Veritabanı diyalektine göre SQL tarih gruplama ifadesi"""
+    if db.engine.dialect.name == 'postgresql':
+        return func.date_trunc(bucket, column)
+
+    # SQLite
+    if bucket == 'hour':
+        return func.strftime('%Y-%m-%d %H:00:00', column)
+    if bucket == 'week':
+        return func.date(column, 'weekday 0', '-6 days')
+    if bucket == 'month':
+        return func.strftime('%Y-%m-01', column)
+    return func.date(column)
+
+
+def _as_datetime(value):
+    """SQL gruplama sonucunu datetime'a çevir"""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if len(value) == 10:
+        return datetime.strptime(value, '%Y-%m-%d')
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+
+def _hourly_rows(user_id, range_start, range_end):
+    """Saatlik aralıklar: ham oturumlardan gruplanır"""
+    duration = PomodoroSession.duration_minutes
+    key = _bucket_expression(PomodoroSession.ended_at, 'hour')
+    return db.session.query(
+        key,
+        PomodoroSession.session_type,
+        PomodoroSession.task_id,
+        func.count(PomodoroSession.id),
+        func.sum(duration),
+        func.sum(case((duration >= FULL_POMODORO_MINUTES, 1), else_=0)),
+        func.sum(case(((duration > 0) & (duration < FULL_POMODORO_MINUTES), 1), else_=0))
+    ).filter(
+        PomodoroSession.user_id == user_id,
+        PomodoroSession.ended_at.isnot(None),
+        PomodoroSession.ended_at >= range_start,
+        PomodoroSession.ended_at < range_end
+    ).group_by(key, PomodoroSession.session_type, PomodoroSession.task_id).all()
+
+
+def _archived_hourly_rows(user_id, range_start, range_end):
+    """Saatlik aralıklar: arşive taşınmış oturumlardan (_hourly_rows ile aynı biçimde)"""
+    from archive import archived_sessions
+
+    totals = {}
+    for session in archived_sessions(user_id, start=range_start, end=range_end):
+        duration = session['duration_minutes'] or 0
+        key = (
+            truncate(datetime.fromisoformat(session['ended_at']), 'hour'),
+            session['session_type'],
+            session['task_id']
+        )
+        entry = totals.setdefault(key, [0, 0.0, 0, 0])
+        entry[0] += 1
+        entry[1] += duration
+        entry[2] += duration >= FULL_POMODORO_MINUTES
+        entry[3] += 0 < duration < FULL_POMODORO_MINUTES
+    return [key + tuple(values) for key, values in totals.items()]
+
+
+def _rollup_rows(user_id, range_start, range_end, bucket):
+    """Günlük/haftalık/aylık aralıklar: günlük özetlerden gruplanır"""
+    key = _bucket_expression(DailyStat.day, bucket)
+    return db.session.query(
+        key,
+        DailyStat.session_type,
+        DailyStat.task_id,
+        func.sum(DailyStat.session_count),
+        func.sum(DailyStat.minutes),
+        func.sum(DailyStat.full_count),
+        func.sum(DailyStat.half_count)
+    ).filter(
+        DailyStat.user_id == user_id,
+        DailyStat.day >= range_start.date(),
+        DailyStat.day < range_end.date()
+    ).group_by(key, DailyStat.session_type, DailyStat.task_id).all()
+
+
+def build_chart(user_id, range_start, range_end, bucket):
+    """Verilen aralık için sıfır dolgulu grafik serilerini hesapla"""
+    if bucket != 'hour':
+        # Günlük özetler gün çözünürlüğünde; aralık gün/hafta/ay sınırlarına genişletilir
+        range_start = truncate(range_start, bucket)
+        if range_end != truncate(range_end, 'day'):
+            range_end = truncate(range_end, 'day') + timedelta(days=1)
+
+    starts = bucket_starts(range_start, range_end, bucket)
+    buckets = {
+        start: {
+            'start': start.isoformat(),
+            'minutes': {'work': 0, 'shortBreak': 0, 'longBreak': 0},
+            'pomodoros': 0,
+            'full_pomodoros': 0,
+            'half_pomodoros': 0,
+            'tasks': {}
+        }
+        for start in starts
+    }
+
+    if bucket == 'hour':
+        rows = _hourly_rows(user_id, range_start, range_end)
+        rows += _archived_hourly_rows(user_id, range_start, range_end)
+    else:
+        rows = _rollup_rows(user_id, range_start, range_end, bucket)
+
+    task_ids = set()
+    for key, session_type, task_id, count, minutes, full, half in rows:
+        entry = buckets.get(_as_datetime(key))
+        if entry is None:
+            continue
+        minutes = minutes or 0
+        entry['minutes'][session_type] = entry['minutes'].get(session_type, 0) + minutes
+        if session_type == 'work':
+            entry['pomodoros'] += count or 0
+            entry['full_pomodoros'] += full or 0
+            entry['half_pomodoros'] += half or 0
+            if task_id is not None:
+                entry['tasks'][str(task_id)] = entry['tasks'].get(str(task_id), 0) + minutes
+                task_ids.add(task_id)
+
+    # Görev metinleri tek IN sorgusuyla
+    task_texts = {}
+    if task_ids:
+        task_texts = {
+            str(task_id): text
+            for task_id, text in db.session.query(Task.id, Task.text).filter(
+                Task.user_id == user_id,
+                Task.id.in_(task_ids)
+            ).all()
+        }
+
+    return {
+        'bucket': bucket,
+        'from': range_start.isoformat(),
+        'to': range_end.isoformat(),
+        'buckets': [buckets[start] for start in starts],
+        'tasks': task_texts
+    }
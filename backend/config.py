@@ -10,6 +10,12 @@ class Config:
     # Veritabanı ayarları
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///pomodoro.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    
+    # Her yeni SQLite bağlantısında çalıştırılacak PRAGMA'lar (database.py)
+    SQLITE_PRAGMAS = {}
+    # Sunucu veritabanları için bağlantı havuzu ayarları (SQLite'ta kullanılmaz)
+    SQLALCHEMY_POOL_OPTIONS = {}
     
     # Güvenlik ayarları
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
@@ -17,6 +23,71 @@ class Config:
     # Session ayarları
     PERMANENT_SESSION_LIFETIME = 3600  # 1 saat
     
+    # Kullanıcı önbelleği (user_loader); 0 boyut önbelleği kapatır
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 4096))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))  # saniye
+    
+    # Şifre hash ayarları (maliyet değişirse hash'ler girişte yenilenir)
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0))  # 0: min(4, CPU sayısı)
+    PASSWORD_HASH_QUEUE_MAX = int(os.environ.get('PASSWORD_HASH_QUEUE_MAX', 16))  # Aşılırsa 503
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+    PASSWORD_HASH_RETRY_AFTER = int(os.environ.get('PASSWORD_HASH_RETRY_AFTER', 1))
+    
+    # İstatistik yanıt önbelleği (kullanıcı + periyot başına bir kayıt)
+    STATISTICS_CACHE_SIZE = int(os.environ.get('STATISTICS_CACHE_SIZE', 1024))
+    
+    # İstek ölçümleri (/metrics, Prometheus formatı)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Zorunlu: scrape için Bearer token (yoksa /metrics kapalı)
+    
+    # İstek profilleme (varsayılan kapalı)
+    PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')  # X-Profile-Token başlığı ile eşleşen istekler profillenir
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))  # 0.0 - 1.0
+    PROFILE_DIR = os.environ.get('PROFILE_DIR')  # Varsayılan: instance/profiles
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 200))
+    
+    # İstek sınırlama (token bucket): endpoint -> {'ip' | 'user': (kapasite, dolma süresi sn)}
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_STORAGE = os.environ.get('RATE_LIMIT_STORAGE', 'memory')  # veya 'sqlite:/yol/limits.db'
+    RATE_LIMITS = {
+        'auth.login': {'ip': (10, 60)},
+        'auth.register': {'ip': (5, 300)},
+        'pomodoro.create_task': {'user': (60, 60)},
+        'pomodoro.batch_tasks': {'user': (20, 60)},
+        'pomodoro.start_pomodoro': {'ip': (60, 60), 'user': (30, 60)},
+        'pomodoro.end_pomodoro': {'ip': (60, 60), 'user': (30, 60)},
+        'pomodoro.sync_sessions': {'user': (20, 60)},
+        'export.export_tasks': {'user': (10, 60)},
+        'export.export_sessions': {'user': (10, 60)},
+        'importer.import_records': {'user': (10, 60)},
+        'importer.import_local_storage': {'user': (10, 60)}
+    }
+    
+    # Terk edilmiş açık oturumlar: bu yaştan eskiler kapatılır ('close') veya silinir ('purge')
+    OPEN_SESSION_MAX_AGE_MINUTES = int(os.environ.get('OPEN_SESSION_MAX_AGE_MINUTES', 120))
+    OPEN_SESSION_SWEEP_ACTION = os.environ.get('OPEN_SESSION_SWEEP_ACTION', 'close')
+    OPEN_SESSION_SWEEP_BATCH = int(os.environ.get('OPEN_SESSION_SWEEP_BATCH', 500))
+    OPEN_SESSION_SWEEP_INTERVAL = int(os.environ.get('OPEN_SESSION_SWEEP_INTERVAL', 0))  # saniye, 0 = kapalı
+    OPEN_SESSION_DURATION_CAPS = {'work': 12.5, 'shortBreak': 5.0, 'longBreak': 15.0}  # dakika; çalışma tam pomodoro sayılmaz (<25)
+    MAX_OPEN_SESSIONS_PER_USER = int(os.environ.get('MAX_OPEN_SESSIONS_PER_USER', 3))  # 0 = sınırsız
+    
+    # Saklama: bu günden eski oturumlar günlük özetlere sıkıştırılıp arşiv dosyalarına taşınır
+    SESSION_RETENTION_DAYS = int(os.environ.get('SESSION_RETENTION_DAYS', 365))
+    SESSION_ARCHIVE_DIR = os.environ.get('SESSION_ARCHIVE_DIR')  # varsayılan: instance/archive
+    SESSION_ARCHIVE_BATCH = int(os.environ.get('SESSION_ARCHIVE_BATCH', 5000))
+    
+    # İçe aktarma: transaction başına kaynak satır sayısı
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 500))
+    
+    # Write-behind: start/end olayları günlüğe yazılıp toplu commit edilir
+    WRITE_BEHIND_ENABLED = os.environ.get('WRITE_BEHIND_ENABLED', 'false').lower() == 'true'
+    WRITE_BEHIND_INTERVAL_MS = int(os.environ.get('WRITE_BEHIND_INTERVAL_MS', 5))
+    WRITE_BEHIND_BATCH_SIZE = int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', 500))
+    WRITE_BEHIND_JOURNAL_DIR = os.environ.get('WRITE_BEHIND_JOURNAL_DIR')  # varsayılan: instance/journal
+    WRITE_BEHIND_FSYNC = os.environ.get('WRITE_BEHIND_FSYNC', 'false').lower() == 'true'
+    WRITE_BEHIND_MAX_RETRIES = int(os.environ.get('WRITE_BEHIND_MAX_RETRIES', 5))  # Geçici olmayan hatalarda; sonra dead-letter
+    
     # Google OAuth ayarları
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
@@ -37,3 +108,41 @@ class Config:
             'secret': GOOGLE_CLIENT_SECRET
         }
     }
+
+
+class ProductionConfig(Config):
+    """Üretim profili: eşzamanlı yazmalar için veritabanı ayarları"""
+    
+    # SQLite: WAL ile okuyucular yazarı beklemez, kilitte hata yerine busy_timeout kadar beklenir
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # ms
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),  # bayt
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64000)),  # negatif: KiB
+        'temp_store': 'MEMORY'
+    }
+    
+    # Sunucu veritabanları (PostgreSQL, MySQL) için bağlantı havuzu
+    SQLALCHEMY_POOL_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True
+    }
+
+
+# APP_CONFIG ortam değişkeni ile seçilir
+CONFIGS = {
+    'development': Config,
+    'production': ProductionConfig
+}
+
+
+def get_config(name=None):
+    """Yapılandırma sınıfını adına göre döndür (varsayılan: APP_CONFIG veya development)"""
+    name = name or os.environ.get('APP_CONFIG', 'development')
+    if name not in CONFIGS:
+        raise ValueError(f"Bilinmeyen APP_CONFIG: {name}")
+    return CONFIGS[name]
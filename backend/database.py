@@ -0,0 +1,52 @@
+"""
+Veritabanı motoru ayarları
+
+Yapılandırma profiline göre (config.get_config) engine seçeneklerini
+hazırlar ve db.init_app'i çağırır:
+- SQLite: SQLITE_PRAGMAS her yeni bağlantıda connect olayıyla uygulanır
+  (WAL, synchronous, busy_timeout, mmap_size, cache_size ...)
+- Sunucu veritabanları: SQLALCHEMY_POOL_OPTIONS (havuz boyutu, pre-ping,
+  recycle) SQLALCHEMY_ENGINE_OPTIONS ile birleştirilir
+"""
+from functools import partial
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from models import db
+
+
+def is_sqlite(uri):
+    """Bağlantı adresi SQLite mı"""
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+
+def _apply_pragmas(pragmas, dbapi_connection, connection_record):
+    """Yeni SQLite bağlantısında PRAGMA'ları çalıştır"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def init_database(app):
+    """Engine seçeneklerini hazırla, db'yi başlat ve SQLite PRAGMA'larını bağla"""
+    sqlite = is_sqlite(app.config['SQLALCHEMY_DATABASE_URI'])
+
+    pool_options = app.config.get('SQLALCHEMY_POOL_OPTIONS') or {}
+    if pool_options and not sqlite:
+        options = dict(pool_options)
+        options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    db.init_app(app)
+
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if sqlite and pragmas:
+        with app.app_context():
+            event.listen(db.engine, 'connect', partial(_apply_pragmas, pragmas))
+
+
+def sqlite_pragma(name):
+    """Aktif bağlantıdaki PRAGMA değerini oku (uygulama bağlamında)"""
+    return db.session.connection().exec_driver_sql(f'PRAGMA {name}').scalar()
@@ -0,0 +1,156 @@
+"""
+Kullanıcı verisinin akış (streaming) olarak dışa aktarılması
+
+Görevler ve oturumlar CSV veya NDJSON olarak, sunucu tarafı imleçten
+(yield_per) parça parça okunup generator yanıtıyla gönderilir; tüm geçmiş
+hiçbir zaman bellekte tutulmaz. gzip=true ile çıktı anında sıkıştırılır.
+Oturum dışa aktarımı arşive taşınmış eski oturumları da (önce, çerçeve
+çerçeve) içerir.
+
+    GET /api/export/tasks?format=csv|ndjson&gzip=true
+    GET /api/export/sessions?format=csv|ndjson&gzip=true
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_login import login_required, current_user
+from sqlalchemy import select
+from models import db, Task, PomodoroSession
+from archive import iter_archived_sessions
+
+# Blueprint oluştur
+export_bp = Blueprint('export', __name__)
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+# Sunucu tarafı imleçten tek seferde okunan satır sayısı
+EXPORT_YIELD_PER = 1000
+
+# Ağa yazılmadan önce biriktirilen en az çıktı (bayt)
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+TASK_COLUMNS = ['id', 'text', 'completed', 'created_at', 'updated_at']
+SESSION_COLUMNS = [
+    'id', 'task_id', 'session_type', 'duration_minutes',
+    'started_at', 'ended_at', 'created_at', 'updated_at', 'idempotency_key', 'archived'
+]
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_task_rows(user_id):
+    """Kullanıcının görevleri, id sırasıyla (sözlük olarak)"""
+    stmt = select(
+        Task.id, Task.text, Task.completed, Task.created_at, Task.updated_at
+    ).where(Task.user_id == user_id).order_by(Task.id)
+
+    for row in db.session.execute(stmt.execution_options(yield_per=EXPORT_YIELD_PER)):
+        yield {
+            'id': row.id,
+            'text': row.text,
+            'completed': row.completed,
+            'created_at': _iso(row.created_at),
+            'updated_at': _iso(row.updated_at)
+        }
+
+
+def iter_session_rows(user_id):
+    """Önce arşivdeki, sonra veritabanındaki oturumlar (sözlük olarak)"""
+    for session in iter_archived_sessions(user_id):
+        yield {column: session.get(column) for column in SESSION_COLUMNS[:-1]} | {'archived': True}
+
+    stmt = select(
+        PomodoroSession.id, PomodoroSession.task_id, PomodoroSession.session_type,
+        PomodoroSession.duration_minutes, PomodoroSession.started_at, PomodoroSession.ended_at,
+        PomodoroSession.created_at, PomodoroSession.updated_at, PomodoroSession.idempotency_key
+    ).where(PomodoroSession.user_id == user_id).order_by(PomodoroSession.id)
+
+    for row in db.session.execute(stmt.execution_options(yield_per=EXPORT_YIELD_PER)):
+        yield {
+            'id': row.id,
+            'task_id': row.task_id,
+            'session_type': row.session_type,
+            'duration_minutes': row.duration_minutes,
+            'started_at': _iso(row.started_at),
+            'ended_at': _iso(row.ended_at),
+            'created_at': _iso(row.created_at),
+            'updated_at': _iso(row.updated_at),
+            'idempotency_key': row.idempotency_key,
+            'archived': False
+        }
+
+
+def encode_rows(rows, columns, fmt):
+    """Satırları CSV veya NDJSON metin parçalarına çevir (parça başına birçok satır)"""
+    buffer = io.StringIO()
+    writer = None
+    if fmt == 'csv':
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(columns)
+
+    for row in rows:
+        if writer is not None:
+            writer.writerow([row[column] for column in columns])
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+            buffer.write('\n')
+
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_chunks(chunks):
+    """Metin parçalarını anında gzip akışına çevir"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip başlığı
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _export_response(name, rows, columns):
+    """format/gzip parametrelerine göre akış yanıtı oluştur"""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({
+            'success': False,
+            'message': 'Geçersiz format (csv, ndjson)'
+        }), 400
+
+    chunks = encode_rows(rows, columns, fmt)
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    filename = f'pomodoro-{name}.{fmt}'
+    if request.args.get('gzip', 'false').lower() == 'true':
+        chunks = gzip_chunks(chunks)
+        mimetype = 'application/gzip'
+        filename += '.gz'
+
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@export_bp.route('/api/export/tasks', methods=['GET'])
+@login_required
+def export_tasks():
+    """Kullanıcının tüm görevlerini dışa aktar"""
+    return _export_response('tasks', iter_task_rows(current_user.id), TASK_COLUMNS)
+
+
+@export_bp.route('/api/export/sessions', methods=['GET'])
+@login_required
+def export_sessions():
+    """Kullanıcının tüm oturumlarını (arşivdekiler dahil) dışa aktar"""
+    return _export_response('sessions', iter_session_rows(current_user.id), SESSION_COLUMNS)
@@ -0,0 +1,82 @@
+"""
+Şifre hash işlemleri için sınırlı iş parçacığı havuzu
+
+bcrypt her çağrıda 100+ ms CPU harcar. Giriş/kayıt isteklerindeki hash
+işlemleri burada sabit sayıda işçiye (PASSWORD_HASH_WORKERS) sahip ayrı bir
+havuzda çalıştırılır; bcrypt hesaplama sırasında GIL'i bıraktığı için diğer
+endpoint'ler çalışmaya devam eder. Çalışan + bekleyen iş sayısı sınırı
+(PASSWORD_HASH_QUEUE_MAX) aşılırsa HashingBusy fırlatılır ve endpoint
+503 + Retry-After döndürür.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+
+class HashingBusy(Exception):
+    """Hash havuzu dolu; istemci retry_after saniye sonra tekrar denemeli"""
+
+    def __init__(self, retry_after):
+        super().__init__('Şifre işlemleri için kapasite dolu')
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """Flask-Bcrypt çağrılarını sınırlı havuzda çalıştırır"""
+
+    def __init__(self):
+        self.bcrypt = None
+        self.log_rounds = 12
+        self.timeout = 10.0
+        self.retry_after = 1
+        self._executor = None
+        self._slots = None
+
+    def init_app(self, app, bcrypt):
+        self.bcrypt = bcrypt
+        self.log_rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10.0)
+        self.retry_after = app.config.get('PASSWORD_HASH_RETRY_AFTER', 1)
+
+        workers = app.config.get('PASSWORD_HASH_WORKERS') or min(4, os.cpu_count() or 1)
+        queue_max = app.config.get('PASSWORD_HASH_QUEUE_MAX', 16)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        # Çalışan + kuyrukta bekleyen iş sınırı
+        self._slots = threading.BoundedSemaphore(workers + queue_max)
+
+    def _run(self, func, *args):
+        """İşi havuzda çalıştır; kapasite doluysa veya zaman aşımında HashingBusy"""
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy(self.retry_after)
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # İş havuzda tamamlanacak ve kapasiteyi kendisi bırakacak
+            raise HashingBusy(self.retry_after)
+
+    def generate(self, password):
+        """Yapılandırılmış maliyetle yeni hash üret"""
+        return self._run(self.bcrypt.generate_password_hash, password, self.log_rounds).decode('utf-8')
+
+    def check(self, password_hash, password):
+        """Şifreyi hash ile doğrula"""
+        return self._run(self.bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Hash farklı bir maliyetle üretilmişse True ($2b$<maliyet>$...)"""
+        try:
+            return int(password_hash.split('$')[2]) != self.log_rounds
+        except (IndexError, ValueError):
+            return False
+
+
+password_hasher = PasswordHasher()
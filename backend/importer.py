@@ -0,0 +1,630 @@
+"""
+Görev ve oturumların toplu içe aktarılması (API ve CLI)
+
+Kaynak CSV, NDJSON veya JSON dizisi olabilir (isteğe bağlı gzip). Gövde
+parça parça okunup ayrıştırılır; satırlar IMPORT_BATCH_SIZE'lık partiler
+halinde doğrulanır ve executemany ile eklenir. Her parti ayrı bir
+transaction'dır ve işin (ImportJob) ilerleme sayaçları aynı transaction'da
+güncellenir. Kesilen bir iş aynı dosya ve import_id ile tekrar gönderilirse
+commit edilmiş satırlar atlanarak kaldığı yerden devam eder.
+
+- Görevler: kaynak id'si varsa ImportedRecord'a yazılır; aynı dosya tekrar
+  aktarıldığında görev ikinci kez eklenmez.
+- Oturumlar: idempotency_key (yoksa satır içeriğinden türetilen anahtar)
+  ile ON CONFLICT DO NOTHING eklenir; task_id önce içe aktarılmış görev
+  eşlemesinden, sonra kullanıcının kendi görevlerinden çözülür.
+- Eski istemcinin localStorage görevleri (pomodoroTasks)
+  /api/import/local-storage ile taşınır. todayPomodoros oturum olarak
+  aktarılmaz (bkz. legacy_local_storage_records).
+
+Satır hataları (satır numarası ve mesaj) IMPORT_ERROR_LIMIT adede kadar
+raporlanır; dosyanın tamamını okunamaz yapan hatalar işi durdurur.
+"""
+import csv
+import gzip
+import hashlib
+import io
+import json
+import re
+import uuid
+import zlib
+from datetime import datetime
+import click
+from flask import Blueprint, current_app, request, jsonify
+from flask.cli import with_appcontext
+from flask_login import login_required, current_user
+from sqlalchemy import insert
+from models import db, User, Task, PomodoroSession, ImportJob, ImportedRecord, SESSION_TYPES
+from rollups import apply_sessions
+from stats_cache import statistics_cache
+from sessions import parse_datetime, parse_duration, parse_session_times, insert_sessions_ignoring_duplicates
+from sync import next_change_seq
+
+# Blueprint oluştur
+importer_bp = Blueprint('importer', __name__)
+
+IMPORT_KINDS = ('tasks', 'sessions')
+IMPORT_FORMATS = ('csv', 'ndjson', 'json')
+
+# Raporlanan en fazla satır hatası
+IMPORT_ERROR_LIMIT = 100
+
+# Kaynaktan tek seferde okunan karakter sayısı (JSON)
+IMPORT_READ_CHUNK = 64 * 1024
+
+_LEADING_SPACE = re.compile(r'\s*')
+_SEPARATOR = re.compile(r'\s*,?\s*')
+
+
+class ImportFormatError(ValueError):
+    """Kaynağın geri kalanını okunamaz yapan hata (iş durdurulur)"""
+
+
+# ==================== AYRIŞTIRMA ====================
+
+def open_text(stream, compressed=False):
+    """İkili akışı (gerekirse gzip açarak) UTF-8 metin akışına çevir"""
+    if compressed:
+        stream = gzip.GzipFile(fileobj=stream, mode='rb')
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+
+def _iter_json_array(reader):
+    """Üst düzey JSON dizisinin elemanlarını tüm metni belleğe almadan üret"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    started = False
+
+    while True:
+        # Tampondaki tüketilmiş kısmı at, gerekirse yeni parça oku
+        if position > IMPORT_READ_CHUNK:
+            buffer = buffer[position:]
+            position = 0
+        if not eof and len(buffer) - position < IMPORT_READ_CHUNK:
+            chunk = reader.read(IMPORT_READ_CHUNK)
+            eof = not chunk
+            buffer += chunk
+
+        if not started:
+            position = _LEADING_SPACE.match(buffer, position).end()
+            if position == len(buffer):
+                if eof:
+                    raise ImportFormatError('Boş JSON')
+                continue
+            if buffer[position] != '[':
+                raise ImportFormatError('JSON dizisi bekleniyor')
+            position += 1
+            started = True
+
+        position = _SEPARATOR.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                raise ImportFormatError('JSON dizisi tamamlanmamış')
+            continue
+        if buffer[position] == ']':
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise ImportFormatError('Geçersiz JSON')
+            chunk = reader.read(IMPORT_READ_CHUNK)
+            eof = not chunk
+            buffer += chunk
+            continue
+
+        # Değerden sonra ',' veya ']' gelmeli; gelmiyorsa değer (ör. "1." ile
+        # biten sayı) parçanın sonunda kesilmiş olabilir
+        following = _LEADING_SPACE.match(buffer, end).end()
+        if following == len(buffer) or buffer[following] not in ',]':
+            if eof:
+                raise ImportFormatError('Geçersiz JSON')
+            chunk = reader.read(IMPORT_READ_CHUNK)
+            eof = not chunk
+            buffer += chunk
+            continue
+
+        position = end
+        yield value
+
+
+def iter_records(reader, fmt):
+    """Kaynak satırlarını (kayıt, hata mesajı) çiftleri olarak üret
+
+    Okunamayan tek bir satır (ör. bozuk NDJSON satırı) kayıt yerine hata
+    mesajıyla döner; satır numaraları bu sayede korunur.
+    """
+    if fmt == 'csv':
+        for row in csv.DictReader(reader):
+            yield {key: (value if value != '' else None) for key, value in row.items()}, None
+    elif fmt == 'ndjson':
+        for line in reader:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line), None
+            except ValueError:
+                yield None, 'Geçersiz JSON satırı'
+    else:
+        for value in _iter_json_array(reader):
+            yield value, None
+
+
+# ==================== DOĞRULAMA ====================
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    text = str(value).strip().lower()
+    if text in ('true', '1', 'yes', 'evet'):
+        return True
+    if text in ('false', '0', 'no', 'hayir', 'hayır'):
+        return False
+    raise ValueError('Geçersiz completed değeri')
+
+
+def _parse_optional_datetime(value):
+    if value is None:
+        return None
+    return parse_datetime(str(value))
+
+
+def _source_id(record):
+    value = record.get('id')
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value or len(value) > 64:
+        raise ValueError('Geçersiz kaynak id')
+    return value
+
+
+def validate_task(record, now):
+    """Görev kaydını tasks satırına çevir (geçersizse ValueError)"""
+    text = record.get('text')
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError('Görev metni gerekli')
+    text = text.strip()
+    if len(text) > 500:
+        raise ValueError('Görev metni 500 karakterden uzun olamaz')
+
+    # Eski istemci alan adları: createdAt, completedAt
+    created_at = _parse_optional_datetime(record.get('created_at') or record.get('createdAt')) or now
+    updated_at = _parse_optional_datetime(
+        record.get('updated_at') or record.get('completedAt') or record.get('completed_at')
+    ) or created_at
+    return {
+        'text': text,
+        'completed': _parse_bool(record.get('completed')),
+        'created_at': created_at,
+        'updated_at': max(updated_at, created_at)
+    }
+
+
+def _derived_key(session_type, started_at, ended_at, duration_minutes):
+    """Anahtarsız oturum için içerikten türetilen idempotency anahtarı"""
+    raw = f'{session_type}|{started_at.isoformat()}|{ended_at.isoformat()}|{duration_minutes}'
+    return 'import-' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def validate_session(record, task_ids, now):
+    """Oturum kaydını pomodoro_sessions satırına çevir (geçersizse ValueError)
+
+    task_ids: kaynak task_id -> kullanıcının görev id'si. task_id'si boş
+    çalışma oturumları (eski istemci verisi) görevsiz olarak eklenir.
+    """
+    session_type = record.get('session_type')
+    if session_type not in SESSION_TYPES:
+        raise ValueError('Geçersiz oturum tipi')
+
+    if record.get('started_at') is None or record.get('ended_at') is None:
+        raise ValueError('Bitmemiş oturum içe aktarılamaz')
+    started_at, ended_at = parse_session_times(str(record['started_at']), str(record['ended_at']), now)
+
+    duration_minutes = record.get('duration_minutes')
+    if duration_minutes is None:
+        duration_minutes = (ended_at - started_at).total_seconds() / 60
+    duration_minutes = parse_duration(duration_minutes)
+
+    task_id = None
+    source = record.get('task_id')
+    if source is not None:
+        task_id = task_ids.get(str(source))
+        if task_id is None and session_type == 'work':
+            raise ValueError('Görev bulunamadı')
+
+    key = record.get('idempotency_key')
+    if key is not None:
+        key = str(key).strip()
+        if not key or len(key) > 64:
+            raise ValueError('Geçersiz idempotency anahtarı')
+    else:
+        key = _derived_key(session_type, started_at, ended_at, duration_minutes)
+
+    return {
+        'user_id': None,  # Parti eklenirken doldurulur
+        'task_id': task_id,
+        'session_type': session_type,
+        'duration_minutes': duration_minutes,
+        'started_at': started_at,
+        'ended_at': ended_at,
+        'created_at': _parse_optional_datetime(record.get('created_at')) or now,
+        'updated_at': now,
+        'idempotency_key': key
+    }
+
+
+def _resolve_task_ids(user_id, records):
+    """Partideki kaynak task_id'lerini kullanıcının görev id'lerine çevir (iki sorgu)"""
+    sources = {
+        str(record['task_id']) for record in records
+        if isinstance(record, dict) and record.get('task_id') is not None
+    }
+    if not sources:
+        return {}
+
+    resolved = dict(db.session.query(ImportedRecord.source_id, ImportedRecord.target_id).filter(
+        ImportedRecord.user_id == user_id,
+        ImportedRecord.entity_type == 'task',
+        ImportedRecord.source_id.in_(sources)
+    ).all())
+
+    # Eşlemesi olmayanlar kullanıcının kendi görev id'si olabilir
+    numeric = {int(source) for source in sources - set(resolved) if source.isdigit()}
+    if numeric:
+        for (task_id,) in db.session.query(Task.id).filter(Task.user_id == user_id, Task.id.in_(numeric)).all():
+            resolved[str(task_id)] = task_id
+    return resolved
+
+
+# ==================== PARTİLER ====================
+
+def _insert_tasks(user_id, rows):
+    """Görev partisini ekle; (eklenen, tekrar) sayılarını döndür
+
+    rows: (kaynak id veya None, tasks satırı)
+    """
+    sources = [source for source, _ in rows if source is not None]
+    existing = set()
+    if sources:
+        existing = {
+            source for (source,) in db.session.query(ImportedRecord.source_id).filter(
+                ImportedRecord.user_id == user_id,
+                ImportedRecord.entity_type == 'task',
+                ImportedRecord.source_id.in_(sources)
+            ).all()
+        }
+
+    new_rows = []
+    seen = set()
+    for source, row in rows:
+        if source is not None:
+            if source in existing or source in seen:
+                continue
+            seen.add(source)
+        new_rows.append((source, dict(row, user_id=user_id, change_seq=next_change_seq(user_id))))
+    if not new_rows:
+        return 0, len(rows)
+
+    # RETURNING parametre sırasıyla: yeni id'ler kaynak id'lerle eşlenir
+    ids = db.session.execute(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True),
+        [row for _, row in new_rows]
+    ).scalars().all()
+
+    mappings = [
+        {'user_id': user_id, 'entity_type': 'task', 'source_id': source, 'target_id': task_id}
+        for (source, _), task_id in zip(new_rows, ids) if source is not None
+    ]
+    if mappings:
+        db.session.execute(ImportedRecord.__table__.insert(), mappings)
+    return len(new_rows), len(rows) - len(new_rows)
+
+
+def _insert_sessions(user_id, rows):
+    """Oturum partisini ekle ve günlük özete yansıt; (eklenen, tekrar) döndür"""
+    rows = [dict(row, user_id=user_id) for row in rows]
+    inserted_keys = {key for _, key in insert_sessions_ignoring_duplicates(rows)}
+
+    # Sadece gerçekten eklenen oturumlar özete eklenir (aynı partide tekrar edenler bir kez)
+    new_sessions = {}
+    for row in rows:
+        if row['idempotency_key'] in inserted_keys:
+            new_sessions.setdefault(row['idempotency_key'], PomodoroSession(**row))
+    apply_sessions(user_id, list(new_sessions.values()))
+    return len(new_sessions), len(rows) - len(new_sessions)
+
+
+def _record_errors(job, errors):
+    if not errors:
+        return
+    current = json.loads(job.errors) if job.errors else []
+    room = IMPORT_ERROR_LIMIT - len(current)
+    if room > 0:
+        job.errors = json.dumps(current + errors[:room], ensure_ascii=False)
+
+
+def _flush_batch(job, batch, now):
+    """Partiyi doğrula, ekle ve iş sayaçlarıyla birlikte commit et"""
+    user_id = job.user_id
+    errors = []
+    valid = []
+
+    task_ids = _resolve_task_ids(user_id, [record for _, record, _ in batch]) if job.kind == 'sessions' else {}
+    for row_number, record, error in batch:
+        try:
+            if error is not None:
+                raise ValueError(error)
+            if not isinstance(record, dict):
+                raise ValueError('Geçersiz kayıt')
+            if job.kind == 'tasks':
+                valid.append((_source_id(record), validate_task(record, now)))
+            else:
+                valid.append(validate_session(record, task_ids, now))
+        except (KeyError, TypeError, ValueError) as e:
+            message = str(e) if isinstance(e, ValueError) and str(e) else 'Eksik veya geçersiz alan'
+            errors.append({'row': row_number, 'message': message})
+
+    try:
+        if valid:
+            if job.kind == 'tasks':
+                imported, duplicates = _insert_tasks(user_id, valid)
+            else:
+                imported, duplicates = _insert_sessions(user_id, valid)
+            job.rows_imported += imported
+            job.rows_duplicate += duplicates
+        job.rows_failed += len(errors)
+        job.rows_processed = batch[-1][0]
+        _record_errors(job, errors)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def run_import(job, records, batch_size=500):
+    """Kayıtları partiler halinde içe aktar; commit edilmiş satırları atla
+
+    records: (kayıt, hata mesajı) çiftleri. İş nesnesini döndürür.
+    """
+    now = datetime.utcnow()
+    skip = job.rows_processed
+    batch = []
+
+    try:
+        for row_number, (record, error) in enumerate(records, start=1):
+            if row_number <= skip:
+                continue
+            batch.append((row_number, record, error))
+            if len(batch) >= batch_size:
+                _flush_batch(job, batch, now)
+                batch = []
+        if batch:
+            _flush_batch(job, batch, now)
+    except (ImportFormatError, UnicodeDecodeError, csv.Error, OSError, EOFError, zlib.error) as e:
+        # Okunabilen kısım commit edilir; iş aynı import_id ile sürdürülebilir
+        if batch:
+            _flush_batch(job, batch, now)
+        job.status = 'failed'
+        job.message = str(e)[:500] or 'Kaynak okunamadı'
+        db.session.commit()
+        statistics_cache.invalidate_user(job.user_id)
+        return job
+
+    job.status = 'completed'
+    job.message = None
+    db.session.commit()
+    statistics_cache.invalidate_user(job.user_id)
+    return job
+
+
+def get_or_create_job(user_id, kind, fmt, import_id=None):
+    """Yeni iş oluştur veya devam ettirilecek işi getir
+
+    Başka kullanıcıya ait, türü farklı veya tamamlanmış işler için ValueError.
+    """
+    if import_id:
+        job = db.session.get(ImportJob, import_id)
+        if job is None or job.user_id != user_id:
+            raise LookupError('İçe aktarma işi bulunamadı')
+        if job.kind != kind or job.format != fmt:
+            raise ValueError('İş türü veya formatı farklı')
+        if job.status == 'completed':
+            raise ValueError('İçe aktarma zaten tamamlandı')
+        job.status = 'running'
+        return job
+
+    job = ImportJob(id=uuid.uuid4().hex, user_id=user_id, kind=kind, format=fmt, status='running')
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def legacy_local_storage_records(payload):
+    """localStorage verisini (görev kayıtları, aktarılmayan pomodoro sayısı) olarak ayır
+
+    pomodoroTasks: [{id, text, completed, createdAt, completedAt}]
+    todayPomodoros: eski istemci bu sayacı hiç sıfırlamadığı için günlük değil
+    toplam sayıdır ve pomodoroların gün/saat bilgisini taşımaz. Bundan oturum
+    üretmek sahte geçmiş (ve gelecek tarihli oturumlar) oluşturacağı için
+    sayı sadece doğrulanıp aktarılmadığı bildirilir.
+    """
+    tasks = payload.get('pomodoroTasks') or []
+    if not isinstance(tasks, list):
+        raise ValueError('pomodoroTasks bir liste olmalı')
+    task_records = []
+    for task in tasks:
+        if isinstance(task, dict) and task.get('id') is not None:
+            # Eski istemci id'leri (Date.now()) dışa aktarılmış id'lerle karışmasın
+            task = dict(task, id=f"local:{task['id']}")
+        task_records.append(task)
+
+    count = payload.get('todayPomodoros') or 0
+    if isinstance(count, str) and count.strip().isdigit():
+        count = int(count)
+    if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+        raise ValueError('todayPomodoros geçersiz')
+    return task_records, count
+
+
+# ==================== API ====================
+
+@importer_bp.route('/api/import/<kind>', methods=['POST'])
+@login_required
+def import_records(kind):
+    """Gövdedeki CSV / NDJSON / JSON görev veya oturumlarını içe aktar
+
+    Parametreler: format (csv, ndjson, json), gzip (true/false),
+    import_id (yarım kalan işi sürdürmek için)
+    """
+    if kind not in IMPORT_KINDS:
+        return jsonify({
+            'success': False,
+            'message': 'Geçersiz içe aktarma türü (tasks, sessions)'
+        }), 404
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({
+            'success': False,
+            'message': 'Geçersiz format (csv, ndjson, json)'
+        }), 400
+
+    user_id = current_user.id
+    try:
+        job = get_or_create_job(user_id, kind, fmt, request.args.get('import_id'))
+    except LookupError as e:
+        return jsonify({'success': False, 'message': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 409
+
+    try:
+        compressed = request.args.get('gzip', 'false').lower() == 'true'
+        reader = open_text(request.stream, compressed)
+        job = run_import(job, iter_records(reader, fmt), current_app.config.get('IMPORT_BATCH_SIZE', 500))
+        status_code = 200 if job.status == 'completed' else 400
+        return jsonify(dict(job.to_dict(), success=job.status == 'completed')), status_code
+
+    except Exception as e:
+        db.session.rollback()
+        job.status = 'failed'
+        job.message = 'Beklenmeyen hata'
+        db.session.commit()
+        return jsonify({
+            'success': False,
+            'import_id': job.id,
+            'message': 'İçe aktarma sırasında hata oluştu; aynı import_id ile tekrar deneyin'
+        }), 500
+
+
+@importer_bp.route('/api/import/local-storage', methods=['POST'])
+@login_required
+def import_local_storage():
+    """Eski istemcinin localStorage görevlerini (pomodoroTasks) taşı
+
+    Tekrar gönderilmesi güvenlidir: görevler kaynak id'leriyle bir kez eklenir.
+    todayPomodoros oturum olarak aktarılmaz; yanıttaki
+    legacy_pomodoros_skipped alanında bildirilir.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'message': 'localStorage verisi gerekli'
+            }), 400
+
+        try:
+            task_records, skipped_pomodoros = legacy_local_storage_records(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'message': str(e) or 'Geçersiz veri'}), 400
+
+        user_id = current_user.id
+        job = get_or_create_job(user_id, 'tasks', 'json')
+        job = run_import(job, ((record, None) for record in task_records), current_app.config.get('IMPORT_BATCH_SIZE', 500))
+
+        result = dict(job.to_dict(), success=True, legacy_pomodoros_skipped=skipped_pomodoros)
+        if skipped_pomodoros:
+            result['warning'] = (
+                'todayPomodoros tarih ve saat bilgisi taşımayan toplam bir sayaç olduğu için '
+                'oturum olarak aktarılmadı'
+            )
+        return jsonify(result)
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'localStorage verisi aktarılırken hata oluştu'
+        }), 500
+
+
+@importer_bp.route('/api/import/<import_id>/status', methods=['GET'])
+@login_required
+def import_status(import_id):
+    """İçe aktarma işinin ilerlemesi ve satır hataları"""
+    job = db.session.get(ImportJob, import_id)
+    if job is None or job.user_id != current_user.id:
+        return jsonify({
+            'success': False,
+            'message': 'İçe aktarma işi bulunamadı'
+        }), 404
+    return jsonify(dict(job.to_dict(), success=True))
+
+
+# ==================== CLI ====================
+
+def init_importer(app):
+    """İçe aktarma komutunu Flask CLI'a kaydet"""
+    app.cli.add_command(import_data_command)
+
+
+def _format_from_path(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    for fmt in IMPORT_FORMATS:
+        if name.endswith('.' + fmt):
+            return fmt
+    return None
+
+
+@click.command('import-data')
+@with_appcontext
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--email', required=True, help='Verilerin aktarılacağı kullanıcı')
+@click.option('--kind', type=click.Choice(IMPORT_KINDS), required=True)
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), default=None, help='Varsayılan: dosya uzantısı')
+@click.option('--import-id', default=None, help='Yarım kalan işi sürdür')
+@click.option('--batch-size', type=int, default=None, help='Transaction başına satır')
+def import_data_command(path, email, kind, fmt, import_id, batch_size):
+    """CSV / NDJSON / JSON dosyasından görev veya oturum içe aktar (.gz desteklenir)"""
+    user = User.query.filter_by(email=email).first()
+    if user is None:
+        raise click.ClickException(f'Kullanıcı bulunamadı: {email}')
+
+    fmt = fmt or _format_from_path(path)
+    if fmt is None:
+        raise click.ClickException('Format belirlenemedi; --format verin')
+
+    try:
+        job = get_or_create_job(user.id, kind, fmt, import_id)
+    except (LookupError, ValueError) as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"İş: {job.id} (kaldığı satır: {job.rows_processed})")
+    with open(path, 'rb') as f:
+        reader = open_text(f, compressed=path.endswith('.gz'))
+        job = run_import(job, iter_records(reader, fmt), batch_size or current_app.config.get('IMPORT_BATCH_SIZE', 500))
+
+    click.echo(
+        f"{job.status}: {job.rows_processed} satır, {job.rows_imported} eklendi, "
+        f"{job.rows_duplicate} tekrar, {job.rows_failed} hatalı"
+    )
+    for error in json.loads(job.errors or '[]'):
+        click.echo(f"  satır {error['row']}: {error['message']}")
+    if job.message:
+        click.echo(f"Durdu: {job.message} (devam: --import-id {job.id})")
@@ -0,0 +1,240 @@
+"""
+İstek başına gecikme, durum kodu, SQL ve gövde boyutu ölçümleri
+
+create_app içinde init_metrics(app) ile kaydedilir. Ölçümler süreç içinde
+tutulur ve /metrics adresinde Prometheus metin formatında yayınlanır.
+Varsayılan olarak kapalıdır; açmak için METRICS_ENABLED=true ve scrape
+isteklerinde Bearer olarak gönderilecek METRICS_TOKEN ayarlanmalıdır.
+Her istek için sadece birkaç sayaç artırılır; SQL ölçümü SQLAlchemy engine
+olaylarıyla yapılır.
+"""
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from flask import request, current_app
+from sqlalchemy import event
+from models import db
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+
+class Histogram:
+    """Etiket başına kümülatif Prometheus histogramı"""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}  # labels -> [bucket sayaçları..., toplam, adet]
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        # İlk "value <= sınır" aralığına yazılır; render sırasında kümülatif toplanır
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self, label_names):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self._series.items()):
+            base = _format_labels(label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{base}}} {series[-2]}')
+            lines.append(f'{self.name}_count{{{base}}} {series[-1]}')
+        return lines
+
+
+class Counter:
+    """Etiket başına Prometheus sayacı"""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._series = {}
+
+    def inc(self, labels, value=1):
+        self._series[labels] = self._series.get(labels, 0) + value
+
+    def render(self, label_names):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self._series.items()):
+            lines.append(f'{self.name}{{{_format_labels(label_names, labels)}}} {value}')
+        return lines
+
+
+def _format_labels(names, values):
+    """Etiketleri Prometheus formatına çevir"""
+    return ','.join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+
+
+class MetricsRegistry:
+    """Tüm istek ölçümlerini tutan, thread-safe kayıt"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'İstek işlem süresi (saniye)', LATENCY_BUCKETS)
+        self.requests = Counter(
+            'http_requests_total', 'Endpoint, metot ve durum koduna göre istek sayısı')
+        self.sql_statements = Histogram(
+            'http_request_sql_statements', 'İstek başına çalıştırılan SQL ifadesi sayısı', SQL_COUNT_BUCKETS)
+        self.sql_time = Counter(
+            'http_request_sql_seconds_total', 'İsteklerde SQL için harcanan toplam süre (saniye)')
+        self.request_size = Histogram(
+            'http_request_size_bytes', 'İstek gövdesi boyutu (bayt)', SIZE_BUCKETS)
+        self.response_size = Histogram(
+            'http_response_size_bytes', 'Yanıt gövdesi boyutu (bayt)', SIZE_BUCKETS)
+
+    def record(self, endpoint, method, status, duration, sql_count, sql_seconds, request_bytes, response_bytes):
+        with self._lock:
+            self.latency.observe((endpoint, method), duration)
+            self.requests.inc((endpoint, method, status))
+            self.sql_statements.observe((endpoint,), sql_count)
+            self.sql_time.inc((endpoint,), sql_seconds)
+            self.request_size.observe((endpoint,), request_bytes)
+            self.response_size.observe((endpoint,), response_bytes)
+
+    def render(self, extra_lines=()):
+        with self._lock:
+            lines = []
+            lines += self.latency.render(('endpoint', 'method'))
+            lines += self.requests.render(('endpoint', 'method', 'status'))
+            lines += self.sql_statements.render(('endpoint',))
+            lines += self.sql_time.render(('endpoint',))
+            lines += self.request_size.render(('endpoint',))
+            lines += self.response_size.render(('endpoint',))
+        lines += list(extra_lines)
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+# İstek sürerken SQL sayaçları (thread başına)
+_state = threading.local()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_state, 'active', False):
+        _state.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_state, 'active', False):
+        _state.sql_count += 1
+        _state.sql_seconds += time.perf_counter() - _state.query_started
+
+
+def _before_request():
+    _state.active = True
+    _state.sql_count = 0
+    _state.sql_seconds = 0.0
+    _state.status = None
+    _state.response_bytes = 0
+    _state.started = time.perf_counter()
+
+
+def _after_request(response):
+    """Yanıt bilgilerini sakla; ölçüm teardown'da kaydedilir"""
+    if not getattr(_state, 'active', False):
+        return response
+
+    # Akış (streaming) yanıtlarında boyut bilinmiyorsa 0 sayılır; gövdeyi
+    # okumak (calculate_content_length) tüm akışı belleğe alırdı
+    if response.is_streamed:
+        _state.response_bytes = response.content_length or 0
+    else:
+        _state.response_bytes = response.calculate_content_length() or 0
+    _state.status = response.status_code
+    return response
+
+
+def _teardown_request(exc):
+    """İsteği kaydet; yakalanmayan hatayla biten istekler 500 sayılır
+
+    after_request, view'dan yükselen hata yayıldığında (PROPAGATE_EXCEPTIONS)
+    veya yanıt işlenirken hata olduğunda çağrılmaz; teardown her durumda çalışır.
+    """
+    if not getattr(_state, 'active', False):
+        return
+    _state.active = False
+
+    if request.endpoint == 'metrics':
+        return
+
+    status = _state.status
+    if exc is not None or status is None:
+        status = 500
+    registry.record(
+        endpoint=request.endpoint or 'unmatched',
+        method=request.method,
+        status=status,
+        duration=time.perf_counter() - _state.started,
+        sql_count=_state.sql_count,
+        sql_seconds=_state.sql_seconds,
+        request_bytes=request.content_length or 0,
+        response_bytes=_state.response_bytes
+    )
+
+
+def _cache_lines():
+    """İstatistik önbelleği sayaçlarını Prometheus satırlarına çevir"""
+    from stats_cache import statistics_cache
+    stats = statistics_cache.stats()
+    return [
+        '# TYPE statistics_cache_hits_total counter',
+        f"statistics_cache_hits_total {stats['hits']}",
+        '# TYPE statistics_cache_misses_total counter',
+        f"statistics_cache_misses_total {stats['misses']}",
+        '# TYPE statistics_cache_evictions_total counter',
+        f"statistics_cache_evictions_total {stats['evictions']}",
+        '# TYPE statistics_cache_entries gauge',
+        f"statistics_cache_entries {stats['size']}"
+    ]
+
+
+def metrics():
+    """Prometheus metin formatında ölçümler (Bearer METRICS_TOKEN gerekir)"""
+    expected = f"Bearer {current_app.config['METRICS_TOKEN']}"
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+        return current_app.response_class('Yetkisiz\n', status=401, mimetype='text/plain')
+    return current_app.response_class(
+        registry.render(_cache_lines()),
+        mimetype='text/plain; version=0.0.4'
+    )
+
+
+def init_metrics(app):
+    """İstek ölçüm middleware'ini, SQL olaylarını ve /metrics endpoint'ini kaydet
+
+    Varsayılan olarak kapalıdır; METRICS_ENABLED açıkken METRICS_TOKEN da
+    ayarlanmalıdır, aksi halde ölçümler yayınlanmaz.
+    """
+    if not app.config.get('METRICS_ENABLED'):
+        return
+    if not app.config.get('METRICS_TOKEN'):
+        app.logger.warning('METRICS_ENABLED açık ama METRICS_TOKEN ayarlı değil; /metrics devre dışı')
+        return
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics)
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
@@ -0,0 +1,109 @@
+"""
+Basit şema güncelleme yardımcısı
+
+db.create_all() sadece eksik tabloları oluşturur; mevcut tablolara sonradan
+eklenen kolon ve index'ler eklenmez. Bu modül mevcut veritabanını modellerle
+karşılaştırır, eksik (nullable veya varsayılan değerli) kolonları
+ALTER TABLE ile ve eksik index'leri CREATE INDEX ile ekler. Artık
+kullanılmayan index'ler (DROPPED_INDEXES) kaldırılır.
+"""
+from sqlalchemy import inspect, text
+from models import db
+
+
+# Yeni eklenen kolonlar için mevcut satırları dolduran ifadeler
+BACKFILLS = {
+    ('pomodoro_sessions', 'updated_at'):
+        'UPDATE pomodoro_sessions SET updated_at = COALESCE(ended_at, created_at) WHERE updated_at IS NULL'
+}
+
+
+# Modellerden çıkarılan, mevcut veritabanlarından kaldırılacak index'ler
+DROPPED_INDEXES = (
+    'ix_tasks_user_updated',
+    'ix_pomodoro_sessions_user_updated',
+    'ix_tombstones_user_deleted'
+)
+
+
+# Benzersiz index oluşturulmadan önce eski verideki tekrarları birleştiren ifadeler
+_DAILY_STATS_KEY = 'user_id, day, COALESCE(task_id, 0), session_type'
+_DAILY_STATS_FIELDS = ('session_count', 'minutes', 'full_count', 'half_count', 'full_minutes', 'half_minutes')
+BEFORE_INDEX = {
+    'uq_daily_stats_norm_key': [
+        'UPDATE daily_stats SET ' + ', '.join(
+            f'{field} = (SELECT SUM(d.{field}) FROM daily_stats d'
+            ' WHERE d.user_id = daily_stats.user_id AND d.day = daily_stats.day'
+            ' AND COALESCE(d.task_id, 0) = COALESCE(daily_stats.task_id, 0)'
+            ' AND d.session_type = daily_stats.session_type)'
+            for field in _DAILY_STATS_FIELDS
+        ) + f' WHERE id IN (SELECT MIN(id) FROM daily_stats GROUP BY {_DAILY_STATS_KEY} HAVING COUNT(*) > 1)',
+        f'DELETE FROM daily_stats WHERE id NOT IN (SELECT MIN(id) FROM daily_stats GROUP BY {_DAILY_STATS_KEY})'
+    ]
+}
+
+
+def _column_default_sql(column):
+    """ALTER TABLE için sabit varsayılan değer ifadesi"""
+    default = column.default
+    if default is None or not default.is_scalar:
+        return None
+    value = default.arg
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _index_names(conn, inspector, table_name):
+    """Tablodaki index adları (SQLite ifade index'leri reflection'da atlandığı için katalogdan)"""
+    if db.engine.dialect.name == 'sqlite':
+        return set(conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {'table': table_name}
+        ).scalars())
+    return {index['name'] for index in inspector.get_indexes(table_name)}
+
+
+def upgrade_schema():
+    """Eksik kolon ve index'leri ekle (uygulama bağlamı içinde çağrılmalı)"""
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    changes = []
+
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {col['name'] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                ddl = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                default_sql = _column_default_sql(column)
+                if default_sql is not None:
+                    ddl += f' DEFAULT {default_sql}'
+                if not column.nullable and default_sql is not None:
+                    ddl += ' NOT NULL'
+                conn.execute(text(ddl))
+                backfill = BACKFILLS.get((table.name, column.name))
+                if backfill:
+                    conn.execute(text(backfill))
+                changes.append(f'{table.name}.{column.name}')
+
+            existing_indexes = _index_names(conn, inspector, table.name)
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    for statement in BEFORE_INDEX.get(index.name, []):
+                        conn.execute(text(statement))
+                    index.create(conn)
+                    changes.append(index.name)
+            for name in DROPPED_INDEXES:
+                if name in existing_indexes:
+                    conn.execute(text(f'DROP INDEX {name}'))
+                    changes.append(f'{name} (kaldırıldı)')
+
+    return changes
@@ -1,9 +1,19 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime
+import json
 
 db = SQLAlchemy()
 
+# Tam pomodoro sayılması için gereken süre (dakika)
+FULL_POMODORO_MINUTES = 25.0
+
+# Tek bir oturum için kabul edilen en uzun süre (dakika)
+MAX_SESSION_MINUTES = 24 * 60.0
+
+# Geçerli oturum tipleri
+SESSION_TYPES = ('work', 'shortBreak', 'longBreak')
+
 class User(UserMixin, db.Model):
     """Kullanıcı modeli"""
     
@@ -44,10 +54,17 @@ class Task(db.Model):
     completed = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    change_seq = db.Column(db.BigInteger, default=0, nullable=False)  # Delta senkronizasyonu değişiklik numarası
     
     # İlişkiler
     pomodoro_sessions = db.relationship('PomodoroSession', backref='task', lazy=True)
     
+    # Delta senkronizasyonu son değişen görevleri, görev listesi ise duruma göre en yeni görevleri okur
+    __table_args__ = (
+        db.Index('ix_tasks_user_change', 'user_id', 'change_seq'),
+        db.Index('ix_tasks_user_completed_created', 'user_id', 'completed', 'created_at'),
+    )
+    
     def __repr__(self):
         return f'<Task {self.id}: {self.text[:50]}>'
     
@@ -76,6 +93,22 @@ class PomodoroSession(db.Model):
     started_at = db.Column(db.DateTime, nullable=False)
     ended_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    idempotency_key = db.Column(db.String(64), nullable=True)  # Çevrimdışı senkronizasyonda istemcinin ürettiği anahtar
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
+    change_seq = db.Column(db.BigInteger, default=0, nullable=False)  # Delta senkronizasyonu değişiklik numarası
+    
+    # İstatistik sorguları kullanıcı + bitiş zamanı aralığına göre filtreler
+    __table_args__ = (
+        db.Index('ix_pomodoro_sessions_user_ended', 'user_id', 'ended_at'),
+        db.Index('uq_pomodoro_sessions_user_key', 'user_id', 'idempotency_key', unique=True),
+        db.Index('ix_pomodoro_sessions_user_change', 'user_id', 'change_seq'),
+        # Sadece açık oturumlar: aktif oturum sorgusu ve terk edilmiş oturum temizliği
+        db.Index(
+            'ix_pomodoro_sessions_open', 'user_id', 'started_at',
+            sqlite_where=db.text('ended_at IS NULL'),
+            postgresql_where=db.text('ended_at IS NULL')
+        ),
+    )
     
     def __repr__(self):
         return f'<PomodoroSession {self.id}: {self.session_type} - {self.duration_minutes}dk>'
@@ -90,5 +123,195 @@ class PomodoroSession(db.Model):
             'duration_minutes': self.duration_minutes,
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'ended_at': self.ended_at.isoformat() if self.ended_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'idempotency_key': self.idempotency_key
+        }
+
+
+class Tombstone(db.Model):
+    """Silinen kayıt izi (delta senkronizasyonu için)"""
+    
+    __tablename__ = 'tombstones'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    entity_type = db.Column(db.String(20), nullable=False)  # 'task', 'session'
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    change_seq = db.Column(db.BigInteger, default=0, nullable=False)  # Delta senkronizasyonu değişiklik numarası
+    
+    __table_args__ = (
+        db.Index('ix_tombstones_user_change', 'user_id', 'change_seq'),
+    )
+    
+    def __repr__(self):
+        return f'<Tombstone {self.entity_type} {self.entity_id}>'
+
+
+class SyncCounter(db.Model):
+    """Kullanıcı başına delta senkronizasyonu değişiklik sayacı
+    
+    Görev, oturum ve silme izi yazan her transaction sayacı bir artırır ve
+    yazdığı satırlara bu numarayı (change_seq) verir (bkz. sync.next_change_seq).
+    """
+    
+    __tablename__ = 'sync_counters'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    value = db.Column(db.BigInteger, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<SyncCounter {self.user_id}: {self.value}>'
+
+
+class DailyStat(db.Model):
+    """Günlük istatistik özeti (rollup) modeli
+    
+    Her satır bir kullanıcının bir gündeki belirli görev ve oturum tipine ait
+    toplamlarını tutar. end_pomodoro ile aynı transaction içinde güncellenir.
+    """
+    
+    __tablename__ = 'daily_stats'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)  # Oturumun bittiği gün (UTC)
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=True)  # Mola için nullable
+    session_type = db.Column(db.String(20), nullable=False)
+    session_count = db.Column(db.Integer, default=0, nullable=False)
+    minutes = db.Column(db.Float, default=0.0, nullable=False)
+    full_count = db.Column(db.Integer, default=0, nullable=False)
+    half_count = db.Column(db.Integer, default=0, nullable=False)
+    full_minutes = db.Column(db.Float, default=0.0, nullable=False)
+    half_minutes = db.Column(db.Float, default=0.0, nullable=False)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'day', 'task_id', 'session_type', name='uq_daily_stats_key'),
+        # NULL task_id'ler UNIQUE kısıtında birbirinden farklı sayılır; upsert hedefi bu index'tir
+        db.Index(
+            'uq_daily_stats_norm_key',
+            user_id, day, db.func.coalesce(task_id, 0), session_type,
+            unique=True
+        ),
+    )
+    
+    def __repr__(self):
+        return f'<DailyStat {self.user_id} {self.day}: {self.session_type} - {self.minutes}dk>'
+    
+    def to_dict(self):
+        """Günlük özet bilgilerini dictionary olarak döndür"""
+        return {
+            'user_id': self.user_id,
+            'day': self.day.isoformat() if self.day else None,
+            'task_id': self.task_id,
+            'session_type': self.session_type,
+            'session_count': self.session_count,
+            'minutes': self.minutes,
+            'full_count': self.full_count,
+            'half_count': self.half_count,
+            'full_minutes': self.full_minutes,
+            'half_minutes': self.half_minutes
+        }
+
+
+class SessionArchive(db.Model):
+    """Kullanıcı başına oturum arşivi durumu (saklama işi)
+    
+    archived_before gününden önce biten oturumlar veritabanından arşiv
+    dosyasına taşınmıştır; bu günlerin özetleri artık ham veriden yeniden
+    hesaplanmaz. archive_bytes dosyanın commit edilmiş uzunluğudur.
+    """
+    
+    __tablename__ = 'session_archives'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    archived_before = db.Column(db.Date, nullable=True)
+    archive_bytes = db.Column(db.Integer, default=0, nullable=False)
+    session_count = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=True)
+    
+    def __repr__(self):
+        return f'<SessionArchive {self.user_id} < {self.archived_before}: {self.session_count} oturum>'
+
+
+class ImportJob(db.Model):
+    """Toplu içe aktarma işi (ilerleme ve hata raporu, devam ettirme için)"""
+    
+    __tablename__ = 'import_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    kind = db.Column(db.String(20), nullable=False)  # 'tasks', 'sessions'
+    format = db.Column(db.String(20), nullable=False)  # 'csv', 'ndjson', 'json'
+    status = db.Column(db.String(20), default='running', nullable=False)  # 'running', 'completed', 'failed'
+    rows_processed = db.Column(db.Integer, default=0, nullable=False)  # Commit edilmiş kaynak satır sayısı
+    rows_imported = db.Column(db.Integer, default=0, nullable=False)
+    rows_duplicate = db.Column(db.Integer, default=0, nullable=False)
+    rows_failed = db.Column(db.Integer, default=0, nullable=False)
+    errors = db.Column(db.Text, nullable=True)  # JSON: [{"row": n, "message": "..."}] (sınırlı)
+    message = db.Column(db.String(500), nullable=True)  # İşi durduran hata
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<ImportJob {self.id}: {self.kind} {self.status} {self.rows_processed}>'
+    
+    def to_dict(self):
+        """İş özetini dictionary olarak döndür"""
+        return {
+            'import_id': self.id,
+            'kind': self.kind,
+            'format': self.format,
+            'status': self.status,
+            'rows_processed': self.rows_processed,
+            'imported': self.rows_imported,
+            'duplicates': self.rows_duplicate,
+            'failed': self.rows_failed,
+            'errors': json.loads(self.errors) if self.errors else [],
+            'message': self.message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+class ImportedRecord(db.Model):
+    """İçe aktarılan kaydın kaynaktaki id'si -> oluşturulan kaydın id'si
+    
+    Aynı dosya tekrar aktarıldığında görevler ikinci kez eklenmez; oturum
+    dosyalarındaki task_id'ler de bu eşleme ile yeni görevlere bağlanır.
+    """
+    
+    __tablename__ = 'imported_records'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    entity_type = db.Column(db.String(20), nullable=False)  # 'task'
+    source_id = db.Column(db.String(64), nullable=False)
+    target_id = db.Column(db.Integer, nullable=False)
+    
+    __table_args__ = (
+        db.Index('uq_imported_records_source', 'user_id', 'entity_type', 'source_id', unique=True),
+    )
+    
+    def __repr__(self):
+        return f'<ImportedRecord {self.entity_type} {self.source_id} -> {self.target_id}>'
+
+
+class UserActivity(db.Model):
+    """Kullanıcının gün bazında aktivite dizisi (seri ve ısı haritası için)
+    
+    counts, first_day'den başlayarak her gün için tamamlanan çalışma oturumu
+    sayısını tutar (gün başına 2 bayt, little-endian uint16). Yılda ~730 bayt
+    olduğu için seri ve ısı haritası oturum sayısından bağımsız hesaplanır.
+    """
+    
+    __tablename__ = 'user_activity'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    first_day = db.Column(db.Date, nullable=True)  # counts dizisinin ilk günü (UTC)
+    counts = db.Column(db.LargeBinary, default=b'', nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<UserActivity {self.user_id} {self.first_day} +{len(self.counts or b"") // 2} gün>'
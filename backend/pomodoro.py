@@ -1,24 +1,140 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
-from models import db, Task, PomodoroSession
+from sqlalchemy import func
+from models import db, Task, PomodoroSession, DailyStat, Tombstone, SESSION_TYPES
+from rollups import apply_session, apply_sessions, detach_tasks
+from stats_cache import statistics_cache
+from charts import build_chart, BUCKET_SIZES
+from search import search_tasks, SEARCH_LIMIT_DEFAULT, SEARCH_LIMIT_MAX
+from sync import next_change_seq
+from write_behind import write_behind
+from sweeper import open_sessions_query, enforce_open_session_limit
+from archive import archived_sessions
+from sessions import parse_datetime, parse_duration, parse_session_times, insert_sessions_ignoring_duplicates
+from activity import get_activity, streaks, heatmap, HEATMAP_MAX_DAYS
+from analytics import build_analytics, ANALYTICS_DEFAULT_DAYS, ANALYTICS_MAX_DAYS
 from datetime import datetime, timedelta
+import base64
 
 # Blueprint oluştur
 pomodoro_bp = Blueprint('pomodoro', __name__)
 
 
+# ==================== YARDIMCI FONKSİYONLAR ====================
+
+def _is_id(value):
+    """Değer geçerli bir kayıt id'si mi (bool, int alt sınıfı olsa da kabul edilmez)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _encode_cursor(moment, row_id):
+    """(zaman, id) çiftini opak sayfa imlecine çevir"""
+    raw = f'{moment.isoformat()}|{row_id}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def _decode_cursor(cursor):
+    """Sayfa imlecini (zaman, id) çiftine çevir (geçersizse ValueError)"""
+    try:
+        moment, row_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(moment), int(row_id)
+    except Exception:
+        raise ValueError('Geçersiz imleç')
+
+
 # ==================== GÖREVLER (TASKS) ====================
 
+# Toplu işlem isteğinde izin verilen en fazla işlem sayısı
+TASK_BATCH_MAX = 500
+
+# Görev listesi sayfa boyutu
+TASKS_PAGE_DEFAULT = 100
+TASKS_PAGE_MAX = 500
+
+# fields parametresiyle seçilebilecek görev alanları
+TASK_FIELDS = {'id', 'user_id', 'text', 'completed', 'created_at', 'updated_at'}
+
+
+def _delete_tasks(user_id, task_ids):
+    """Görevleri toplu sil (commit yapmaz)
+    
+    Günlük özetler görevsiz satırlara taşınır, oturumların görev bağlantısı
+    tek UPDATE ile kaldırılır ve görevler tek DELETE ile silinir.
+    """
+    now = datetime.utcnow()
+    change_seq = next_change_seq(user_id)
+    detach_tasks(user_id, task_ids)
+    
+    PomodoroSession.query.filter(
+        PomodoroSession.user_id == user_id,
+        PomodoroSession.task_id.in_(task_ids)
+    ).update({'task_id': None, 'updated_at': now, 'change_seq': change_seq}, synchronize_session=False)
+    
+    Task.query.filter(
+        Task.user_id == user_id,
+        Task.id.in_(task_ids)
+    ).delete(synchronize_session=False)
+    
+    # Delta senkronizasyonu için silme izleri
+    db.session.execute(Tombstone.__table__.insert(), [
+        {'user_id': user_id, 'entity_type': 'task', 'entity_id': task_id, 'deleted_at': now, 'change_seq': change_seq}
+        for task_id in task_ids
+    ])
+
+
 @pomodoro_bp.route('/api/tasks', methods=['GET'])
 @login_required
 def get_tasks():
-    """Kullanıcının görevlerini listele"""
+    """Kullanıcının görevlerini (created_at, id) üzerinden keyset sayfalama ile listele
+    
+    Parametreler: limit, cursor, completed (true/false), fields (virgülle ayrılmış alan listesi)
+    """
     try:
-        tasks = Task.query.filter_by(user_id=current_user.id).order_by(Task.created_at.desc()).all()
+        limit = min(max(request.args.get('limit', TASKS_PAGE_DEFAULT, type=int), 1), TASKS_PAGE_MAX)
+        
+        query = Task.query.filter(Task.user_id == current_user.id)
+        
+        completed = request.args.get('completed')
+        if completed is not None:
+            query = query.filter(Task.completed == (completed.lower() in ('1', 'true', 'yes')))
+        
+        fields = None
+        if request.args.get('fields'):
+            fields = {field.strip() for field in request.args['fields'].split(',')} | {'id'}
+            if not fields <= TASK_FIELDS:
+                return jsonify({
+                    'success': False,
+                    'message': 'Geçersiz alan seçimi'
+                }), 400
+        
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = _decode_cursor(cursor)
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'message': 'Geçersiz imleç'
+                }), 400
+            query = query.filter(
+                (Task.created_at < cursor_created_at) |
+                ((Task.created_at == cursor_created_at) & (Task.id < cursor_id))
+            )
+        
+        # Bir fazla satır çekerek sonraki sayfanın varlığı anlaşılır
+        tasks = query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1).all()
+        has_more = len(tasks) > limit
+        tasks = tasks[:limit]
+        
+        task_dicts = [task.to_dict() for task in tasks]
+        if fields:
+            task_dicts = [{key: value for key, value in data.items() if key in fields} for data in task_dicts]
         
         return jsonify({
             'success': True,
-            'tasks': [task.to_dict() for task in tasks]
+            'tasks': task_dicts,
+            'next_cursor': _encode_cursor(tasks[-1].created_at, tasks[-1].id) if has_more else None,
+            'has_more': has_more
         })
     except Exception as e:
         return jsonify({
@@ -27,6 +143,35 @@ def get_tasks():
         }), 500
 
 
+@pomodoro_bp.route('/api/tasks/search', methods=['GET'])
+@login_required
+def search_tasks_endpoint():
+    """Görev metinlerinde önek ve alaka sıralamalı arama
+    
+    Parametreler: q (arama metni), limit
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({
+                'success': False,
+                'message': 'Arama metni gerekli'
+            }), 400
+        
+        limit = min(max(request.args.get('limit', SEARCH_LIMIT_DEFAULT, type=int), 1), SEARCH_LIMIT_MAX)
+        tasks = search_tasks(current_user.id, query, limit)
+        
+        return jsonify({
+            'success': True,
+            'tasks': [task.to_dict() for task in tasks]
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Arama yapılamadı'
+        }), 500
+
+
 @pomodoro_bp.route('/api/tasks', methods=['POST'])
 @login_required
 def create_task():
@@ -95,7 +240,10 @@ def update_task(task_id):
             task.text = data['text'].strip()
         
         task.updated_at = datetime.utcnow()
+        # Commit sonrası current_user yeniden yüklenmesin diye id önceden alınır
+        user_id = current_user.id
         db.session.commit()
+        statistics_cache.invalidate_user(user_id)
         
         return jsonify({
             'success': True,
@@ -124,8 +272,11 @@ def delete_task(task_id):
                 'message': 'Görev bulunamadı'
             }), 404
         
-        db.session.delete(task)
+        _delete_tasks(current_user.id, [task.id])
+        
+        user_id = current_user.id
         db.session.commit()
+        statistics_cache.invalidate_user(user_id)
         
         return jsonify({
             'success': True,
@@ -140,6 +291,120 @@ def delete_task(task_id):
         }), 500
 
 
+@pomodoro_bp.route('/api/tasks/batch', methods=['POST'])
+@login_required
+def batch_tasks():
+    """Birden fazla görev işlemini (create, update, delete) tek transaction içinde uygula
+    
+    İstek: {"operations": [{"op": "create", "text": "..."},
+                           {"op": "update", "id": 1, "completed": true},
+                           {"op": "delete", "id": 2}]}
+    Geçersiz işlemler tek tek hata olarak raporlanır, geçerli olanlar uygulanır.
+    """
+    try:
+        data = request.get_json()
+        operations = data.get('operations') if isinstance(data, dict) else None
+        
+        if not isinstance(operations, list) or not operations:
+            return jsonify({
+                'success': False,
+                'message': 'İşlem listesi gerekli'
+            }), 400
+        
+        if len(operations) > TASK_BATCH_MAX:
+            return jsonify({
+                'success': False,
+                'message': f'En fazla {TASK_BATCH_MAX} işlem gönderilebilir'
+            }), 400
+        
+        user_id = current_user.id
+        
+        # Güncellenecek/silinecek görevleri sahiplik kontrolüyle tek sorguda getir
+        referenced_ids = {
+            op.get('id') for op in operations
+            if isinstance(op, dict) and _is_id(op.get('id'))
+        }
+        owned = {}
+        if referenced_ids:
+            owned = {
+                task.id: task
+                for task in Task.query.filter(
+                    Task.user_id == user_id,
+                    Task.id.in_(referenced_ids)
+                ).all()
+            }
+        
+        results = []
+        created = []
+        updated = []
+        deleted_ids = set()
+        now = datetime.utcnow()
+        
+        for index, op in enumerate(operations):
+            result = {'index': index, 'op': op.get('op') if isinstance(op, dict) else None}
+            results.append(result)
+            
+            if not isinstance(op, dict) or op.get('op') not in ('create', 'update', 'delete'):
+                result.update(success=False, message='Geçersiz işlem')
+                continue
+            
+            if op['op'] == 'create':
+                text = op.get('text').strip() if isinstance(op.get('text'), str) else ''
+                if not text:
+                    result.update(success=False, message='Görev metni boş olamaz')
+                    continue
+                task = Task(user_id=user_id, text=text, completed=bool(op.get('completed', False)))
+                db.session.add(task)
+                created.append((result, task))
+                continue
+            
+            task = owned.get(op['id']) if _is_id(op.get('id')) else None
+            if task is None or task.id in deleted_ids:
+                result.update(success=False, message='Görev bulunamadı')
+                continue
+            
+            if op['op'] == 'delete':
+                deleted_ids.add(task.id)
+                result.update(success=True, id=task.id)
+                continue
+            
+            # update
+            if 'completed' in op:
+                task.completed = bool(op['completed'])
+            if isinstance(op.get('text'), str) and op['text'].strip():
+                task.text = op['text'].strip()
+            task.updated_at = now
+            updated.append((result, task))
+        
+        # Eklemeler ve güncellemeler tek flush'ta toplu INSERT/UPDATE olarak gider
+        db.session.flush()
+        
+        for result, task in created + updated:
+            if task.id not in deleted_ids:
+                result.update(success=True, task=task.to_dict())
+            else:
+                result.update(success=True, id=task.id)
+        
+        if deleted_ids:
+            _delete_tasks(user_id, list(deleted_ids))
+        
+        db.session.commit()
+        if updated or deleted_ids:
+            statistics_cache.invalidate_user(user_id)
+        
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Toplu görev işlemi sırasında hata oluştu'
+        }), 500
+
+
 # ==================== POMODORO OTURUMLARI ====================
 
 @pomodoro_bp.route('/api/pomodoro/start', methods=['POST'])
@@ -180,20 +445,43 @@ def start_pomodoro():
                     'message': 'Görev bulunamadı'
                 }), 404
         
-        # Aktif oturum var mı kontrol et (opsiyonel - birden fazla aktif oturum olmasın)
-        # Şimdilik kullanıcı isterse birden fazla başlatabilir, ama bitirmeden yeni başlatamaz mantığı yok
+        # Write-behind modunda oturum günlüğe yazılır, id olarak anahtarı döner.
+        # Açık oturum sınırı bu modda flush sırasında (apply_events) uygulanır
+        if write_behind.enabled:
+            return jsonify({
+                'success': True,
+                'message': 'Pomodoro oturumu başlatıldı',
+                'session': write_behind.start(
+                    current_user.id,
+                    task_id if session_type == 'work' else None,
+                    session_type
+                )
+            }), 201
+        
+        # Kullanıcı aynı anda en fazla MAX_OPEN_SESSIONS_PER_USER açık oturum tutar;
+        # fazlası (en eskiler) süresi kırpılarak kapatılır
+        user_id = current_user.id
+        now = datetime.utcnow()
+        closed = enforce_open_session_limit(
+            user_id,
+            current_app.config.get('MAX_OPEN_SESSIONS_PER_USER', 3),
+            now,
+            current_app.config.get('OPEN_SESSION_DURATION_CAPS')
+        )
         
         # Yeni oturum oluştur
         new_session = PomodoroSession(
-            user_id=current_user.id,
+            user_id=user_id,
             task_id=task_id if session_type == 'work' else None,
             session_type=session_type,
             duration_minutes=0.0,  # Henüz bitmedi
-            started_at=datetime.utcnow()
+            started_at=now
         )
         
         db.session.add(new_session)
         db.session.commit()
+        if closed:
+            statistics_cache.invalidate_user(user_id)
         
         return jsonify({
             'success': True,
@@ -223,14 +511,29 @@ def end_pomodoro():
             }), 400
         
         session_id = data['session_id']
-        duration_minutes = data.get('duration_minutes', 0)  # Dakika cinsinden
         
-        if duration_minutes < 0:
+        try:
+            duration_minutes = parse_duration(data.get('duration_minutes', 0))  # Dakika cinsinden
+        except ValueError:
             return jsonify({
                 'success': False,
                 'message': 'Geçersiz süre'
             }), 400
         
+        # Write-behind anahtarıyla başlatılan oturum bitişi de günlüğe yazılır
+        if write_behind.enabled and write_behind.is_key(session_id):
+            session = write_behind.end(current_user.id, session_id, duration_minutes)
+            if session is None:
+                return jsonify({
+                    'success': False,
+                    'message': 'Oturum bulunamadı'
+                }), 404
+            return jsonify({
+                'success': True,
+                'message': 'Pomodoro oturumu tamamlandı',
+                'session': session
+            })
+        
         # Oturumu bul
         session = PomodoroSession.query.filter_by(
             id=session_id, 
@@ -243,11 +546,20 @@ def end_pomodoro():
                 'message': 'Oturum bulunamadı'
             }), 404
         
+        # Daha önce bitirilmiş oturumun eski katkısını günlük özetten geri al
+        if session.ended_at is not None:
+            apply_session(session, sign=-1)
+        
         # Oturumu güncelle
         session.duration_minutes = duration_minutes
         session.ended_at = datetime.utcnow()
         
+        # Günlük özeti aynı transaction içinde güncelle
+        apply_session(session)
+        
+        user_id = current_user.id
         db.session.commit()
+        statistics_cache.invalidate_user(user_id)
         
         return jsonify({
             'success': True,
@@ -263,98 +575,625 @@ def end_pomodoro():
         }), 500
 
 
+@pomodoro_bp.route('/api/pomodoro/active', methods=['GET'])
+@login_required
+def get_active_sessions():
+    """Kullanıcının açık (bitirilmemiş) oturumları, en yenisi önce
+    
+    Sayfa yenilendiğinde istemci devam eden oturumu buradan bulabilir.
+    """
+    try:
+        sessions = open_sessions_query(current_user.id).order_by(
+            PomodoroSession.started_at.desc()
+        ).all()
+        
+        return jsonify({
+            'success': True,
+            'session': sessions[0].to_dict() if sessions else None,
+            'sessions': [session.to_dict() for session in sessions]
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Aktif oturumlar getirilirken hata oluştu'
+        }), 500
+
+
+# Senkronizasyon isteğinde izin verilen en fazla oturum sayısı
+SYNC_BATCH_MAX = 500
+
+
+def _existing_session_ids(user_id, keys):
+    """Verilen anahtarlarla daha önce kaydedilmiş oturumların id'leri"""
+    if not keys:
+        return {}
+    return dict(db.session.query(
+        PomodoroSession.idempotency_key, PomodoroSession.id
+    ).filter(
+        PomodoroSession.user_id == user_id,
+        PomodoroSession.idempotency_key.in_(keys)
+    ).all())
+
+
+@pomodoro_bp.route('/api/pomodoro/sync', methods=['POST'])
+@login_required
+def sync_sessions():
+    """İstemcide tamamlanmış oturumları toplu yükle (idempotency anahtarı ile tekrar güvenli)
+    
+    İstek: {"sessions": [{"idempotency_key": "...", "session_type": "work", "task_id": 1,
+                          "started_at": "...", "ended_at": "...", "duration_minutes": 25}]}
+    Aynı anahtarla tekrar gönderilen oturumlar yeniden eklenmez, mevcut id döndürülür.
+    """
+    try:
+        data = request.get_json()
+        items = data.get('sessions') if isinstance(data, dict) else None
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                'success': False,
+                'message': 'Oturum listesi gerekli'
+            }), 400
+        
+        if len(items) > SYNC_BATCH_MAX:
+            return jsonify({
+                'success': False,
+                'message': f'En fazla {SYNC_BATCH_MAX} oturum gönderilebilir'
+            }), 400
+        
+        user_id = current_user.id
+        now = datetime.utcnow()
+        
+        # Çalışma oturumlarının görevlerini sahiplik kontrolüyle tek sorguda doğrula
+        task_ids = {item.get('task_id') for item in items if isinstance(item, dict)}
+        owned_task_ids = {
+            task_id for (task_id,) in db.session.query(Task.id).filter(
+                Task.user_id == user_id,
+                Task.id.in_({t for t in task_ids if _is_id(t)})
+            ).all()
+        }
+        
+        results = []
+        candidates = {}  # idempotency_key -> PomodoroSession (eklenmemiş)
+        
+        for index, item in enumerate(items):
+            result = {'index': index}
+            results.append(result)
+            
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError('Geçersiz oturum')
+                
+                key = item.get('idempotency_key')
+                if not isinstance(key, str) or not key.strip() or len(key) > 64:
+                    raise ValueError('Geçersiz idempotency anahtarı')
+                key = key.strip()
+                result['idempotency_key'] = key
+                
+                session_type = item.get('session_type')
+                if session_type not in SESSION_TYPES:
+                    raise ValueError('Geçersiz oturum tipi')
+                
+                task_id = item.get('task_id') if session_type == 'work' else None
+                if session_type == 'work' and (not _is_id(task_id) or task_id not in owned_task_ids):
+                    raise ValueError('Görev bulunamadı')
+                
+                started_at, ended_at = parse_session_times(item['started_at'], item['ended_at'], now)
+                
+                duration_minutes = item.get('duration_minutes')
+                if duration_minutes is None:
+                    duration_minutes = (ended_at - started_at).total_seconds() / 60
+                duration_minutes = parse_duration(duration_minutes)
+            except (KeyError, TypeError, ValueError) as e:
+                message = str(e) if isinstance(e, ValueError) and str(e) else 'Eksik veya geçersiz alan'
+                result.update(success=False, message=message)
+                continue
+            
+            # Aynı istek içindeki tekrarlar ilk kayda bağlanır
+            if key not in candidates:
+                candidates[key] = PomodoroSession(
+                    user_id=user_id,
+                    task_id=task_id,
+                    session_type=session_type,
+                    duration_minutes=duration_minutes,
+                    started_at=started_at,
+                    ended_at=ended_at,
+                    created_at=now,
+                    updated_at=now,
+                    idempotency_key=key
+                )
+        
+        # Daha önce yüklenmiş anahtarlar
+        session_ids = _existing_session_ids(user_id, list(candidates))
+        new_sessions = [s for key, s in candidates.items() if key not in session_ids]
+        
+        inserted_keys = set()
+        if new_sessions:
+            rows = [
+                {column.name: getattr(s, column.name) for column in PomodoroSession.__table__.columns if column.name != 'id'}
+                for s in new_sessions
+            ]
+            for session_id, key in insert_sessions_ignoring_duplicates(rows):
+                session_ids[key] = session_id
+                inserted_keys.add(key)
+            
+            # Eşzamanlı başka bir istek tarafından eklenmiş olanlar
+            missing = [s.idempotency_key for s in new_sessions if s.idempotency_key not in session_ids]
+            session_ids.update(_existing_session_ids(user_id, missing))
+            
+            # Sadece yeni eklenen oturumlar günlük özete yansır
+            apply_sessions(user_id, [s for s in new_sessions if s.idempotency_key in inserted_keys])
+        
+        for result in results:
+            if 'success' in result:
+                continue
+            key = result['idempotency_key']
+            result.update(
+                success=True,
+                session_id=session_ids.get(key),
+                duplicate=key not in inserted_keys
+            )
+            # Aynı istekte tekrar eden anahtarın sadece ilk geçişi yeni sayılır
+            inserted_keys.discard(key)
+        
+        db.session.commit()
+        statistics_cache.invalidate_user(user_id)
+        
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Oturumlar senkronize edilirken hata oluştu'
+        }), 500
+
+
+# ==================== OTURUM GEÇMİŞİ ====================
+
+SESSIONS_PAGE_DEFAULT = 50
+SESSIONS_PAGE_MAX = 200
+
+
+@pomodoro_bp.route('/api/pomodoro/sessions', methods=['GET'])
+@login_required
+def get_sessions():
+    """Bitmiş oturum geçmişini (ended_at, id) üzerinden keyset sayfalama ile listele
+    
+    Parametreler: limit, cursor, session_type, task_id, from, to
+    Arşive taşınmış oturumlar da aynı sırayla döner ("archived": true).
+    """
+    try:
+        limit = min(max(request.args.get('limit', SESSIONS_PAGE_DEFAULT, type=int), 1), SESSIONS_PAGE_MAX)
+        
+        query = PomodoroSession.query.filter(
+            PomodoroSession.user_id == current_user.id,
+            PomodoroSession.ended_at.isnot(None)
+        )
+        
+        session_type = request.args.get('session_type')
+        if session_type:
+            if session_type not in SESSION_TYPES:
+                return jsonify({
+                    'success': False,
+                    'message': 'Geçersiz oturum tipi'
+                }), 400
+            query = query.filter(PomodoroSession.session_type == session_type)
+        
+        task_id = request.args.get('task_id', type=int)
+        if task_id is not None:
+            query = query.filter(PomodoroSession.task_id == task_id)
+        
+        start = end = before = None
+        try:
+            if request.args.get('from'):
+                start = parse_datetime(request.args['from'])
+                query = query.filter(PomodoroSession.ended_at >= start)
+            if request.args.get('to'):
+                end = parse_datetime(request.args['to'])
+                query = query.filter(PomodoroSession.ended_at < end)
+            
+            # Keyset sayfalama: bir önceki sayfanın son (ended_at, id) değerinden sonrası
+            cursor = request.args.get('cursor')
+            if cursor:
+                before = _decode_cursor(cursor)
+                cursor_ended_at, cursor_id = before
+                query = query.filter(
+                    (PomodoroSession.ended_at < cursor_ended_at) |
+                    ((PomodoroSession.ended_at == cursor_ended_at) & (PomodoroSession.id < cursor_id))
+                )
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'Geçersiz tarih veya imleç'
+            }), 400
+        
+        # Bir fazla satır çekerek sonraki sayfanın varlığı anlaşılır
+        sessions = _session_dicts(query.order_by(
+            PomodoroSession.ended_at.desc(),
+            PomodoroSession.id.desc()
+        ), limit=limit + 1)
+        
+        # Arşive taşınmış eski oturumlar aynı sıralamayla birleştirilir
+        archived = archived_sessions(
+            current_user.id, start=start, end=end, before=before,
+            session_type=session_type or None, task_id=task_id, limit=limit + 1
+        )
+        if archived:
+            _attach_task_texts(current_user.id, archived)
+            sessions = sorted(
+                sessions + archived,
+                key=lambda s: (parse_datetime(s['ended_at']), s['id']),
+                reverse=True
+            )[:limit + 1]
+        
+        has_more = len(sessions) > limit
+        sessions = sessions[:limit]
+        next_cursor = None
+        if has_more:
+            last = sessions[-1]
+            next_cursor = _encode_cursor(parse_datetime(last['ended_at']), last['id'])
+        
+        return jsonify({
+            'success': True,
+            'sessions': sessions,
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Oturum geçmişi alınamadı'
+        }), 500
+
+
 # ==================== İSTATİSTİKLER ====================
 
+def _period_start(period, now):
+    """Periyodun (daily, weekly, monthly) başlangıç zamanını döndür"""
+    if period == 'weekly':
+        # Bu haftanın başlangıcı (Pazartesi)
+        days_since_monday = now.weekday()
+        return datetime(now.year, now.month, now.day) - timedelta(days=days_since_monday)
+    if period == 'monthly':
+        return datetime(now.year, now.month, 1)
+    return datetime(now.year, now.month, now.day)
+
+
+def _finished_since(user_id, start_date):
+    """Belirtilen tarihten sonra bitmiş oturumlar için filtre koşulları"""
+    return (
+        PomodoroSession.user_id == user_id,
+        PomodoroSession.ended_at.isnot(None),
+        PomodoroSession.ended_at >= start_date
+    )
+
+
+def _session_dicts(query, limit=None):
+    """Oturum sorgusunu görev metinleriyle birlikte (tek join sorgusu) dictionary listesine çevir"""
+    query = query.outerjoin(
+        Task, Task.id == PomodoroSession.task_id
+    ).add_columns(Task.text)
+    
+    if limit is not None:
+        query = query.limit(limit)
+    rows = query.all()
+    
+    result = []
+    for session, task_text in rows:
+        data = session.to_dict()
+        data['task_text'] = task_text
+        result.append(data)
+    return result
+
+
+def _attach_task_texts(user_id, sessions):
+    """Arşivden gelen oturum sözlüklerine görev metinlerini ekle (tek sorgu)"""
+    task_ids = {s['task_id'] for s in sessions if s['task_id'] is not None}
+    texts = {}
+    if task_ids:
+        texts = dict(db.session.query(Task.id, Task.text).filter(
+            Task.user_id == user_id,
+            Task.id.in_(task_ids)
+        ).all())
+    for session in sessions:
+        session['task_text'] = texts.get(session['task_id'])
+
+
+def _aggregate_totals(user_id, start_date):
+    """Oturum tipine göre toplam süre, adet ve tam/yarım pomodoro sayıları (günlük özetlerden)"""
+    rows = db.session.query(
+        DailyStat.session_type,
+        func.sum(DailyStat.session_count),
+        func.sum(DailyStat.minutes),
+        func.sum(DailyStat.full_count),
+        func.sum(DailyStat.half_count)
+    ).filter(
+        DailyStat.user_id == user_id,
+        DailyStat.day >= start_date.date()
+    ).group_by(DailyStat.session_type).all()
+    
+    return {
+        session_type: {
+            'count': count or 0,
+            'minutes': minutes or 0,
+            'full': full or 0,
+            'half': half or 0
+        }
+        for session_type, count, minutes, full, half in rows
+    }
+
+
+def _aggregate_task_statistics(user_id, start_date):
+    """Görev bazlı çalışma istatistikleri (günlük özetler + tasks join)"""
+    rows = db.session.query(
+        DailyStat.task_id,
+        Task.text,
+        func.sum(DailyStat.minutes),
+        func.sum(DailyStat.full_count),
+        func.sum(DailyStat.half_count),
+        func.sum(DailyStat.full_minutes),
+        func.sum(DailyStat.half_minutes)
+    ).outerjoin(
+        Task, Task.id == DailyStat.task_id
+    ).filter(
+        DailyStat.user_id == user_id,
+        DailyStat.day >= start_date.date(),
+        DailyStat.session_type == 'work',
+        DailyStat.task_id.isnot(None)
+    ).group_by(
+        DailyStat.task_id, Task.text
+    ).having(
+        func.sum(DailyStat.session_count) > 0
+    ).order_by(func.min(DailyStat.id)).all()
+    
+    return [
+        {
+            'task_id': task_id,
+            'task_text': text if text is not None else 'Bilinmeyen',
+            'total_minutes': total_minutes or 0,
+            'full_pomodoros': full or 0,
+            'half_pomodoros': half or 0,
+            'full_minutes': full_minutes or 0,  # Tam pomodorolardan gelen toplam dakika
+            'half_minutes': half_minutes or 0   # Eksik pomodorolardan gelen toplam dakika
+        }
+        for task_id, text, total_minutes, full, half, full_minutes, half_minutes in rows
+    ]
+
+
+def _build_statistics(user_id, period, start_date, include_sessions=False):
+    """İstatistik yanıtının içeriğini hesapla"""
+    # Toplamlar, tam/yarım pomodoro sayıları ve görev bazlı dağılım günlük özetlerden okunur
+    totals = _aggregate_totals(user_id, start_date)
+    work_totals = totals.get('work', {})
+    
+    statistics = {
+        'period': period,
+        'total_work_minutes': work_totals.get('minutes', 0),
+        'total_short_break_minutes': totals.get('shortBreak', {}).get('minutes', 0),
+        'total_long_break_minutes': totals.get('longBreak', {}).get('minutes', 0),
+        'total_pomodoros': work_totals.get('count', 0),
+        'full_pomodoros': work_totals.get('full', 0),
+        'half_pomodoros': work_totals.get('half', 0),
+        'task_statistics': _aggregate_task_statistics(user_id, start_date)
+    }
+    
+    # Oturum listesi sadece açıkça istendiğinde eklenir (görev metinleri tek join sorgusuyla gelir)
+    if include_sessions:
+        statistics['sessions'] = _session_dicts(PomodoroSession.query.filter(
+            *_finished_since(user_id, start_date)
+        ))
+    
+    return {
+        'success': True,
+        'statistics': statistics
+    }
+
+
 @pomodoro_bp.route('/api/pomodoro/statistics', methods=['GET'])
 @login_required
 def get_statistics():
-    """Kullanıcının pomodoro istatistiklerini getir"""
+    """Kullanıcının pomodoro istatistiklerini getir (önbellekli, ETag destekli)"""
     try:
         # Zaman filtresi (varsayılan: bugün)
         period = request.args.get('period', 'daily')  # daily, weekly, monthly
         
-        now = datetime.utcnow()
+        # Oturum listesi varsayılan olarak yanıta eklenmez (bkz. /api/pomodoro/sessions)
+        include_sessions = request.args.get('include_sessions', '').lower() in ('1', 'true', 'yes')
         
-        if period == 'daily':
-            start_date = datetime(now.year, now.month, now.day)
-        elif period == 'weekly':
-            # Bu haftanın başlangıcı (Pazartesi)
-            days_since_monday = now.weekday()
-            start_date = datetime(now.year, now.month, now.day) - timedelta(days=days_since_monday)
-        elif period == 'monthly':
-            start_date = datetime(now.year, now.month, 1)
+        start_date = _period_start(period, datetime.utcnow())
+        
+        # Periyot başlangıcı anahtarda olduğu için gün/hafta/ay dönünce kayıt kendiliğinden eskir
+        cache_key = (current_user.id, period, start_date, include_sessions)
+        entry = statistics_cache.get(cache_key)
+        
+        if entry is None:
+            generation = statistics_cache.generation(current_user.id)
+            payload = _build_statistics(current_user.id, period, start_date, include_sessions)
+            entry = statistics_cache.put(cache_key, current_app.json.dumps(payload), generation)
+        
+        # İstemcideki sürüm güncelse gövdesiz 304 döndür
+        if entry.etag in request.if_none_match:
+            response = current_app.response_class(status=304)
         else:
-            start_date = datetime(now.year, now.month, now.day)
+            response = current_app.response_class(entry.body, mimetype='application/json')
         
-        # Oturumları getir
-        sessions = PomodoroSession.query.filter(
-            PomodoroSession.user_id == current_user.id,
-            PomodoroSession.ended_at.isnot(None),
-            PomodoroSession.ended_at >= start_date
-        ).all()
+        response.set_etag(entry.etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
         
-        # İstatistikleri hesapla
-        total_work_minutes = sum(
-            s.duration_minutes for s in sessions if s.session_type == 'work'
-        )
-        total_short_break_minutes = sum(
-            s.duration_minutes for s in sessions if s.session_type == 'shortBreak'
-        )
-        total_long_break_minutes = sum(
-            s.duration_minutes for s in sessions if s.session_type == 'longBreak'
-        )
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'İstatistikler alınamadı'
+        }), 500
+
+
+@pomodoro_bp.route('/api/pomodoro/analytics', methods=['GET'])
+@login_required
+def get_analytics():
+    """Kullanıcı ve görev bazında odaklanma analizi (önbellekli, ETag destekli)
+    
+    Parametre: days (analiz penceresi, varsayılan 90)
+    """
+    try:
+        try:
+            days = int(request.args.get('days', ANALYTICS_DEFAULT_DAYS))
+            if not 1 <= days <= ANALYTICS_MAX_DAYS:
+                raise ValueError('Geçersiz gün sayısı')
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': f'Geçersiz gün sayısı (1-{ANALYTICS_MAX_DAYS})'
+            }), 400
         
-        # Tam ve yarım pomodoro sayılarını hesapla
-        work_sessions = [s for s in sessions if s.session_type == 'work']
-        full_pomodoros = len([s for s in work_sessions if s.duration_minutes >= 25.0])
-        half_pomodoros = len([s for s in work_sessions if s.duration_minutes > 0 and s.duration_minutes < 25.0])
-        total_pomodoros = len(work_sessions)
-        
-        # Görev bazlı istatistikler
-        task_stats = {}
-        for session in sessions:
-            if session.session_type == 'work' and session.task_id:
-                task_id = session.task_id
-                if task_id not in task_stats:
-                    task_stats[task_id] = {
-                        'task_id': task_id,
-                        'task_text': session.task.text if session.task else 'Bilinmeyen',
-                        'total_minutes': 0,
-                        'full_pomodoros': 0,
-                        'half_pomodoros': 0,
-                        'full_minutes': 0,  # Tam pomodorolardan gelen toplam dakika
-                        'half_minutes': 0   # Eksik pomodorolardan gelen toplam dakika
-                    }
-                
-                duration = session.duration_minutes
-                task_stats[task_id]['total_minutes'] += duration
-                
-                # Tam veya eksik pomodoro kontrolü
-                if duration >= 25.0:
-                    task_stats[task_id]['full_pomodoros'] += 1
-                    task_stats[task_id]['full_minutes'] += duration
-                elif duration > 0:
-                    task_stats[task_id]['half_pomodoros'] += 1
-                    task_stats[task_id]['half_minutes'] += duration
+        # Gün anahtarda olduğu için pencere ertesi gün kendiliğinden kayar
+        today = datetime.utcnow().date()
+        cache_key = (current_user.id, 'analytics', days, today)
+        entry = statistics_cache.get(cache_key)
+        
+        if entry is None:
+            generation = statistics_cache.generation(current_user.id)
+            payload = {
+                'success': True,
+                'analytics': build_analytics(current_user.id, today, days)
+            }
+            entry = statistics_cache.put(cache_key, current_app.json.dumps(payload), generation)
+        
+        if entry.etag in request.if_none_match:
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(entry.body, mimetype='application/json')
+        
+        response.set_etag(entry.etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Analiz verisi alınamadı'
+        }), 500
+
+
+@pomodoro_bp.route('/api/pomodoro/statistics/cache', methods=['GET'])
+@login_required
+def get_statistics_cache():
+    """İstatistik önbelleğinin isabet/ıskalama sayaçlarını döndür"""
+    return jsonify({
+        'success': True,
+        'cache': statistics_cache.stats()
+    })
+
+
+@pomodoro_bp.route('/api/pomodoro/streak', methods=['GET'])
+@login_required
+def get_streak():
+    """Güncel ve en uzun çalışma serisi (gün, UTC)"""
+    try:
+        activity = get_activity(current_user.id)
         
         return jsonify({
             'success': True,
-            'statistics': {
-                'period': period,
-                'total_work_minutes': total_work_minutes,
-                'total_short_break_minutes': total_short_break_minutes,
-                'total_long_break_minutes': total_long_break_minutes,
-                'total_pomodoros': total_pomodoros,
-                'full_pomodoros': full_pomodoros,
-                'half_pomodoros': half_pomodoros,
-                'task_statistics': list(task_stats.values()),
-                'sessions': [s.to_dict() for s in sessions]
-            }
+            'streak': streaks(activity, datetime.utcnow().date())
         })
         
     except Exception as e:
+        db.session.rollback()
         return jsonify({
             'success': False,
-            'message': 'İstatistikler alınamadı'
+            'message': 'Seri bilgisi alınamadı'
+        }), 500
+
+
+@pomodoro_bp.route('/api/pomodoro/heatmap', methods=['GET'])
+@login_required
+def get_heatmap():
+    """Gün bazında tamamlanan çalışma oturumu sayıları (yıllık ısı haritası)
+    
+    Parametreler: days (varsayılan 365), end (YYYY-MM-DD, varsayılan bugün)
+    """
+    try:
+        try:
+            days = int(request.args.get('days', 365))
+            end_day = parse_datetime(request.args['end']).date() if request.args.get('end') else datetime.utcnow().date()
+            if not 1 <= days <= HEATMAP_MAX_DAYS:
+                raise ValueError('Geçersiz gün sayısı')
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': f'Geçersiz parametre (days: 1-{HEATMAP_MAX_DAYS}, end: YYYY-MM-DD)'
+            }), 400
+        
+        activity = get_activity(current_user.id)
+        
+        return jsonify({
+            'success': True,
+            'heatmap': heatmap(activity, end_day, days)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Isı haritası alınamadı'
         }), 500
 
+
+# Aralık verilmediğinde varsayılan geçmiş uzunluğu
+CHART_DEFAULT_SPANS = {
+    'hour': timedelta(days=1),
+    'day': timedelta(days=7),
+    'week': timedelta(weeks=12),
+    'month': timedelta(days=365)
+}
+
+
+@pomodoro_bp.route('/api/pomodoro/chart', methods=['GET'])
+@login_required
+def get_chart():
+    """Grafik için hazır aralıklanmış seriler (saatlik, günlük, haftalık veya aylık)
+    
+    Parametreler: bucket (hour, day, week, month), from, to (ISO 8601, UTC)
+    """
+    try:
+        bucket = request.args.get('bucket', 'day')
+        if bucket not in BUCKET_SIZES:
+            return jsonify({
+                'success': False,
+                'message': 'Geçersiz aralık tipi (hour, day, week, month)'
+            }), 400
+        
+        try:
+            range_end = parse_datetime(request.args['to']) if request.args.get('to') else datetime.utcnow()
+            if request.args.get('from'):
+                range_start = parse_datetime(request.args['from'])
+            else:
+                range_start = range_end - CHART_DEFAULT_SPANS[bucket]
+            
+            if range_start >= range_end:
+                raise ValueError('Başlangıç bitişten önce olmalı')
+            
+            chart = build_chart(current_user.id, range_start, range_end, bucket)
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'Geçersiz veya çok geniş tarih aralığı'
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'chart': chart
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Grafik verisi alınamadı'
+        }), 500
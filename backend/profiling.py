@@ -0,0 +1,186 @@
+"""
+İsteğe bağlı, istek başına cProfile ölçümü
+
+Varsayılan olarak kapalıdır. İki şekilde açılır:
+- PROFILE_TOKEN ayarlıysa, "X-Profile-Token: <token>" başlığı gönderen istekler
+- PROFILE_SAMPLE_RATE > 0 ise, isteklerin bu oranı (0.0 - 1.0) rastgele seçilerek
+
+Profiller PROFILE_DIR klasörüne endpoint ve kullanıcı id'si ile etiketlenmiş
+.prof dosyaları olarak yazılır; en fazla PROFILE_MAX_FILES dosya tutulur, en
+eskiler silinir. Dosyalar `flask --app app profiles list/show` ile incelenir
+veya doğrudan pstats/snakeviz ile açılabilir.
+"""
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import click
+from datetime import datetime
+from flask import g, request, current_app
+from flask.cli import with_appcontext
+from flask_login import current_user
+
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+# <zaman>_<endpoint>_u<kullanıcı>.prof
+PROFILE_NAME = re.compile(r'^(?P<time>\d{8}T\d{12})_(?P<endpoint>[\w.-]+)_u(?P<user>\w+)\.prof$')
+
+
+def init_profiling(app):
+    """Profil middleware'ini ve CLI komutlarını kaydet"""
+    app.cli.add_command(profiles_command)
+
+    token = app.config.get('PROFILE_TOKEN')
+    rate = app.config.get('PROFILE_SAMPLE_RATE', 0.0)
+    if not token and rate <= 0:
+        return
+
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+
+
+def profile_directory(app=None):
+    """Profil klasörünün mutlak yolu"""
+    app = app or current_app
+    directory = app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+    return os.path.abspath(directory)
+
+
+def _should_profile():
+    """Bu isteğin profillenip profillenmeyeceğine karar ver"""
+    token = current_app.config.get('PROFILE_TOKEN')
+    if token and request.headers.get(PROFILE_HEADER) == token:
+        return True
+    rate = current_app.config.get('PROFILE_SAMPLE_RATE', 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def _start_profile():
+    if not _should_profile():
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Aynı anda başka bir profil aracı etkin; bu istek atlanır
+        return
+    g.profiler = profiler
+
+
+def _finish_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profiler.disable()
+
+    try:
+        user_id = current_user.get_id() if current_user.is_authenticated else 'anon'
+        endpoint = re.sub(r'[^\w.-]', '-', request.endpoint or 'unmatched')
+        name = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}_{endpoint}_u{user_id}.prof"
+
+        directory = profile_directory()
+        os.makedirs(directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(directory, name))
+        _rotate(directory, current_app.config.get('PROFILE_MAX_FILES', 200))
+        response.headers['X-Profile-Id'] = name
+    except Exception as e:
+        current_app.logger.warning(f"Profil kaydedilemedi: {e}")
+
+    return response
+
+
+def _rotate(directory, max_files):
+    """En fazla max_files profil tut, en eskileri sil"""
+    names = sorted(name for name in os.listdir(directory) if PROFILE_NAME.match(name))
+    for name in names[:max(len(names) - max_files, 0)]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+
+
+def list_profiles(directory, endpoint=None, user_id=None):
+    """Kayıtlı profilleri en yeniden eskiye döndür"""
+    if not os.path.isdir(directory):
+        return []
+
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        match = PROFILE_NAME.match(name)
+        if not match:
+            continue
+        if endpoint and match['endpoint'] != endpoint:
+            continue
+        if user_id is not None and match['user'] != str(user_id):
+            continue
+        stats = pstats.Stats(os.path.join(directory, name))
+        profiles.append({
+            'name': name,
+            'time': datetime.strptime(match['time'], '%Y%m%dT%H%M%S%f'),
+            'endpoint': match['endpoint'],
+            'user': match['user'],
+            'total_seconds': stats.total_tt,
+            'calls': stats.total_calls
+        })
+    return profiles
+
+
+def summarize_profile(path, sort='cumulative', limit=25):
+    """Bir profilin en pahalı fonksiyonlarını metin olarak döndür"""
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+@click.group('profiles')
+def profiles_command():
+    """Kayıtlı istek profillerini listele ve incele"""
+
+
+@profiles_command.command('list')
+@with_appcontext
+@click.option('--endpoint', default=None, help='Sadece bu endpoint (örn. pomodoro.get_statistics)')
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcının profilleri')
+@click.option('--limit', type=int, default=50, help='En fazla gösterilecek profil sayısı')
+def list_profiles_command(endpoint, user_id, limit):
+    """Profilleri en yeniden eskiye listele"""
+    profiles = list_profiles(profile_directory(), endpoint, user_id)
+    if not profiles:
+        click.echo("Kayıtlı profil yok.")
+        return
+
+    for profile in profiles[:limit]:
+        click.echo(
+            f"{profile['name']}  {profile['endpoint']}  kullanıcı={profile['user']}  "
+            f"{profile['total_seconds'] * 1000:.1f} ms  {profile['calls']} çağrı"
+        )
+
+    # Endpoint başına özet
+    click.echo("")
+    by_endpoint = {}
+    for profile in profiles:
+        by_endpoint.setdefault(profile['endpoint'], []).append(profile['total_seconds'])
+    for name, durations in sorted(by_endpoint.items()):
+        click.echo(
+            f"{name}: {len(durations)} profil, ortalama {sum(durations) / len(durations) * 1000:.1f} ms, "
+            f"en yavaş {max(durations) * 1000:.1f} ms"
+        )
+
+
+@profiles_command.command('show')
+@with_appcontext
+@click.argument('name')
+@click.option('--sort', default='cumulative', help='pstats sıralama anahtarı (cumulative, tottime, calls)')
+@click.option('--limit', type=int, default=25, help='Gösterilecek fonksiyon sayısı')
+def show_profile_command(name, sort, limit):
+    """Bir profilin en pahalı fonksiyonlarını göster"""
+    if not PROFILE_NAME.match(name):
+        raise click.ClickException("Geçersiz profil adı")
+    path = os.path.join(profile_directory(), name)
+    if not os.path.exists(path):
+        raise click.ClickException("Profil bulunamadı")
+    click.echo(summarize_profile(path, sort, limit))
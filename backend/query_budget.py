@@ -0,0 +1,92 @@
+"""
+İstek başına SQL sorgu sayısı ölçümü ve bütçe kontrolü
+
+Endpoint'lerin N+1 sorgu problemine geri dönmesini yakalamak için kullanılır.
+Örnek:
+
+    client = app.test_client()
+    response, statements = request_with_budget(client, 'GET', '/api/pomodoro/statistics')
+
+Her istek kendi uygulama bağlamında çalışmalıdır; dışarıda açık bırakılmış bir
+app_context, oturum kimlik haritası (identity map) sayesinde sorguları gizleyebilir.
+"""
+from contextlib import contextmanager
+from sqlalchemy import event
+from models import db
+
+
+# Endpoint başına izin verilen en fazla SQL ifadesi sayısı
+# (Flask-Login user_loader sorgusu dahil)
+ENDPOINT_BUDGETS = {
+    'pomodoro.get_tasks': 2,
+    'pomodoro.search_tasks_endpoint': 2,
+    'pomodoro.create_task': 4,
+    'pomodoro.update_task': 5,
+    'pomodoro.delete_task': 9,
+    'pomodoro.batch_tasks': 12,
+    'pomodoro.start_pomodoro': 5,
+    'pomodoro.end_pomodoro': 7,
+    'pomodoro.sync_sessions': 8,
+    'pomodoro.get_statistics': 4,
+    'pomodoro.get_statistics_cache': 1,
+    'pomodoro.get_sessions': 2,
+    'pomodoro.get_chart': 3,
+    'sync.delta_sync': 4
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Bir istek bütçesinden fazla SQL ifadesi çalıştırdığında fırlatılır"""
+
+    def __init__(self, endpoint, budget, statements):
+        self.endpoint = endpoint
+        self.budget = budget
+        self.statements = statements
+        listing = '\n'.join(f'  {i + 1}. {sql}' for i, sql in enumerate(statements))
+        super().__init__(
+            f'{endpoint}: {len(statements)} SQL ifadesi çalıştı (bütçe: {budget})\n{listing}'
+        )
+
+
+@contextmanager
+def count_queries(engine=None):
+    """Blok içinde çalışan SQL ifadelerini listeye topla"""
+    engine = engine or db.engine
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def resolve_endpoint(app, method, path):
+    """URL ve metottan endpoint adını bul"""
+    adapter = app.url_map.bind('localhost')
+    endpoint, _ = adapter.match(path.split('?', 1)[0], method=method)
+    return endpoint
+
+
+def request_with_budget(client, method, path, budget=None, **kwargs):
+    """Test client ile istek at, SQL ifadelerini say ve bütçe aşılırsa hata fırlat
+
+    budget verilmezse ENDPOINT_BUDGETS içindeki tanım kullanılır.
+    """
+    app = client.application
+    endpoint = resolve_endpoint(app, method, path)
+    if budget is None:
+        budget = ENDPOINT_BUDGETS.get(endpoint)
+
+    with app.app_context():
+        engine = db.engine
+
+    with count_queries(engine) as statements:
+        response = client.open(path, method=method, **kwargs)
+
+    if budget is not None and len(statements) > budget:
+        raise QueryBudgetExceeded(endpoint, budget, statements)
+    return response, statements
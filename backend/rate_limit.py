@@ -0,0 +1,207 @@
+"""
+Token bucket tabanlı istek sınırlama
+
+Config.RATE_LIMITS endpoint adı ("blueprint.fonksiyon") başına IP ve/veya
+kullanıcı için (kapasite, saniye) kuralları tanımlar: kova en fazla
+`kapasite` token tutar ve `saniye` içinde tamamen dolar. Her istek ilgili
+kovaların her birinden bir token harcar; birinde bile token yoksa hiçbirinden
+harcanmaz ve 429 + Retry-After döner.
+
+Kova durumu değiştirilebilir bir depoda tutulur:
+- MemoryStorage: süreç içi sözlük; süresi dolan kovalar silinir, sınır aşılırsa
+  en uzun süredir kullanılmayanlar atılır
+- SQLiteStorage: yerel SQLite dosyası; aynı makinedeki birden fazla worker
+  sınırları paylaşır (RATE_LIMIT_STORAGE = 'sqlite:/yol/limits.db')
+
+IP adresi request.remote_addr'dir; proxy arkasında çalışırken ProxyFix ile
+gerçek istemci adresi sağlanmalıdır.
+"""
+import math
+import sqlite3
+import threading
+import time
+from flask import request, jsonify
+from flask_login import current_user
+
+
+def _refill(state, capacity, refill_seconds, now):
+    """Kovanın şu anki token sayısı (state: kayıtlı (token, son güncelleme) veya None)"""
+    tokens, updated = state if state else (capacity, now)
+    return min(capacity, tokens + (now - updated) * capacity / refill_seconds)
+
+
+def _take_all(buckets, states, now):
+    """Kovaların hepsinde token varsa her birinden bir token harca
+
+    buckets: [(anahtar, kapasite, dolma süresi sn)], states: anahtar -> kayıtlı durum.
+    Kovalardan biri bile reddederse hiçbirinden token harcanmaz.
+    (izin verildi mi, tekrar deneme süresi, anahtar -> yeni token sayısı) döndürür.
+    """
+    tokens = {
+        key: _refill(states.get(key), capacity, refill_seconds, now)
+        for key, capacity, refill_seconds in buckets
+    }
+    retry_after = max(
+        [(1 - tokens[key]) * refill_seconds / capacity
+         for key, capacity, refill_seconds in buckets if tokens[key] < 1],
+        default=0
+    )
+    allowed = retry_after == 0
+    if allowed:
+        tokens = {key: value - 1 for key, value in tokens.items()}
+    return allowed, retry_after, tokens
+
+
+class MemoryStorage:
+    """Süreç içi kova deposu: anahtar -> (token, son güncelleme, son kullanma)"""
+
+    def __init__(self, max_keys=100000, sweep_interval=1000):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._calls = 0
+
+    def take(self, buckets, now):
+        """Kovaların hepsinden bir token harca; (izin verildi mi, tekrar deneme süresi) döndür"""
+        with self._lock:
+            states = {
+                key: self._buckets[key][:2]
+                for key, _, _ in buckets if key in self._buckets
+            }
+            allowed, retry_after, tokens = _take_all(buckets, states, now)
+            for key, _, refill_seconds in buckets:
+                # Silip yeniden eklemek anahtarı sözlüğün sonuna taşır: sıra son kullanıma göre kalır
+                self._buckets.pop(key, None)
+                self._buckets[key] = (tokens[key], now, now + refill_seconds)
+
+            self._calls += 1
+            if self._calls >= self.sweep_interval or len(self._buckets) > self.max_keys:
+                self._sweep(now)
+
+        return allowed, retry_after
+
+    def _sweep(self, now):
+        """Süresi dolmuş (tamamen dolmuş) kovaları sil; gerekirse en uzun süredir kullanılmayanları at"""
+        self._calls = 0
+        expired = [key for key, (_, _, expires) in self._buckets.items() if expires <= now]
+        for key in expired:
+            del self._buckets[key]
+        if len(self._buckets) > self.max_keys:
+            # Sözlük son kullanım sırasında; en uzun süredir kullanılmayanlar başta
+            for key in list(self._buckets)[:len(self._buckets) - self.max_keys]:
+                del self._buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteStorage:
+    """Worker'lar arasında paylaşılan SQLite kova deposu"""
+
+    def __init__(self, path, sweep_interval=1000):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._calls = 0
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limits ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, '
+                'expires REAL NOT NULL)'
+            )
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def take(self, buckets, now):
+        """Kovaların hepsinden bir token harca; (izin verildi mi, tekrar deneme süresi) döndür"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            states = {}
+            for key, _, _ in buckets:
+                row = conn.execute('SELECT tokens, updated FROM rate_limits WHERE key = ?', (key,)).fetchone()
+                if row:
+                    states[key] = row
+            allowed, retry_after, tokens = _take_all(buckets, states, now)
+            conn.executemany(
+                'INSERT INTO rate_limits (key, tokens, updated, expires) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, '
+                'updated = excluded.updated, expires = excluded.expires',
+                [(key, tokens[key], now, now + refill_seconds) for key, _, refill_seconds in buckets]
+            )
+
+            self._calls += 1
+            if self._calls >= self.sweep_interval:
+                self._calls = 0
+                conn.execute('DELETE FROM rate_limits WHERE expires < ?', (now,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return allowed, retry_after
+
+
+def create_storage(spec):
+    """RATE_LIMIT_STORAGE ayarından depo oluştur ('memory' veya 'sqlite:<yol>')"""
+    if not spec or spec == 'memory':
+        return MemoryStorage()
+    if spec.startswith('sqlite:'):
+        return SQLiteStorage(spec[len('sqlite:'):])
+    raise ValueError(f'Bilinmeyen RATE_LIMIT_STORAGE: {spec}')
+
+
+class RateLimiter:
+    """Endpoint başına IP ve kullanıcı kovalarını kontrol eden middleware"""
+
+    def __init__(self, rules, storage):
+        self.rules = rules
+        self.storage = storage
+
+    def check(self):
+        """İstek sınırı aşıldıysa 429 yanıtı döndür"""
+        rule = self.rules.get(request.endpoint)
+        if not rule or request.method == 'OPTIONS':
+            return None
+
+        buckets = []
+        if 'ip' in rule:
+            buckets.append((f'ip:{request.endpoint}:{request.remote_addr}', *rule['ip']))
+        if 'user' in rule and current_user.is_authenticated:
+            buckets.append((f'user:{request.endpoint}:{current_user.get_id()}', *rule['user']))
+        if not buckets:
+            return None
+
+        # Tüm kovalar birlikte kontrol edilir; reddedilen istek hiçbir kovadan token harcamaz
+        allowed, retry_after = self.storage.take(buckets, time.time())
+        if not allowed:
+            response = jsonify({
+                'success': False,
+                'message': 'Çok fazla istek, lütfen biraz sonra tekrar deneyin'
+            })
+            response.status_code = 429
+            response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+            return response
+        return None
+
+
+def init_rate_limit(app):
+    """Config.RATE_LIMITS kurallarını before_request olarak kaydet"""
+    if not app.config.get('RATE_LIMIT_ENABLED', True):
+        return None
+
+    limiter = RateLimiter(
+        app.config.get('RATE_LIMITS', {}),
+        create_storage(app.config.get('RATE_LIMIT_STORAGE', 'memory'))
+    )
+    app.before_request(limiter.check)
+    app.extensions['rate_limiter'] = limiter
+    return limiter
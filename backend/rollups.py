@@ -0,0 +1,305 @@
+import click
+from flask.cli import with_appcontext
+from datetime import datetime, date
+from sqlalchemy import func, case, literal_column
+from models import db, PomodoroSession, DailyStat, SessionArchive, FULL_POMODORO_MINUTES
+from stats_cache import statistics_cache
+from activity import activity_deltas, record_activity
+
+
+# Özet satırında tutulan sayaç alanları
+STAT_FIELDS = ('session_count', 'minutes', 'full_count', 'half_count', 'full_minutes', 'half_minutes')
+
+
+def init_rollups(app):
+    """Rollup yönetim komutlarını Flask CLI'a kaydet"""
+    app.cli.add_command(rebuild_daily_stats_command)
+    app.cli.add_command(check_daily_stats_command)
+
+
+# ==================== ARTIMLI GÜNCELLEME ====================
+
+def session_contribution(session):
+    """Bitmiş bir oturumun günlük özete katkısını hesapla"""
+    duration = session.duration_minutes or 0
+    is_full = duration >= FULL_POMODORO_MINUTES
+    is_half = 0 < duration < FULL_POMODORO_MINUTES
+    return {
+        'session_count': 1,
+        'minutes': duration,
+        'full_count': 1 if is_full else 0,
+        'half_count': 1 if is_half else 0,
+        'full_minutes': duration if is_full else 0.0,
+        'half_minutes': duration if is_half else 0.0
+    }
+
+
+def _upsert_stats(rows):
+    """Özet satırlarına katkıları atomik olarak ekle (yoksa satırı oluştur)
+
+    Sayaçlar veritabanında `kolon = kolon + değer` ile güncellenir; eşzamanlı
+    end/sync istekleri birbirinin artışını ezemez. Çakışma hedefi NULL
+    task_id'yi 0 sayan uq_daily_stats_norm_key index'idir.
+    """
+    if not rows:
+        return
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    table = DailyStat.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.day, func.coalesce(table.c.task_id, literal_column('0')), table.c.session_type],
+        set_={field: table.c[field] + stmt.excluded[field] for field in STAT_FIELDS}
+    )
+    db.session.execute(stmt, rows)
+
+
+def apply_session(session, sign=1):
+    """Oturumun katkısını günlük özete ekle (sign=-1 ile geri al)
+
+    Commit yapmaz; çağıran endpoint'in transaction'ı içinde çalışır.
+    """
+    if session.ended_at is None:
+        return
+
+    contribution = session_contribution(session)
+    _upsert_stats([dict(
+        user_id=session.user_id,
+        day=session.ended_at.date(),
+        task_id=session.task_id,
+        session_type=session.session_type,
+        **{field: sign * value for field, value in contribution.items()}
+    )])
+
+    # Seri / ısı haritası dizisi de aynı transaction'da güncellenir
+    record_activity(session.user_id, activity_deltas([session], sign))
+
+
+def apply_sessions(user_id, sessions):
+    """Aynı kullanıcıya ait çok sayıda bitmiş oturumu günlük özete toplu ekle
+
+    Katkılar önce bellekte anahtar bazında toplanır, sonra anahtar başına
+    tek bir upsert ile yazılır. Commit yapmaz.
+    """
+    deltas = {}
+    for session in sessions:
+        if session.ended_at is None:
+            continue
+        key = (session.ended_at.date(), session.task_id, session.session_type)
+        delta = deltas.setdefault(key, {field: 0 for field in STAT_FIELDS})
+        for field, value in session_contribution(session).items():
+            delta[field] += value
+
+    if not deltas:
+        return
+
+    record_activity(user_id, activity_deltas(sessions))
+
+    _upsert_stats([
+        dict(user_id=user_id, day=day, task_id=task_id, session_type=session_type, **delta)
+        for (day, task_id, session_type), delta in deltas.items()
+    ])
+
+
+def detach_tasks(user_id, task_ids):
+    """Silinen görevlerin özetlerini görevsiz satırlara taşı
+
+    Görev silindiğinde oturumların task_id alanı NULL yapılır; özetler de
+    aynı şekilde görevsiz (task_id=NULL) satırlara eklenip silinir.
+    """
+    stats = DailyStat.query.filter(
+        DailyStat.user_id == user_id,
+        DailyStat.task_id.in_(task_ids)
+    ).all()
+    if not stats:
+        return
+
+    deltas = {}
+    for stat in stats:
+        delta = deltas.setdefault((stat.day, stat.session_type), {field: 0 for field in STAT_FIELDS})
+        for field in STAT_FIELDS:
+            delta[field] += getattr(stat, field)
+
+    DailyStat.query.filter(
+        DailyStat.id.in_([stat.id for stat in stats])
+    ).delete(synchronize_session=False)
+    _upsert_stats([
+        dict(user_id=user_id, day=day, task_id=None, session_type=session_type, **delta)
+        for (day, session_type), delta in deltas.items()
+    ])
+
+
+# ==================== HAM VERİDEN HESAPLAMA ====================
+
+def _as_date(value):
+    """SQLite date() sonucunu (metin) date nesnesine çevir"""
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def raw_daily_aggregates(user_id=None, since=None, before=None):
+    """Ham oturumlardan (user_id, gün, task_id, tip) bazında özetleri hesapla
+
+    since/before verilirse yalnızca [since, before) günlerinde bitenler.
+    """
+    duration = PomodoroSession.duration_minutes
+    is_full = duration >= FULL_POMODORO_MINUTES
+    is_half = (duration > 0) & (duration < FULL_POMODORO_MINUTES)
+    day = func.date(PomodoroSession.ended_at)
+
+    query = db.session.query(
+        PomodoroSession.user_id,
+        day,
+        PomodoroSession.task_id,
+        PomodoroSession.session_type,
+        func.count(PomodoroSession.id),
+        func.coalesce(func.sum(duration), 0.0),
+        func.sum(case((is_full, 1), else_=0)),
+        func.sum(case((is_half, 1), else_=0)),
+        func.sum(case((is_full, duration), else_=0.0)),
+        func.sum(case((is_half, duration), else_=0.0))
+    ).filter(PomodoroSession.ended_at.isnot(None))
+
+    if user_id is not None:
+        query = query.filter(PomodoroSession.user_id == user_id)
+    if since is not None:
+        query = query.filter(PomodoroSession.ended_at >= datetime.combine(since, datetime.min.time()))
+    if before is not None:
+        query = query.filter(PomodoroSession.ended_at < datetime.combine(before, datetime.min.time()))
+
+    rows = query.group_by(
+        PomodoroSession.user_id, day, PomodoroSession.task_id, PomodoroSession.session_type
+    ).all()
+
+    return {
+        (row[0], _as_date(row[1]), row[2], row[3]): dict(zip(STAT_FIELDS, row[4:]))
+        for row in rows
+    }
+
+
+def archived_days(user_id=None):
+    """Kullanıcı başına arşiv sınırı: bu günden önceki özetler ham veriden hesaplanmaz"""
+    query = SessionArchive.query.filter(SessionArchive.archived_before.isnot(None))
+    if user_id is not None:
+        query = query.filter(SessionArchive.user_id == user_id)
+    return {state.user_id: state.archived_before for state in query.all()}
+
+
+def _is_archived(key, watermarks):
+    watermark = watermarks.get(key[0])
+    return watermark is not None and key[1] < watermark
+
+
+def rebuild_daily_stats(user_id=None):
+    """Günlük özetleri ham oturumlardan yeniden oluştur (tek transaction)
+
+    Arşivlenmiş günlerin özetleri (ham verisi artık veritabanında olmadığı
+    için) olduğu gibi korunur.
+    """
+    watermarks = archived_days(user_id)
+    aggregates = raw_daily_aggregates(user_id)
+
+    delete_query = DailyStat.query.filter(~SessionArchive.query.filter(
+        SessionArchive.user_id == DailyStat.user_id,
+        SessionArchive.archived_before > DailyStat.day
+    ).exists())
+    if user_id is not None:
+        delete_query = delete_query.filter(DailyStat.user_id == user_id)
+    delete_query.delete(synchronize_session=False)
+
+    rows = [
+        dict(user_id=key[0], day=key[1], task_id=key[2], session_type=key[3], **values)
+        for key, values in aggregates.items()
+        if not _is_archived(key, watermarks)
+    ]
+    if rows:
+        db.session.execute(DailyStat.__table__.insert(), rows)
+    db.session.commit()
+    statistics_cache.clear()
+    return len(rows)
+
+
+def rebuild_daily_stats_range(user_id, since, before):
+    """Kullanıcının [since, before) günlerindeki özetlerini ham veriden yeniden yaz
+
+    since None ise en baştan. Commit yapmaz (arşiv işi sınırı aynı
+    transaction'da kaydeder).
+    """
+    delete_query = DailyStat.query.filter(
+        DailyStat.user_id == user_id,
+        DailyStat.day < before
+    )
+    if since is not None:
+        delete_query = delete_query.filter(DailyStat.day >= since)
+    delete_query.delete(synchronize_session=False)
+
+    rows = [
+        dict(user_id=key[0], day=key[1], task_id=key[2], session_type=key[3], **values)
+        for key, values in raw_daily_aggregates(user_id, since, before).items()
+    ]
+    if rows:
+        db.session.execute(DailyStat.__table__.insert(), rows)
+    return len(rows)
+
+
+def check_daily_stats(user_id=None, tolerance=1e-6):
+    """Günlük özetleri ham veriyle karşılaştır, tutarsız anahtarları listele
+
+    Arşivlenmiş günler karşılaştırılmaz.
+    """
+    watermarks = archived_days(user_id)
+    expected = {
+        key: values for key, values in raw_daily_aggregates(user_id).items()
+        if not _is_archived(key, watermarks)
+    }
+
+    query = DailyStat.query
+    if user_id is not None:
+        query = query.filter(DailyStat.user_id == user_id)
+
+    actual = {}
+    for stat in query.all():
+        values = {field: getattr(stat, field) for field in STAT_FIELDS}
+        # Tamamen sıfırlanmış satırlar (geri alınan katkılar) boş sayılır
+        if any(values.values()) and not _is_archived((stat.user_id, stat.day), watermarks):
+            actual[(stat.user_id, stat.day, stat.task_id, stat.session_type)] = values
+
+    mismatches = []
+    for key in set(expected) | set(actual):
+        exp = expected.get(key)
+        act = actual.get(key)
+        if exp is None or act is None or any(
+            abs((exp[field] or 0) - (act[field] or 0)) > tolerance for field in STAT_FIELDS
+        ):
+            mismatches.append({'key': key, 'expected': exp, 'actual': act})
+    return mismatches
+
+
+# ==================== CLI KOMUTLARI ====================
+
+@click.command('rebuild-daily-stats')
+@with_appcontext
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcının özetlerini yeniden oluştur')
+def rebuild_daily_stats_command(user_id):
+    """Günlük istatistik özetlerini ham oturumlardan yeniden oluştur"""
+    count = rebuild_daily_stats(user_id)
+    click.echo(f"{count} günlük özet satırı oluşturuldu.")
+
+
+@click.command('check-daily-stats')
+@with_appcontext
+@click.option('--user-id', type=int, default=None, help='Sadece bu kullanıcıyı kontrol et')
+def check_daily_stats_command(user_id):
+    """Günlük özetlerin ham oturumlarla tutarlılığını kontrol et"""
+    mismatches = check_daily_stats(user_id)
+    if not mismatches:
+        click.echo("Günlük özetler tutarlı.")
+        return
+
+    for item in mismatches:
+        click.echo(f"Tutarsız: {item['key']} beklenen={item['expected']} mevcut={item['actual']}")
+    raise SystemExit(1)
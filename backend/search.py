@@ -0,0 +1,108 @@
+"""
+Görev metinlerinde tam metin arama
+
+SQLite FTS5 varsa görevler harici içerikli (external content) bir FTS5 sanal
+tablosunda indekslenir. İndeks tasks tablosundaki tetikleyicilerle (trigger)
+güncel tutulur; böylece tekil endpoint'ler, toplu işlemler ve toplu silmeler
+aynı şekilde yansır. FTS5 yoksa (veya veritabanı SQLite değilse) LIKE
+tabanlı basit aramaya düşülür.
+"""
+import re
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from models import db, Task
+
+
+# FTS5 kullanılabilir mi (init_search tarafından ayarlanır)
+fts_enabled = False
+
+SEARCH_LIMIT_DEFAULT = 20
+SEARCH_LIMIT_MAX = 100
+
+FTS_SETUP = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        text, user_id,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, text, user_id) VALUES (new.id, new.text, new.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, text, user_id) VALUES ('delete', old.id, old.text, old.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF text, user_id ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, text, user_id) VALUES ('delete', old.id, old.text, old.user_id);
+        INSERT INTO tasks_fts(rowid, text, user_id) VALUES (new.id, new.text, new.user_id);
+    END"""
+]
+
+# Sıralama: sadece text kolonu puanlanır (user_id ağırlığı 0)
+FTS_QUERY = """
+    SELECT tasks.* FROM tasks_fts
+    JOIN tasks ON tasks.id = tasks_fts.rowid
+    WHERE tasks_fts MATCH :match
+    ORDER BY bm25(tasks_fts, 1.0, 0.0)
+    LIMIT :limit
+"""
+
+
+def init_search(app):
+    """FTS5 tablosunu ve tetikleyicileri oluştur; FTS5 yoksa LIKE aramasına düş"""
+    global fts_enabled
+
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            fts_enabled = False
+            return
+
+        try:
+            with db.engine.begin() as conn:
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+                )).first() is not None
+                for statement in FTS_SETUP:
+                    conn.execute(text(statement))
+                # Mevcut görevleri ilk kurulumda indeksle
+                if not exists:
+                    conn.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+            fts_enabled = True
+        except OperationalError as e:
+            print(f"FTS5 kullanılamıyor, LIKE aramasına düşülüyor: {e}")
+            fts_enabled = False
+
+
+def search_terms(query):
+    """Arama metnini kelimelere ayır"""
+    return re.findall(r'\w+', query, flags=re.UNICODE)
+
+
+def _match_expression(user_id, terms):
+    """FTS5 MATCH ifadesi: kullanıcıya göre filtre + her kelime için önek araması"""
+    phrases = ' '.join(f'"{term}"*' for term in terms)
+    return f'user_id : "{int(user_id)}" AND text : ({phrases})'
+
+
+def _like_pattern(term):
+    """LIKE joker karakterlerini (%, _) ve kaçış karakterini metin olarak eşleşecek şekilde kaçır"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def search_tasks(user_id, query, limit=SEARCH_LIMIT_DEFAULT):
+    """Kullanıcının görevlerinde ara (tüm kelimeler önek olarak eşleşmeli)"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    if fts_enabled:
+        return Task.query.from_statement(text(FTS_QUERY)).params(
+            match=_match_expression(user_id, terms),
+            limit=limit
+        ).all()
+
+    # Yedek yol: LIKE ile tam tarama (sıralama en yeni görevden)
+    like_query = Task.query.filter(Task.user_id == user_id)
+    for term in terms:
+        like_query = like_query.filter(Task.text.ilike(_like_pattern(term), escape='\\'))
+    return like_query.order_by(Task.created_at.desc()).limit(limit).all()
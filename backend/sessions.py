@@ -0,0 +1,73 @@
+"""
+Oturum verisi için ortak ayrıştırma ve toplu ekleme yardımcıları
+
+Senkronizasyon (pomodoro.py), içe aktarma (importer.py) ve write-behind
+(write_behind.py) aynı doğrulama kurallarını ve aynı idempotent eklemeyi
+kullanır: süre ve tarih kuralları tek yerde tanımlanır.
+"""
+import math
+from datetime import datetime, timedelta, timezone
+from models import db, PomodoroSession, MAX_SESSION_MINUTES
+from sync import next_change_seq
+
+# İstemciden gelen oturum zamanları için kabul edilen aralık
+# (aktivite dizisi ve günlük özet absürt tarihlerle şişmesin)
+SESSION_EARLIEST = datetime(2000, 1, 1)
+SESSION_MAX_FUTURE = timedelta(days=1)
+
+
+def parse_datetime(value):
+    """ISO 8601 tarih/saat metnini naive UTC datetime'a çevir (geçersizse ValueError)
+
+    Saat dilimi belirtilmiş değerler UTC'ye dönüştürülür; belirtilmemişler
+    zaten UTC kabul edilir.
+    """
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def parse_duration(value):
+    """Oturum süresini (dakika) doğrula: sonlu ve 0 ile MAX_SESSION_MINUTES arasında
+
+    Geçersizse ValueError; NaN/Infinity de reddedilir.
+    """
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        duration = float(value)
+    except (TypeError, ValueError):
+        raise ValueError('Geçersiz süre')
+    if not math.isfinite(duration) or not 0 <= duration <= MAX_SESSION_MINUTES:
+        raise ValueError('Geçersiz süre')
+    return duration
+
+
+def parse_session_times(started_at, ended_at, now):
+    """Bitmiş oturumun başlangıç ve bitiş zamanlarını çevir ve doğrula (geçersizse ValueError)"""
+    started_at = parse_datetime(started_at)
+    ended_at = parse_datetime(ended_at)
+    if ended_at < started_at:
+        raise ValueError('Bitiş zamanı başlangıçtan önce olamaz')
+    if started_at < SESSION_EARLIEST or ended_at > now + SESSION_MAX_FUTURE:
+        raise ValueError('Oturum zamanı kabul edilen aralığın dışında')
+    return started_at, ended_at
+
+
+def insert_sessions_ignoring_duplicates(rows):
+    """Oturumları toplu ekle; (user_id, idempotency_key) çakışanları atla
+
+    Satırlar kullanıcının değişiklik numarasıyla (change_seq) damgalanır.
+    Sadece gerçekten eklenen satırların (id, idempotency_key) çiftlerini döndürür.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    rows = [dict(row, change_seq=next_change_seq(row['user_id'])) for row in rows]
+    stmt = insert(PomodoroSession.__table__).on_conflict_do_nothing(
+        index_elements=['user_id', 'idempotency_key']
+    ).returning(PomodoroSession.id, PomodoroSession.idempotency_key)
+    return db.session.execute(stmt, rows).all()
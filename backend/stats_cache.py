@@ -0,0 +1,107 @@
+"""
+İstatistik yanıtları için kullanıcı + periyot bazlı LRU önbellek
+
+Yanıtlar JSON metni ve ETag ile birlikte saklanır. Veriyi değiştiren
+endpoint'ler (end_pomodoro, update_task, delete_task) ilgili kullanıcının
+kayıtlarını geçersiz kılar. Önbellek süreç içidir; birden fazla worker
+çalıştırıldığında her worker kendi önbelleğini tutar.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class CacheEntry:
+    """Önbellekteki tek bir yanıt (JSON gövdesi + ETag)"""
+
+    __slots__ = ('body', 'etag')
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+
+class StatisticsCache:
+    """Boyutu sınırlı, thread-safe LRU önbellek"""
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self, user_id):
+        """Kullanıcının geçersiz kılma sayacını döndür"""
+        with self._lock:
+            return self._epoch, self._generations.get(user_id, 0)
+
+    def get(self, key):
+        """Kaydı döndür ve en son kullanılan olarak işaretle (yoksa None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body, generation=None):
+        """Yanıtı önbelleğe ekle
+
+        Hesaplama sırasında kullanıcının verisi değiştiyse (generation farklıysa)
+        bayat yanıt saklanmaz, ancak yine de istemciye döndürülebilir.
+        """
+        entry = CacheEntry(body)
+        user_id = key[0]
+        with self._lock:
+            current = (self._epoch, self._generations.get(user_id, 0))
+            if generation is not None and current != generation:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def invalidate_user(self, user_id):
+        """Kullanıcıya ait tüm kayıtları sil"""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self):
+        """Tüm önbelleği temizle"""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def stats(self):
+        """İsabet/ıskalama sayaçlarını döndür"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+statistics_cache = StatisticsCache()
+
+
+def init_stats_cache(app):
+    """Önbellek boyutunu uygulama yapılandırmasından ayarla"""
+    statistics_cache.max_size = app.config.get('STATISTICS_CACHE_SIZE', 1024)
@@ -0,0 +1,273 @@
+"""
+Terk edilmiş açık oturumların temizlenmesi
+
+start_pomodoro ended_at = NULL olan bir satır oluşturur; sekme kapatılırsa
+end_pomodoro hiç çağrılmaz ve satır sonsuza kadar açık kalır. Bu modül
+OPEN_SESSION_MAX_AGE_MINUTES dakikadan eski açık oturumları sınırlı
+partiler halinde:
+- 'close': started_at'ten itibaren geçen süreyi oturum tipinin süre
+  sınırıyla (OPEN_SESSION_DURATION_CAPS) kırparak kapatır ve günlük özete ekler.
+  Bitirilmemiş çalışma oturumu tam pomodoro sayılmaz: süresi her zaman
+  FULL_POMODORO_MINUTES'in altında (en fazla yarım pomodoro) tutulur
+- 'purge': siler ve delta senkronizasyonu için silme izi bırakır
+
+Açık oturum sorguları ended_at IS NULL koşullu kısmi index'i
+(ix_pomodoro_sessions_open) kullanır; index yalnızca açık satırları tuttuğu
+için tarama maliyeti toplam oturum sayısından bağımsızdır.
+
+Kapatma ve silme ended_at IS NULL koşullu tek bir UPDATE/DELETE ... RETURNING
+ile yapılır; seçimden sonra end_pomodoro ile bitirilen oturumlara dokunulmaz
+ve günlük özete yalnızca gerçekten kapatılan satırlar eklenir.
+
+Temizlik `flask sweep-sessions` komutuyla veya OPEN_SESSION_SWEEP_INTERVAL
+saniyede bir çalışan arka plan thread'iyle yapılır. Birden fazla worker
+çalıştırılıyorsa thread yalnızca birinde açılmalıdır.
+"""
+import threading
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import case
+from models import db, PomodoroSession, Tombstone, FULL_POMODORO_MINUTES
+from rollups import apply_sessions
+from stats_cache import statistics_cache
+from sync import next_change_seq
+
+
+SWEEP_ACTIONS = ('close', 'purge')
+
+# Bitirilmeden bırakılan çalışma oturumu en fazla yarım pomodoro sayılır (dakika)
+ABANDONED_WORK_MAX_MINUTES = FULL_POMODORO_MINUTES / 2
+
+# Oturum tipi başına kapatma süresi sınırları (dakika); mola süreleri arayüzdeki
+# zamanlayıcılarla aynıdır
+DEFAULT_DURATION_CAPS = {'work': ABANDONED_WORK_MAX_MINUTES, 'shortBreak': 5.0, 'longBreak': 15.0}
+
+
+def open_sessions_query(user_id=None):
+    """Açık (bitirilmemiş) oturumlar; kısmi index ile çalışır"""
+    query = PomodoroSession.query.filter(PomodoroSession.ended_at.is_(None))
+    if user_id is not None:
+        query = query.filter(PomodoroSession.user_id == user_id)
+    return query
+
+
+def capped_duration(session, now, caps=None):
+    """started_at'ten bu yana geçen süre, oturum tipinin sınırıyla kırpılmış (dakika)
+
+    Çalışma oturumları yapılandırmadan bağımsız olarak ABANDONED_WORK_MAX_MINUTES
+    ile sınırlanır; terk edilmiş oturum tamamlanmış pomodoro olarak sayılmaz.
+    """
+    caps = caps or DEFAULT_DURATION_CAPS
+    elapsed = max((now - session.started_at).total_seconds() / 60.0, 0.0)
+    limit = caps.get(session.session_type, elapsed)
+    if session.session_type == 'work':
+        limit = min(limit, ABANDONED_WORK_MAX_MINUTES)
+    return min(elapsed, limit)
+
+
+def close_sessions(sessions, now, caps=None):
+    """Açık oturumları kırpılmış süreyle kapat ve günlük özete ekle (commit yapmaz)
+
+    Bitiş zamanı started_at + süre olarak yazılır; böylece özet oturumun
+    gerçekte yapıldığı güne eklenir. Güncelleme ended_at IS NULL koşuluyla
+    yapılır: bu arada bitirilmiş oturumlar atlanır ve özete yalnızca
+    RETURNING ile dönen satırlar eklenir. Kapatılan satırları döndürür.
+    """
+    if not sessions:
+        return []
+
+    durations = {session.id: capped_duration(session, now, caps) for session in sessions}
+    ended = {
+        session.id: session.started_at + timedelta(minutes=durations[session.id])
+        for session in sessions
+    }
+    # Değişiklik numaraları satırlara dokunmadan önce, kullanıcı id sırasıyla alınır
+    change_seqs = {user_id: next_change_seq(user_id) for user_id in sorted({s.user_id for s in sessions})}
+    table = PomodoroSession.__table__
+    closed = db.session.execute(
+        table.update()
+        .where(table.c.id.in_(list(durations)), table.c.ended_at.is_(None))
+        .values(
+            duration_minutes=case(durations, value=table.c.id),
+            ended_at=case(ended, value=table.c.id),
+            updated_at=now,
+            change_seq=case(
+                {session.id: change_seqs[session.user_id] for session in sessions},
+                value=table.c.id
+            )
+        )
+        .returning(
+            table.c.id, table.c.user_id, table.c.task_id, table.c.session_type,
+            table.c.duration_minutes, table.c.ended_at
+        )
+    ).all()
+
+    by_user = {}
+    for row in closed:
+        by_user.setdefault(row.user_id, []).append(row)
+    for user_id, user_sessions in by_user.items():
+        apply_sessions(user_id, user_sessions)
+    return closed
+
+
+def purge_sessions(sessions, now):
+    """Açık oturumları sil ve silme izi bırak (commit yapmaz)
+
+    Açık oturumların günlük özete katkısı olmadığı için özet değişmez.
+    Silme ended_at IS NULL koşuluyla yapılır; bu arada bitirilmiş oturumlar
+    korunur. Silinen satırları döndürür.
+    """
+    if not sessions:
+        return []
+
+    # Değişiklik numaraları satırlara dokunmadan önce, kullanıcı id sırasıyla alınır
+    change_seqs = {user_id: next_change_seq(user_id) for user_id in sorted({s.user_id for s in sessions})}
+    table = PomodoroSession.__table__
+    purged = db.session.execute(
+        table.delete()
+        .where(table.c.id.in_([session.id for session in sessions]), table.c.ended_at.is_(None))
+        .returning(table.c.id, table.c.user_id)
+    ).all()
+    if purged:
+        db.session.execute(Tombstone.__table__.insert(), [
+            {
+                'user_id': row.user_id, 'entity_type': 'session', 'entity_id': row.id,
+                'deleted_at': now, 'change_seq': change_seqs[row.user_id]
+            }
+            for row in purged
+        ])
+    return purged
+
+
+def sweep_open_sessions(max_age_minutes=120, action='close', batch_size=500, max_batches=None, caps=None):
+    """Eski açık oturumları partiler halinde kapat veya sil
+
+    Her parti ayrı transaction'dır; uzun bir kilit tutulmaz. Parti boyutundan
+    az satır geldiğinde veya max_batches'e ulaşıldığında durur. Kapatılan
+    veya silinen oturum sayısını döndürür.
+    """
+    if action not in SWEEP_ACTIONS:
+        raise ValueError(f'Geçersiz temizlik işlemi: {action}')
+
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(minutes=max_age_minutes)
+        sessions = open_sessions_query().filter(
+            PomodoroSession.started_at < cutoff
+        ).order_by(PomodoroSession.started_at).limit(batch_size).all()
+        if not sessions:
+            break
+
+        try:
+            if action == 'close':
+                processed = close_sessions(sessions, now, caps)
+                changed_users = {row.user_id for row in processed}
+            else:
+                processed = purge_sessions(sessions, now)
+                changed_users = set()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        for user_id in changed_users:
+            statistics_cache.invalidate_user(user_id)
+        total += len(processed)
+        batches += 1
+        if len(sessions) < batch_size:
+            break
+
+    return total
+
+
+def enforce_open_session_limit(user_id, limit, now, caps=None):
+    """Yeni oturum açılmadan önce kullanıcının açık oturumlarını limit - 1'e indir
+
+    En eski açık oturumlar kırpılmış süreyle kapatılır (commit yapmaz).
+    Kapatılan oturum sayısını döndürür.
+    """
+    if limit <= 0:
+        return 0
+
+    open_sessions = open_sessions_query(user_id).order_by(
+        PomodoroSession.started_at.desc()
+    ).offset(limit - 1).all()
+    return len(close_sessions(open_sessions, now, caps))
+
+
+class OpenSessionSweeper:
+    """sweep_open_sessions'ı belirli aralıklarla çalıştıran arka plan thread'i"""
+
+    def __init__(self):
+        self.app = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self, app, interval):
+        self.stop()
+        self.app = app
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name='session-sweeper', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                with self.app.app_context():
+                    count = sweep_open_sessions(**sweep_options(self.app))
+                if count:
+                    self.app.logger.info('%d terk edilmiş oturum temizlendi', count)
+            except Exception:
+                self.app.logger.exception('Oturum temizleme hatası')
+
+
+session_sweeper = OpenSessionSweeper()
+
+
+def sweep_options(app):
+    """Yapılandırmadan sweep_open_sessions parametreleri"""
+    return {
+        'max_age_minutes': app.config.get('OPEN_SESSION_MAX_AGE_MINUTES', 120),
+        'action': app.config.get('OPEN_SESSION_SWEEP_ACTION', 'close'),
+        'batch_size': app.config.get('OPEN_SESSION_SWEEP_BATCH', 500),
+        'caps': app.config.get('OPEN_SESSION_DURATION_CAPS') or DEFAULT_DURATION_CAPS
+    }
+
+
+def init_sweeper(app):
+    """CLI komutunu kaydet; aralık verilmişse arka plan temizliğini başlat"""
+    app.cli.add_command(sweep_sessions_command)
+
+    interval = app.config.get('OPEN_SESSION_SWEEP_INTERVAL', 0)
+    if interval > 0:
+        session_sweeper.start(app, interval)
+
+
+@click.command('sweep-sessions')
+@with_appcontext
+@click.option('--max-age', type=int, default=None, help='Bu kadar dakikadan eski açık oturumlar (varsayılan: yapılandırma)')
+@click.option('--action', type=click.Choice(SWEEP_ACTIONS), default=None, help='close: kapat, purge: sil')
+@click.option('--batch-size', type=int, default=None, help='Transaction başına oturum sayısı')
+@click.option('--max-batches', type=int, default=None, help='En fazla parti sayısı')
+def sweep_sessions_command(max_age, action, batch_size, max_batches):
+    """Terk edilmiş açık oturumları kapat veya sil"""
+    options = sweep_options(current_app)
+    if max_age is not None:
+        options['max_age_minutes'] = max_age
+    if action is not None:
+        options['action'] = action
+    if batch_size is not None:
+        options['batch_size'] = batch_size
+    count = sweep_open_sessions(max_batches=max_batches, **options)
+    click.echo(f"{count} açık oturum işlendi ({options['action']}).")
@@ -0,0 +1,171 @@
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models import db, Task, PomodoroSession, Tombstone, SyncCounter
+import base64
+import json
+
+# Blueprint oluştur
+sync_bp = Blueprint('sync', __name__)
+
+# Varlık türü başına tek yanıtta dönen en fazla kayıt
+SYNC_PAGE_DEFAULT = 500
+SYNC_PAGE_MAX = 1000
+
+# change_seq ile damgalanan modeller
+SYNCED_MODELS = (Task, PomodoroSession, Tombstone)
+
+# Transaction içinde kullanıcı başına alınmış değişiklik numaraları (session.info anahtarı)
+_CHANGE_SEQ_KEY = 'sync_change_seq'
+
+
+def next_change_seq(user_id, session=None):
+    """Kullanıcının bu transaction'daki değişiklik numarası
+
+    Sayaç transaction'daki ilk çağrıda tek bir upsert ile artırılır; sonraki
+    çağrılar aynı numarayı döndürür. Sayaç satırı commit'e kadar kilitli
+    kaldığı için aynı kullanıcıya yazan transaction'lar numara sırasıyla
+    commit edilir: daha büyük numaralı bir değişiklik görünür olduğunda
+    küçük numaralılar da görünürdür ve imleç hiçbir değişikliği atlamaz.
+    """
+    session = session or db.session
+    cache = session.info.setdefault(_CHANGE_SEQ_KEY, {})
+    if user_id not in cache:
+        if db.engine.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        table = SyncCounter.__table__
+        stmt = insert(table).values(user_id=user_id, value=1).on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={'value': table.c.value + 1}
+        ).returning(table.c.value)
+        cache[user_id] = session.execute(stmt).scalar_one()
+    return cache[user_id]
+
+
+def _stamp_changes(session, flush_context, instances):
+    """Flush edilecek yeni ve değişmiş görev/oturum/silme izlerine change_seq ver"""
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, SYNCED_MODELS):
+            continue
+        if obj in session.new or session.is_modified(obj, include_collections=False):
+            obj.change_seq = next_change_seq(obj.user_id, session)
+
+
+def _forget_change_seq(session, transaction):
+    """Transaction bitince numaralar unutulur; sonraki transaction yeni numara alır"""
+    if transaction.parent is None:
+        session.info.pop(_CHANGE_SEQ_KEY, None)
+
+
+def init_sync(app):
+    """ORM yazmalarını change_seq ile damgalayan olayları kaydet
+
+    Toplu (Core) UPDATE/INSERT yapan kod yolları numarayı next_change_seq
+    ile kendileri yazar.
+    """
+    if not event.contains(Session, 'before_flush', _stamp_changes):
+        event.listen(Session, 'before_flush', _stamp_changes)
+        event.listen(Session, 'after_transaction_end', _forget_change_seq)
+
+
+def _encode_cursor(positions):
+    """Varlık türü başına (change_seq, id) konumlarını opak imlece çevir"""
+    raw = json.dumps(positions, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _decode_cursor(cursor):
+    """İmleci varlık türü başına (change_seq, id) konumlarına çevir
+
+    Geçersiz imleçte ValueError. updated_at tabanlı eski imleçler için None
+    döner; bu istemciler baştan senkronize edilir.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        positions = {}
+        for name, (change_seq, row_id) in raw.items():
+            if isinstance(change_seq, str):
+                return None
+            positions[name] = (int(change_seq), int(row_id))
+        return positions
+    except Exception:
+        raise ValueError('Geçersiz imleç')
+
+
+def _changed_since(model, user_id, position, limit):
+    """(change_seq, id) sırasına göre konumdan sonra değişen kayıtları getir (keyset)"""
+    query = model.query.filter(model.user_id == user_id)
+    if position is not None:
+        change_seq, row_id = position
+        query = query.filter(
+            (model.change_seq > change_seq) | ((model.change_seq == change_seq) & (model.id > row_id))
+        )
+    rows = query.order_by(model.change_seq, model.id).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+
+@sync_bp.route('/api/sync', methods=['GET'])
+@login_required
+def delta_sync():
+    """İmleçten bu yana oluşturulan, güncellenen veya silinen görev ve oturumları döndür
+
+    İlk çağrıda (since olmadan) tüm veri döner. Yanıttaki cursor bir sonraki
+    çağrıda since olarak gönderilir. has_more true ise aynı işlem hemen tekrarlanmalıdır.
+    Kayıtlar sunucunun verdiği değişiklik numarasıyla (change_seq) sıralanır;
+    commit edilmiş her değişiklik hemen döner, bekleme penceresi yoktur.
+    reset true ise imleç eski biçimdedir: istemci yerel kopyasını bu çağrıdan
+    başlayarak baştan oluşturmalıdır.
+    """
+    try:
+        limit = min(max(request.args.get('limit', SYNC_PAGE_DEFAULT, type=int), 1), SYNC_PAGE_MAX)
+
+        positions = {}
+        reset = False
+        if request.args.get('since'):
+            try:
+                positions = _decode_cursor(request.args['since'])
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'message': 'Geçersiz imleç'
+                }), 400
+            if positions is None:
+                positions = {}
+                reset = True
+
+        user_id = current_user.id
+
+        tasks, more_tasks = _changed_since(Task, user_id, positions.get('tasks'), limit)
+        sessions, more_sessions = _changed_since(PomodoroSession, user_id, positions.get('sessions'), limit)
+        tombstones, more_tombstones = _changed_since(Tombstone, user_id, positions.get('tombstones'), limit)
+
+        # Her varlık türü için son döndürülen kaydın konumu
+        if tasks:
+            positions['tasks'] = (tasks[-1].change_seq, tasks[-1].id)
+        if sessions:
+            positions['sessions'] = (sessions[-1].change_seq, sessions[-1].id)
+        if tombstones:
+            positions['tombstones'] = (tombstones[-1].change_seq, tombstones[-1].id)
+
+        return jsonify({
+            'success': True,
+            'tasks': [task.to_dict() for task in tasks],
+            'sessions': [session.to_dict() for session in sessions],
+            'deleted': {
+                'tasks': [t.entity_id for t in tombstones if t.entity_type == 'task'],
+                'sessions': [t.entity_id for t in tombstones if t.entity_type == 'session']
+            },
+            'cursor': _encode_cursor(positions),
+            'has_more': more_tasks or more_sessions or more_tombstones,
+            'reset': reset
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Senkronizasyon verisi alınamadı'
+        }), 500
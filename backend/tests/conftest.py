@@ -0,0 +1,82 @@
+"""
+Test yapılandırması
+
+Uygulama geçici bir SQLite veritabanıyla oluşturulur. Config ortam
+değişkenlerini import sırasında okuduğu için değişkenler burada, uygulama
+modülleri import edilmeden önce ayarlanır.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='pomodoro-test-'), 'test.db')
+
+# Tohum verisi: N+1 sorgu problemini görünür kılacak kadar görev ve oturum
+TASK_COUNT = 50
+SESSION_COUNT = 300
+PASSWORD = 'test-password'
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import create_app
+
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+def seed_user(app, email, task_count=TASK_COUNT, session_count=SESSION_COUNT):
+    """Kullanıcıyı kaydet, görev ve bitmiş oturumları doğrudan veritabanına yaz
+
+    Giriş yapmış test client ile kayıt id'lerini döndürür: task_0..task_N ve
+    bitirilmemiş bir oturum (open_session).
+    """
+    from models import db, User, Task, PomodoroSession
+    from rollups import rebuild_daily_stats
+
+    client = app.test_client()
+    client.post('/register', json={'email': email, 'password': PASSWORD})
+
+    with app.app_context():
+        user_id = User.query.filter_by(email=email).one().id
+        tasks = [Task(user_id=user_id, text=f'Görev {i}') for i in range(task_count)]
+        db.session.add_all(tasks)
+        db.session.flush()
+
+        now = datetime.utcnow()
+        for i in range(session_count):
+            started_at = now - timedelta(hours=i + 1)
+            db.session.add(PomodoroSession(
+                user_id=user_id,
+                task_id=tasks[i % task_count].id,
+                session_type='work',
+                duration_minutes=25.0 if i % 3 else 12.5,
+                started_at=started_at,
+                ended_at=started_at + timedelta(minutes=25)
+            ))
+        open_session = PomodoroSession(
+            user_id=user_id,
+            task_id=tasks[0].id,
+            session_type='work',
+            duration_minutes=0.0,
+            started_at=now
+        )
+        db.session.add(open_session)
+        db.session.commit()
+        rebuild_daily_stats(user_id)
+
+        ids = {f'task_{i}': task.id for i, task in enumerate(tasks)}
+        ids['open_session'] = open_session.id
+    return client, ids
+
+
+@pytest.fixture(scope='session')
+def seeded(app):
+    """Tohum verisi yüklenmiş kullanıcının (client, ids) çifti"""
+    return seed_user(app, 'budget@example.com')
@@ -0,0 +1,47 @@
+"""
+Akış (streaming) dışa aktarmanın sabit bellekle çalıştığının kontrolü
+
+SMALL_COUNT ve LARGE_COUNT oturumluk iki kullanıcının /api/export/sessions
+çıktısı tüketilirken tepe bellek kullanımı (tracemalloc) ölçülür. Dışa
+aktarma satırları biriktirirse tepe değer veri boyutuyla büyür ve oran
+MAX_PEAK_RATIO'yu aşar. 1M satırlık ölçüm CI'da
+çalıştırılmaz: benchmarks/bench_export.py ile isteğe bağlı yapılır.
+"""
+import pytest
+
+from benchmarks.bench_export import measure, populate
+from conftest import seed_user
+from models import User
+
+SMALL_COUNT = 2000
+LARGE_COUNT = 20000
+MAX_PEAK_RATIO = 1.5
+
+
+@pytest.fixture(scope='module')
+def export_users(app):
+    """Küçük ve büyük oturum geçmişine sahip iki kullanıcının (client, oturum sayısı) çiftleri"""
+    users = []
+    for index, count in enumerate([SMALL_COUNT, LARGE_COUNT]):
+        email = f'export{index}@example.com'
+        client, _ = seed_user(app, email, task_count=1, session_count=0)
+        with app.app_context():
+            user_id = User.query.filter_by(email=email).one().id
+        populate(app, user_id, count)
+        users.append((client, count))
+    return users
+
+
+@pytest.mark.parametrize('fmt, compressed', [('csv', False), ('ndjson', True)])
+def test_export_peak_memory_is_flat(export_users, fmt, compressed):
+    query = f"format={fmt}&gzip={'true' if compressed else 'false'}"
+    (small_client, small_count), (large_client, large_count) = export_users
+
+    _, small_lines, _, small_peak = measure(small_client, query, compressed)
+    _, large_lines, _, large_peak = measure(large_client, query, compressed)
+
+    # Her oturum bir satır; kullanıcıların satır farkı oturum farkına eşit olmalı
+    assert large_lines - small_lines == large_count - small_count
+    assert large_peak / small_peak <= MAX_PEAK_RATIO, (
+        f'tepe bellek {small_peak / 1024:.0f} KB -> {large_peak / 1024:.0f} KB'
+    )
@@ -0,0 +1,72 @@
+"""
+Endpoint SQL sorgu bütçesi testleri
+
+Her endpoint tohum verisi yüklenmiş bir kullanıcıyla çağrılır ve
+query_budget.ENDPOINT_BUDGETS bütçesiyle karşılaştırılır. Sorgu sayısı satır
+sayısıyla artarsa (N+1) bütçe aşılır ve çalışan SQL ifadeleri listelenir.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from query_budget import ENDPOINT_BUDGETS, request_with_budget, resolve_endpoint
+from stats_cache import statistics_cache
+
+
+def sync_payload(task_id, count):
+    """Senkronizasyon isteği için yeni bitmiş oturumlar"""
+    now = datetime.utcnow()
+    return {'sessions': [
+        {
+            'idempotency_key': f'budget-sync-{i}',
+            'task_id': task_id,
+            'session_type': 'work',
+            'started_at': (now - timedelta(minutes=30 * (i + 1))).isoformat(),
+            'ended_at': (now - timedelta(minutes=30 * i + 5)).isoformat(),
+            'duration_minutes': 25
+        }
+        for i in range(count)
+    ]}
+
+
+# (metot, yol, gövde) üçlüleri; yol ve gövde tohum verisinin id'leriyle doldurulur
+CASES = [
+    ('GET', '/api/tasks', None),
+    ('GET', '/api/tasks/search?q=Görev', None),
+    ('POST', '/api/tasks', lambda ids: {'text': 'Bütçe görevi'}),
+    ('PUT', '/api/tasks/{task_1}', lambda ids: {'completed': True}),
+    ('DELETE', '/api/tasks/{task_2}', None),
+    ('POST', '/api/tasks/batch', lambda ids: {'operations': [
+        {'op': 'update', 'id': ids['task_4'], 'completed': True},
+        {'op': 'delete', 'id': ids['task_5']},
+        {'op': 'create', 'text': 'Toplu görev'}
+    ]}),
+    ('POST', '/api/pomodoro/start', lambda ids: {'session_type': 'work', 'task_id': ids['task_3']}),
+    ('POST', '/api/pomodoro/end', lambda ids: {'session_id': ids['open_session'], 'duration_minutes': 25}),
+    ('POST', '/api/pomodoro/sync', lambda ids: sync_payload(ids['task_6'], 50)),
+    ('GET', '/api/pomodoro/statistics?period=daily', None),
+    ('GET', '/api/pomodoro/statistics?period=weekly', None),
+    ('GET', '/api/pomodoro/statistics?period=monthly&include_sessions=true', None),
+    ('GET', '/api/pomodoro/statistics/cache', None),
+    ('GET', '/api/pomodoro/sessions?limit=100', None),
+    ('GET', '/api/pomodoro/chart?bucket=day', None),
+    ('GET', '/api/pomodoro/chart?bucket=hour', None),
+    ('GET', '/api/sync', None),
+]
+
+
+@pytest.mark.parametrize('method, path, body', CASES, ids=[f'{method} {path}' for method, path, _ in CASES])
+def test_endpoint_within_budget(seeded, method, path, body):
+    client, ids = seeded
+    # İstatistikler önbellekten dönmesin: ölçülen, hesaplama maliyeti
+    statistics_cache.clear()
+    response, _ = request_with_budget(
+        client, method, path.format(**ids), json=body(ids) if body else None
+    )
+    assert response.status_code < 400, response.get_data(as_text=True)
+
+
+def test_every_budget_is_exercised(app, seeded):
+    _, ids = seeded
+    covered = {resolve_endpoint(app, method, path.format(**ids)) for method, path, _ in CASES}
+    assert set(ENDPOINT_BUDGETS) <= covered
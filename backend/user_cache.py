@@ -0,0 +1,118 @@
+"""
+Flask-Login user_loader için süreç içi TTL + LRU kullanıcı önbelleği
+
+Her kimliği doğrulanmış istek load_user'ı çağırır. Kullanıcı satırının kolon
+değerleri burada USER_CACHE_TTL saniye saklanır; önbellekten dönen kullanıcı
+mevcut veritabanı oturumuna sorgusuz bağlanır (merge, load=False), böylece
+ilişkiler (user.tasks vb.) normal şekilde yüklenebilir.
+
+User satırı ORM üzerinden güncellendiğinde veya silindiğinde kayıt hem flush
+anında hem de commit'ten sonra silinir. ORM dışında (ham SQL ile) yapılan
+değişiklikler en geç TTL sonunda görünür. USER_CACHE_SIZE = 0 önbelleği kapatır.
+"""
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from models import db, User
+
+
+class UserCache:
+    """Kullanıcı id -> (bitiş zamanı, kolon değerleri) LRU önbelleği"""
+
+    def __init__(self, max_size=4096, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        """Geçerli kayıt varsa kolon değerlerini döndür (yoksa None)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, values):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+user_cache = UserCache()
+
+USER_COLUMNS = [column.key for column in User.__mapper__.column_attrs]
+
+
+def load_cached_user(user_id):
+    """Kullanıcıyı önbellekten veya veritabanından getir (user_loader için)"""
+    if user_cache.max_size <= 0:
+        return db.session.get(User, user_id)
+
+    values = user_cache.get(user_id)
+    if values is not None:
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        user_cache.put(user_id, {key: getattr(user, key) for key in USER_COLUMNS})
+    return user
+
+
+def _mark_changed(mapper, connection, target):
+    """Değişen kullanıcıyı hemen ve commit'ten sonra tekrar geçersiz kıl"""
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('changed_user_ids', set()).add(target.id)
+
+
+def _after_commit(session):
+    # Commit'ten önce eski satırı okuyup önbelleğe yazan eşzamanlı istekleri temizler
+    for user_id in session.info.pop('changed_user_ids', ()):
+        user_cache.invalidate(user_id)
+
+
+def _after_rollback(session):
+    session.info.pop('changed_user_ids', None)
+
+
+event.listen(User, 'after_update', _mark_changed)
+event.listen(User, 'after_delete', _mark_changed)
+event.listen(Session, 'after_commit', _after_commit)
+event.listen(Session, 'after_rollback', _after_rollback)
+
+
+def init_user_cache(app):
+    """Önbellek boyutu ve süresini yapılandırmadan al"""
+    user_cache.max_size = app.config.get('USER_CACHE_SIZE', 4096)
+    user_cache.ttl = app.config.get('USER_CACHE_TTL', 300)
+    user_cache.clear()
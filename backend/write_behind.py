@@ -0,0 +1,502 @@
+"""
+Pomodoro başlat/bitir olayları için isteğe bağlı write-behind tamponu
+
+WRITE_BEHIND_ENABLED açıkken start/end endpoint'leri veritabanına yazmaz:
+olay önce yerel bir günlük (journal) dosyasına eklenir, sonra bellekteki
+kuyruğa alınır ve yanıt hemen döner. Arka plandaki flusher kuyruğu
+WRITE_BEHIND_INTERVAL_MS aralıklarla veya WRITE_BEHIND_BATCH_SIZE olaya
+ulaşınca tek transaction ile (group commit) veritabanına yazar.
+
+Oturumlar bu modda istemciye idempotency_key ile tanıtılır: start yanıtındaki
+session.id bu anahtardır ve end isteğinde aynen geri gönderilir. Başlangıç
+kayıtları (user_id, idempotency_key) benzersiz index'i ile ON CONFLICT DO
+NOTHING olarak eklenir; bitiş olayları bitiş zamanını taşıdığı için aynı olay
+tekrar uygulandığında günlük özet iki kez sayılmaz. Bu sayede uygulama
+çökerse başlangıçta günlükteki olaylar güvenle yeniden oynatılır.
+
+Günlük segmentlere bölünür: her flush yeni segment açar, eskisi commit'ten
+sonra silinir. Segmentler silinene kadar flock ile kilitli tutulur; aynı
+klasörü paylaşan başka bir worker yalnızca sahibi çökmüş segmentleri oynatır.
+
+Yazılamayan parti aynı segmentlerle, artan beklemeyle yeniden denenir.
+Geçici veritabanı hataları (kilit zaman aşımı, bağlantı kopması) süresiz
+denenir ve olayları bozuk saymaz. Diğer hatalarda parti WRITE_BEHIND_MAX_RETRIES
+kez denenir; sonra olaylar tek tek uygulanır ve veritabanı erişilebilirken tek
+başına uygulanamayanlar "dead-letter-*.ndjson" dosyasına taşınır. Başlangıçta
+geçici hata yüzünden oynatılamayan segmentin olayları yeni segmente alınıp
+flusher ile denenir; başka bir hatayla oynatılamayan segment dead-letter adına
+çevrilip atlanır. Dead-letter dosyaları otomatik oynatılmaz; sorun
+giderildikten sonra "journal-" önekiyle yeniden adlandırılırsa sonraki
+başlangıçta oynatılır.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+try:
+    import fcntl
+except ImportError:  # Windows: segment kilidi yok
+    fcntl = None
+
+# Başarısız flush sonrası bekleme: her ardışık hatada iki katına çıkar
+RETRY_DELAY_SECONDS = 0.5
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+def is_transient(error):
+    """Hata veritabanının geçici durumundan mı (kilit, bağlantı, havuz zaman aşımı)
+
+    Bu hatalar olayın kendisiyle ilgili değildir; olaylar dead-letter'a
+    taşınmaz, parti veritabanı düzelene kadar tekrar denenir.
+    """
+    return (
+        isinstance(error, (OperationalError, PoolTimeoutError))
+        or getattr(error, 'connection_invalidated', False)
+    )
+
+
+class WriteBehindBuffer:
+    """Olay kuyruğu, dayanıklı günlük ve group commit yapan flusher"""
+
+    def __init__(self):
+        self.enabled = False
+        self.app = None
+        self.interval = 0.005
+        self.batch_size = 500
+        self.fsync = False
+        self.max_retries = 5
+        self.directory = None
+        self._lock = threading.Condition()
+        self._write_lock = threading.Lock()  # Partiler sırayla yazılır (start, end'den önce)
+        self._queue = []
+        self._pending = {}  # (user_id, key) -> kuyruktaki başlangıç olayı
+        self._segment = None
+        self._segment_path = None
+        self._closed_segments = []
+        self._retry_batch = None  # Yazılamayan parti; segmentleri _closed_segments'te kalır
+        self._failures = 0  # Geçici olmayan ardışık hata sayısı (max_retries ile karşılaştırılır)
+        self._errors = 0  # Tüm ardışık hatalar (bekleme süresi için)
+        self._sequence = 0
+        self._thread = None
+        self._stopping = False
+        self.flushed_events = 0
+        self.flushed_batches = 0
+        self.dead_letter_events = 0
+
+    # ---------- Yapılandırma ----------
+
+    def init_app(self, app):
+        self.stop()
+        self.app = app
+        self.enabled = app.config.get('WRITE_BEHIND_ENABLED', False)
+        if not self.enabled:
+            return
+
+        self.interval = app.config.get('WRITE_BEHIND_INTERVAL_MS', 5) / 1000.0
+        self.batch_size = app.config.get('WRITE_BEHIND_BATCH_SIZE', 500)
+        self.fsync = app.config.get('WRITE_BEHIND_FSYNC', False)
+        self.max_retries = app.config.get('WRITE_BEHIND_MAX_RETRIES', 5)
+        self.directory = app.config.get('WRITE_BEHIND_JOURNAL_DIR') or os.path.join(app.instance_path, 'journal')
+        os.makedirs(self.directory, exist_ok=True)
+
+        replayed, deferred = self.replay()
+        if replayed:
+            app.logger.info('Write-behind günlüğünden %d olay yeniden oynatıldı.', replayed)
+
+        self._open_segment()
+        # Veritabanı hazır olmadığı için oynatılamayan olaylar yeni segmente alınır
+        # (olaylar tekrar uygulanabilir olduğundan eski segment sonra silinir)
+        for path, events in deferred:
+            for event in events:
+                self._append(event)
+            os.remove(path)
+        if deferred:
+            app.logger.warning(
+                'Write-behind: veritabanına ulaşılamadı, %d olay flusher ile tekrar denenecek.',
+                sum(len(events) for _, events in deferred)
+            )
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    # ---------- API tarafı ----------
+
+    @staticmethod
+    def is_key(session_id):
+        """end isteğindeki id write-behind anahtarı mı (tamsayı id değil)"""
+        return isinstance(session_id, str) and not session_id.isdigit()
+
+    def start(self, user_id, task_id, session_type):
+        """Başlangıç olayını kaydet; istemciye dönecek oturum sözlüğünü döndür"""
+        now = datetime.utcnow().isoformat()
+        event = {
+            'op': 'start', 'user_id': user_id, 'key': uuid.uuid4().hex,
+            'task_id': task_id, 'session_type': session_type, 'at': now
+        }
+        self._append(event)
+        return self._session_dict(event, ended_at=None, duration=0.0)
+
+    def end(self, user_id, key, duration_minutes):
+        """Bitiş olayını kaydet; oturum bulunamazsa None"""
+        with self._lock:
+            start = self._pending.get((user_id, key))
+        if start is None:
+            start = self._load_start(user_id, key)
+            if start is None:
+                return None
+
+        event = {
+            'op': 'end', 'user_id': user_id, 'key': key,
+            'duration': float(duration_minutes), 'at': datetime.utcnow().isoformat()
+        }
+        self._append(event)
+        return self._session_dict(start, ended_at=event['at'], duration=event['duration'])
+
+    def _load_start(self, user_id, key):
+        """Daha önce veritabanına yazılmış oturumu başlangıç olayı biçiminde getir"""
+        from models import PomodoroSession
+        session = PomodoroSession.query.filter_by(user_id=user_id, idempotency_key=key).first()
+        if session is None:
+            return None
+        return {
+            'user_id': session.user_id, 'key': key, 'task_id': session.task_id,
+            'session_type': session.session_type, 'at': session.started_at.isoformat()
+        }
+
+    @staticmethod
+    def _session_dict(start, ended_at, duration):
+        return {
+            'id': start['key'],
+            'user_id': start['user_id'],
+            'task_id': start['task_id'],
+            'session_type': start['session_type'],
+            'duration_minutes': duration,
+            'started_at': start['at'],
+            'ended_at': ended_at,
+            'created_at': start['at'],
+            'updated_at': ended_at or start['at'],
+            'idempotency_key': start['key']
+        }
+
+    # ---------- Günlük (journal) ----------
+
+    def _segment_name(self, prefix):
+        self._sequence += 1
+        return f"{prefix}-{os.getpid()}-{int(time.time() * 1000)}-{self._sequence}.ndjson"
+
+    def _open_segment(self):
+        self._segment_path = os.path.join(self.directory, self._segment_name('journal'))
+        # Kilit geçici adla alınır; replay dosyayı ancak kilitliyken görür
+        self._segment = open(self._segment_path + '.tmp', 'a', encoding='utf-8')
+        if fcntl is not None:
+            fcntl.flock(self._segment.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        os.rename(self._segment_path + '.tmp', self._segment_path)
+
+    def _append(self, event):
+        """Olayı günlüğe yaz ve kuyruğa ekle (günlük yazılmadan yanıt dönmez)"""
+        line = json.dumps(event, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._segment.write(line)
+            self._segment.flush()
+            if self.fsync:
+                os.fsync(self._segment.fileno())
+            self._queue.append(event)
+            if event['op'] == 'start':
+                self._pending[(event['user_id'], event['key'])] = event
+            if len(self._queue) >= self.batch_size:
+                self._lock.notify()
+
+    def replay(self):
+        """Kilitli olmayan (sahibi çökmüş) segmentlerdeki olayları veritabanına uygula
+
+        (uygulanan olay sayısı, [(segment yolu, olaylar)]) döndürür; ikinci
+        liste geçici veritabanı hatası yüzünden uygulanamayan segmentlerdir.
+        """
+        paths = sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.startswith('journal-') and name.endswith('.ndjson')
+        )
+        total = 0
+        deferred = []
+        for path in paths:
+            try:
+                f = open(path, 'r+', encoding='utf-8')
+            except FileNotFoundError:
+                continue  # Başka bir worker oynatıp sildi
+            with f:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        continue  # Canlı bir worker'ın aktif segmenti
+                if not os.path.exists(path):
+                    continue  # Açtıktan sonra başka bir worker oynatıp sildi
+                events = []
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        break  # Çökme sırasında yarım kalmış son satır
+                # Kilit, olaylar uygulanıp dosya silinene kadar tutulur
+                if events:
+                    try:
+                        with self.app.app_context():
+                            apply_events(events)
+                    except Exception as e:
+                        if is_transient(e):
+                            deferred.append((path, events))
+                            continue
+                        # Bozuk segment diğerlerinin oynatılmasını ve uygulamanın açılmasını engellemesin
+                        quarantine = os.path.join(
+                            self.directory, 'dead-letter-' + os.path.basename(path)[len('journal-'):]
+                        )
+                        os.rename(path, quarantine)
+                        self.app.logger.error(
+                            'Write-behind segmenti oynatılamadı, %s dosyasına taşındı: %s', quarantine, e
+                        )
+                        continue
+                    total += len(events)
+                os.remove(path)
+        return total, deferred
+
+    # ---------- Flusher ----------
+
+    def _take_batch(self):
+        """Yazılacak partiyi al (kilit altında çağrılır)
+
+        Önceki parti yazılamadıysa aynı parti aynı segmentlerle tekrar denenir;
+        yoksa kuyruk alınır ve yeni segmente geçilir.
+        """
+        if self._retry_batch is not None:
+            return self._retry_batch
+        batch = self._queue
+        self._queue = []
+        # Segment commit'e kadar açık (kilitli) tutulur, başka worker oynatmaz
+        self._closed_segments.append((self._segment_path, self._segment))
+        self._open_segment()
+        return batch
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._has_work() and not self._stopping:
+                    self._lock.wait(self.interval)
+                if self._stopping and not self._has_work():
+                    return
+                if not self._has_work():
+                    continue
+                stopping = self._stopping
+            try:
+                self.flush()
+            except Exception as e:
+                if stopping:
+                    # Olaylar segmentlerde kalır; sonraki başlangıçta oynatılır
+                    self.app.logger.error('Write-behind kapanışta yazılamadı, olaylar günlükte bırakıldı: %s', e)
+                    return
+                # Olaylar segmentlerde durur ve parti saklanmıştır; beklemeden sonra tekrar denenir
+                with self._lock:
+                    self._errors += 1
+                    delay = min(MAX_RETRY_DELAY_SECONDS, RETRY_DELAY_SECONDS * 2 ** (self._errors - 1))
+                self.app.logger.warning('Write-behind flush hatası, %.1f sn sonra tekrar denenecek: %s', delay, e)
+                with self._lock:
+                    if not self._stopping:
+                        self._lock.wait(delay)
+
+    def _has_work(self):
+        return bool(self._queue) or self._retry_batch is not None
+
+    def _write(self, batch):
+        with self.app.app_context():
+            apply_events(batch)
+        self._finish(batch)
+
+    def _finish(self, batch, dead_letter_events=0):
+        """Parti işlendi: segmentleri sil, bekleyen başlangıçları ve sayaçları güncelle"""
+        with self._lock:
+            for event in batch:
+                if event['op'] == 'start':
+                    self._pending.pop((event['user_id'], event['key']), None)
+            # Tüm olayları commit edilmiş segmentler silinebilir
+            segments, self._closed_segments = self._closed_segments, []
+            self._retry_batch = None
+            self._failures = 0
+            self._errors = 0
+            self.flushed_events += len(batch) - dead_letter_events
+            self.flushed_batches += 1
+            self.dead_letter_events += dead_letter_events
+        for path, segment in segments:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            segment.close()
+
+    def flush(self):
+        """Kuyruktaki tüm olayları hemen yaz (flusher, testler ve kapanış için)"""
+        if not self.enabled:
+            return
+        with self._write_lock:
+            # Yeniden denenen parti yazılınca kuyrukta bekleyenler de yazılır
+            while True:
+                with self._lock:
+                    if not self._has_work():
+                        return
+                    batch = self._take_batch()
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    with self._lock:
+                        # Geçici hatalar deneme sınırına sayılmaz
+                        if not is_transient(e):
+                            self._failures += 1
+                        give_up = self._failures >= self.max_retries
+                        self._retry_batch = None if give_up else batch
+                    if not give_up:
+                        raise
+                    self._dead_letter(batch)
+
+    def _dead_letter(self, batch):
+        """Tekrar tekrar yazılamayan partiyi olay olay uygula; uygulanamayanları ayrı dosyaya taşı
+
+        Bir olay geçici veritabanı hatasıyla uygulanamazsa işlem durur ve parti
+        yeniden denenmek üzere saklanır; uygulanmış olaylar tekrar uygulanabilir.
+        """
+        failed = []
+        for event in batch:
+            try:
+                with self.app.app_context():
+                    apply_events([event])
+            except Exception as e:
+                if is_transient(e):
+                    with self._lock:
+                        self._retry_batch = batch
+                    raise
+                failed.append(event)
+
+        if failed:
+            with self._lock:
+                path = os.path.join(self.directory, self._segment_name('dead-letter'))
+            with open(path, 'w', encoding='utf-8') as f:
+                for event in failed:
+                    f.write(json.dumps(event, separators=(',', ':')) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.app.logger.error('Write-behind: %d olay uygulanamadı, %s dosyasına taşındı.', len(failed), path)
+        self._finish(batch, dead_letter_events=len(failed))
+
+    def stop(self):
+        """Flusher'ı durdur; kuyrukta kalanlar yazılır"""
+        if self._thread is None:
+            return
+        with self._lock:
+            self._stopping = True
+            self._lock.notify()
+        self._thread.join()
+        self._thread = None
+        with self._lock:
+            self._segment.close()
+        if os.path.exists(self._segment_path) and os.path.getsize(self._segment_path) == 0:
+            os.remove(self._segment_path)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': len(self._queue),
+                'flushed_events': self.flushed_events,
+                'flushed_batches': self.flushed_batches,
+                'dead_letter_events': self.dead_letter_events
+            }
+
+
+def apply_events(events):
+    """Olay listesini tek transaction ile veritabanına uygula (tekrar uygulanabilir)"""
+    from models import db, PomodoroSession
+    from rollups import apply_session, apply_sessions
+    from stats_cache import statistics_cache
+    from sessions import insert_sessions_ignoring_duplicates
+    from sweeper import enforce_open_session_limit
+
+    try:
+        starts = [event for event in events if event['op'] == 'start']
+        if starts:
+            insert_sessions_ignoring_duplicates([
+                {
+                    'user_id': event['user_id'],
+                    'task_id': event['task_id'],
+                    'session_type': event['session_type'],
+                    'duration_minutes': 0.0,
+                    'started_at': datetime.fromisoformat(event['at']),
+                    'created_at': datetime.fromisoformat(event['at']),
+                    'updated_at': datetime.fromisoformat(event['at']),
+                    'idempotency_key': event['key']
+                }
+                for event in starts
+            ])
+
+        ends = [event for event in events if event['op'] == 'end']
+        changed_users = set()
+        if ends:
+            sessions = {
+                (session.user_id, session.idempotency_key): session
+                for session in PomodoroSession.query.filter(
+                    PomodoroSession.idempotency_key.in_({event['key'] for event in ends})
+                ).all()
+            }
+            newly_ended = {}
+            seen = set()
+            for event in ends:
+                session = sessions.get((event['user_id'], event['key']))
+                if session is None:
+                    continue
+                ended_at = datetime.fromisoformat(event['at'])
+                if session.ended_at == ended_at and session.duration_minutes == event['duration']:
+                    continue  # Yeniden oynatma: bu olay zaten uygulanmış
+
+                # Önceden bitirilmiş oturumun eski katkısı günlük özetten geri alınır
+                if session.ended_at is not None and session.id not in seen:
+                    apply_session(session, sign=-1)
+                session.duration_minutes = event['duration']
+                session.ended_at = ended_at
+                session.updated_at = ended_at
+                if session.id not in seen:
+                    seen.add(session.id)
+                    newly_ended.setdefault(session.user_id, []).append(session)
+
+            # Günlük özet katkıları kullanıcı başına toplu eklenir
+            for user_id, user_sessions in newly_ended.items():
+                apply_sessions(user_id, user_sessions)
+                changed_users.add(user_id)
+
+        # Açık oturum sınırı (MAX_OPEN_SESSIONS_PER_USER) bu yoldan açılan oturumlara
+        # da uygulanır: yeni oturumlar zaten eklendiği için kullanıcının en yeni
+        # `limit` açık oturumu kalır, eskiler kırpılmış süreyle kapatılır
+        limit = current_app.config.get('MAX_OPEN_SESSIONS_PER_USER', 3)
+        if starts and limit > 0:
+            now = datetime.utcnow()
+            caps = current_app.config.get('OPEN_SESSION_DURATION_CAPS')
+            for user_id in {event['user_id'] for event in starts}:
+                if enforce_open_session_limit(user_id, limit + 1, now, caps):
+                    changed_users.add(user_id)
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for user_id in changed_users:
+        statistics_cache.invalidate_user(user_id)
+
+
+write_behind = WriteBehindBuffer()
+
+
+def init_write_behind(app):
+    """Yapılandırma açıksa günlüğü oynat ve flusher'ı başlat"""
+    write_behind.init_app(app)
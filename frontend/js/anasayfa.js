@@ -198,11 +198,11 @@ document.addEventListener('DOMContentLoaded', () => {
     // Kullanıcı bilgilerini al
     loadUserInfo();
     
-    // Görevleri backend'den yükle
-    loadTasks();
-    
-    // İstatistikleri backend'den yükle
-    loadStatistics();
+    // Eski sürümün localStorage verisini taşı, sonra görevleri ve istatistikleri backend'den yükle
+    migrateLegacyLocalData().finally(() => {
+        loadTasks();
+        loadStatistics();
+    });
     
     // Timer'ı başlat
     updateTimerDisplay();
@@ -224,6 +224,38 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 });
 
+// Eski sürümün localStorage'da tuttuğu görevleri hesaba taşı (pomodoro sayacı tarihsiz
+// toplam bir sayı olduğundan sunucu onu oturum olarak aktarmaz, sadece bildirir)
+async function migrateLegacyLocalData() {
+    const legacyTasks = localStorage.getItem('pomodoroTasks');
+    const legacyCount = localStorage.getItem('todayPomodoros');
+    if (legacyTasks === null && legacyCount === null) {
+        return;
+    }
+    
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/import/local-storage`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            credentials: 'include',
+            body: JSON.stringify({
+                pomodoroTasks: JSON.parse(legacyTasks || '[]'),
+                todayPomodoros: parseInt(legacyCount) || 0
+            })
+        });
+        
+        // Tekrar gönderim güvenli olduğundan anahtarlar sadece başarıda silinir
+        if (response.ok) {
+            localStorage.removeItem('pomodoroTasks');
+            localStorage.removeItem('todayPomodoros');
+        }
+    } catch (error) {
+        console.error('Eski veriler aktarılamadı:', error);
+    }
+}
+
 // Kullanıcı bilgilerini yükle
 async function loadUserInfo() {
     const userEmailElement = document.getElementById('userEmail');
@@ -588,17 +620,44 @@ if (longBreakBtn) {
 
 // Görev Yönetimi
 let tasks = [];
+const COMPLETED_TASKS_LIMIT = 20; // Ana sayfada gösterilen son tamamlanan görev sayısı
+
+// Sayfalı görev listesinin tüm sayfalarını next_cursor ile sırayla getir (yanıt başarısızsa null)
+async function fetchAllTasks(query) {
+    let allTasks = [];
+    let cursor = null;
+    
+    do {
+        const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+        const response = await fetch(`${API_BASE_URL}/api/tasks?${query}${cursorParam}`, {
+            credentials: 'include'
+        });
+        if (!response.ok) {
+            return null;
+        }
+        
+        const data = await response.json();
+        allTasks = allTasks.concat(data.tasks || []);
+        cursor = data.has_more ? data.next_cursor : null;
+    } while (cursor);
+    
+    return allTasks;
+}
 
 // Görevleri backend'den yükle
 async function loadTasks() {
     try {
-        const response = await fetch(`${API_BASE_URL}/api/tasks`, {
-            credentials: 'include'
-        });
+        // Aktif görevlerin tamamı ve son tamamlanan görevler (tüm geçmiş yüklenmez)
+        const [activeTasks, completedResponse] = await Promise.all([
+            fetchAllTasks('completed=false&limit=500'),
+            fetch(`${API_BASE_URL}/api/tasks?completed=true&limit=${COMPLETED_TASKS_LIMIT}`, {
+                credentials: 'include'
+            })
+        ]);
         
-        if (response.ok) {
-            const data = await response.json();
-            tasks = data.tasks || [];
+        if (activeTasks && completedResponse.ok) {
+            const completedData = await completedResponse.json();
+            tasks = activeTasks.concat(completedData.tasks || []);
             renderTasks();
         } else {
             // Kullanıcı giriş yapmamış, misafir modunda çalış
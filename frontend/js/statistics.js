@@ -59,21 +59,26 @@ async function loadStatistics(period = 'daily') {
     try {
         showLoading(true);
         
-        // API'den veri çek
-        const response = await fetch(`${API_BASE_URL}/api/pomodoro/statistics?period=${period}`, {
-            credentials: 'include'
-        });
+        // API'den özet ve hazır aralıklanmış grafik verisini paralel çek
+        const [response, chartResponse] = await Promise.all([
+            fetch(`${API_BASE_URL}/api/pomodoro/statistics?period=${period}`, {
+                credentials: 'include'
+            }),
+            fetch(`${API_BASE_URL}/api/pomodoro/chart?${buildChartQuery(period)}`, {
+                credentials: 'include'
+            })
+        ]);
         
-        if (response.ok) {
+        if (response.ok && chartResponse.ok) {
             const data = await response.json();
+            const chartJson = await chartResponse.json();
             const stats = data.statistics;
-            const sessions = stats.sessions || [];
             
             
-            const chartData = buildChartDataFromSessions(sessions, period);
+            const chartData = buildChartDataFromBuckets(chartJson.chart.buckets, period);
             
            
-            updateSummary(stats, period);
+            updateSummary(stats, period, chartData);
             
             
             requestAnimationFrame(() => {
@@ -103,152 +108,59 @@ async function loadStatistics(period = 'daily') {
     }
 }
 
-// Sessions verisinden chart data oluştur
-function buildChartDataFromSessions(sessions, period) {
+// Tarihi YYYY-MM-DD formatına çevir
+function formatDateParam(date) {
+    const year = date.getFullYear();
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${year}-${month}-${day}`;
+}
+
+// Periyoda göre grafik endpoint'i parametreleri
+// Günlük: bugün, Haftalık: son 7 gün (bugün dahil), Aylık: son 12 ay
+function buildChartQuery(period) {
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    const tomorrow = new Date(today);
+    tomorrow.setDate(tomorrow.getDate() + 1);
+    
+    let bucket = 'day';
+    const from = new Date(today);
+    
+    if (period === 'weekly') {
+        from.setDate(from.getDate() - 6);
+    } else if (period === 'monthly') {
+        bucket = 'month';
+        from.setDate(1);
+        from.setMonth(from.getMonth() - 11);
+    }
+    
+    return `bucket=${bucket}&from=${formatDateParam(from)}&to=${formatDateParam(tomorrow)}`;
+}
+
+// Backend'den gelen aralıklardan (bucket) chart data oluştur
+function buildChartDataFromBuckets(buckets, period) {
     const chartData = {
         labels: [],
         fullData: [],
         halfData: [],
-        timeData: [] // Toplam çalışma süresi (dakika cinsinden, ondalık)
+        timeData: [], // Toplam çalışma süresi (dakika cinsinden, ondalık)
+        pomodoroData: [] // Toplam çalışma oturumu sayısı
     };
     
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
-    
-    if (period === 'daily') {
-        // Günlük: Bugünün verileri
-        // Backend'den gelen sessions zaten bugünün verileri (period'a göre filtrelenmiş)
-        const todayLabel = today.toLocaleDateString('tr-TR', { 
-            weekday: 'long',
-            day: 'numeric',
-            month: 'long'
-        });
-        chartData.labels.push(todayLabel);
-        
-        // Backend'den gelen tüm sessions bugünün verileri, sadece work session'ları filtrele
-        const workSessions = sessions.filter(s => s.session_type === 'work');
-        
-        let fullCount = 0;
-        let halfCount = 0;
-        let totalMinutes = 0;
-        workSessions.forEach(s => {
-            const duration = s.duration_minutes || 0;
-            totalMinutes += duration;
-            if (duration >= 25.0) {
-                fullCount++;
-            } else if (duration > 0) {
-                halfCount++;
-            }
-        });
-        
-        chartData.fullData.push(fullCount);
-        chartData.halfData.push(halfCount);
-        chartData.timeData.push(totalMinutes); // Ondalık dakika değeri
-        
-    } else if (period === 'weekly') {
-        // Haftalık: Son 7 gün (bugün dahil)
-        const dayDataArray = [];
-        
-        // 7 gün için boş veri yapısı oluştur
-        for (let i = 6; i >= 0; i--) {
-            const date = new Date(today);
-            date.setDate(date.getDate() - i);
-            const dateKey = date.toISOString().split('T')[0]; // YYYY-MM-DD formatı
-            
-            const label = date.toLocaleDateString('tr-TR', { 
-                weekday: 'short',
-                day: 'numeric',
-                month: 'short'
-            });
-            chartData.labels.push(label);
-            dayDataArray.push({ dateKey, full: 0, half: 0, minutes: 0 });
-        }
-        
-        // Sessions'ları günlere göre grupla
-        sessions.forEach(s => {
-            if (!s.ended_at || s.session_type !== 'work') return;
-            
-            const sessionDate = new Date(s.ended_at);
-            sessionDate.setHours(0, 0, 0, 0);
-            const dateKey = sessionDate.toISOString().split('T')[0];
-            
-            const dayData = dayDataArray.find(d => d.dateKey === dateKey);
-            if (dayData) {
-                const duration = s.duration_minutes || 0;
-                dayData.minutes += duration;
-                if (duration >= 25.0) {
-                    dayData.full++;
-                } else if (duration > 0) {
-                    dayData.half++;
-                }
-            }
-        });
-        
-        // Verileri sırayla ekle
-        dayDataArray.forEach(dayData => {
-            chartData.fullData.push(dayData.full);
-            chartData.halfData.push(dayData.half);
-            chartData.timeData.push(dayData.minutes); // Ondalık dakika değeri
-        });
-    } else if (period === 'monthly') {
-        // Aylık: Son 12 ay
-        const monthDataArray = [];
-        
-        // Son 12 ay için boş veri yapısı oluştur
-        for (let i = 11; i >= 0; i--) {
-            const date = new Date(today);
-            date.setMonth(date.getMonth() - i);
-            const year = date.getFullYear();
-            const month = date.getMonth(); // 0-11 arası
-            
-            // Ay anahtarı (YYYY-MM formatı)
-            const monthKey = `${year}-${String(month + 1).padStart(2, '0')}`;
-            
-            // Ay etiketi
-            const label = date.toLocaleDateString('tr-TR', { 
-                month: 'short',
-                year: 'numeric'
-            });
-            
-            chartData.labels.push(label);
-            monthDataArray.push({ 
-                monthKey, 
-                year, 
-                month, 
-                full: 0, 
-                half: 0, 
-                minutes: 0 
-            });
-        }
-        
-        // Sessions'ları aylara göre grupla
-        sessions.forEach(s => {
-            if (!s.ended_at || s.session_type !== 'work') return;
-            
-            const sessionDate = new Date(s.ended_at);
-            const year = sessionDate.getFullYear();
-            const month = sessionDate.getMonth();
-            const monthKey = `${year}-${String(month + 1).padStart(2, '0')}`;
-            
-            const monthData = monthDataArray.find(d => d.monthKey === monthKey);
-            if (monthData) {
-                const duration = s.duration_minutes || 0;
-                monthData.minutes += duration;
-                if (duration >= 25.0) {
-                    monthData.full++;
-                } else if (duration > 0) {
-                    monthData.half++;
-                }
-            }
-        });
-        
-        // Verileri sırayla ekle
-        monthDataArray.forEach(monthData => {
-            chartData.fullData.push(monthData.full);
-            chartData.halfData.push(monthData.half);
-            chartData.timeData.push(monthData.minutes); // Ondalık dakika değeri
-        });
-    }
+    const labelOptions = {
+        daily: { weekday: 'long', day: 'numeric', month: 'long' },
+        weekly: { weekday: 'short', day: 'numeric', month: 'short' },
+        monthly: { month: 'short', year: 'numeric' }
+    }[period] || { weekday: 'short', day: 'numeric', month: 'short' };
+    
+    buckets.forEach(b => {
+        chartData.labels.push(new Date(b.start).toLocaleDateString('tr-TR', labelOptions));
+        chartData.fullData.push(b.full_pomodoros || 0);
+        chartData.halfData.push(b.half_pomodoros || 0);
+        chartData.timeData.push(b.minutes.work || 0); // Ondalık dakika değeri
+        chartData.pomodoroData.push(b.pomodoros || 0);
+    });
     
     return chartData;
 }
@@ -600,7 +512,7 @@ function updatePomodoroChart(canvas, data, period) {
 }
 
 // Özet Bilgileri Güncelle
-function updateSummary(summary, period = 'daily') {
+function updateSummary(summary, period = 'daily', chartData = null) {
     const totalTimeEl = document.getElementById('totalTime');
     const fullPomodorosEl = document.getElementById('fullPomodoros');
     const halfPomodorosEl = document.getElementById('halfPomodoros');
@@ -662,57 +574,15 @@ function updateSummary(summary, period = 'daily') {
         avgTimeEl.textContent = `${avgMinutes} dk`;
     }
     
-    // En verimli günü/ayı bul
-    if (bestDayEl && summary.sessions && summary.sessions.length > 0) {
-        const workSessions = summary.sessions.filter(s => s.session_type === 'work');
-        if (workSessions.length > 0) {
-            if (period === 'monthly') {
-                // Aylık görünüm: En verimli ayı bul (en çok pomodoro yapılan ay)
-                const monthCounts = {};
-                workSessions.forEach(s => {
-                    if (s.ended_at) {
-                        const date = new Date(s.ended_at);
-                        const monthKey = date.toLocaleDateString('tr-TR', { 
-                            month: 'short',
-                            year: 'numeric'
-                        });
-                        monthCounts[monthKey] = (monthCounts[monthKey] || 0) + 1;
-                    }
-                });
-                const bestMonthKeys = Object.keys(monthCounts);
-                if (bestMonthKeys.length > 0) {
-                    const bestMonth = bestMonthKeys.reduce((a, b) => monthCounts[a] > monthCounts[b] ? a : b);
-                    bestDayEl.textContent = bestMonth;
-                } else {
-                    bestDayEl.textContent = '-';
-                }
-            } else {
-                // Günlük ve Haftalık görünüm: En verimli günü bul
-                const dayCounts = {};
-                workSessions.forEach(s => {
-                    if (s.ended_at) {
-                        const date = new Date(s.ended_at);
-                        const dateKey = date.toLocaleDateString('tr-TR', { 
-                            weekday: 'short',
-                            day: 'numeric',
-                            month: 'short'
-                        });
-                        dayCounts[dateKey] = (dayCounts[dateKey] || 0) + 1;
-                    }
-                });
-                const bestDayKeys = Object.keys(dayCounts);
-                if (bestDayKeys.length > 0) {
-                    const bestDay = bestDayKeys.reduce((a, b) => dayCounts[a] > dayCounts[b] ? a : b);
-                    bestDayEl.textContent = bestDay;
-                } else {
-                    bestDayEl.textContent = '-';
-                }
+    // En verimli günü/ayı bul (en çok pomodoro yapılan aralık)
+    if (bestDayEl) {
+        bestDayEl.textContent = '-';
+        if (chartData && chartData.pomodoroData) {
+            const maxCount = Math.max(0, ...chartData.pomodoroData);
+            if (maxCount > 0) {
+                bestDayEl.textContent = chartData.labels[chartData.pomodoroData.indexOf(maxCount)];
             }
-        } else {
-            bestDayEl.textContent = '-';
         }
-    } else {
-        if (bestDayEl) bestDayEl.textContent = '-';
     }
 }
 